@@ -1,16 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, Form, Query, Request
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from sqlalchemy.orm import Session, sessionmaker
 from typing import List, Optional
 from datetime import datetime
+import asyncio
 import math
-
-from database import get_db
+import shutil
+import uuid
+import zipfile
+from pathlib import Path
+from openpyxl.utils.exceptions import InvalidFileException
+from starlette.concurrency import run_in_threadpool
+
+from database import get_db, engine, async_engine, sync_pool_metrics, async_pool_metrics
 from crud import product as product_crud
 from crud import category as category_crud
 from crud import audit as audit_crud
 from crud import draft as draft_crud
 from crud import settings as settings_crud
+from crud import image_blob as image_blob_crud
 from schemas.product import ProductResponse, ProductCreate, ProductUpdate, ProductSearchParams, ProductSearchResponse
 from schemas.category import Category, CategoryCreate, CategoryUpdate
 from schemas.audit import AuditLogResponse, AuditLogFilter
@@ -21,7 +29,12 @@ from schemas.draft import (
 from schemas.settings import SiteSettingsResponse, SiteSettingsUpdate
 from models.safety import SafetyProduct, SafetyCategory
 from models.audit import AuditAction, AuditEntityType
+from core.config import settings
+from core.db_pool import pool_status
 from core.logger import get_logger
+from utils import catalog_stats, image_files
+from utils.upload import UploadError, discard_image_upload, save_image_upload
+from utils.product_import import ProductImporter
 from utils.audit_logger import (
     log_product_create, log_product_update, log_product_delete,
     log_category_create, log_category_update, log_category_delete,
@@ -40,26 +53,35 @@ def admin_health_check():
     """Admin API 상태 확인"""
     return {"status": "healthy", "role": "admin"}
 
+@router.get("/db/pool")
+def database_pool_status():
+    """
+    데이터베이스 커넥션 풀 상태를 반환합니다.
+    
+    - **checkedout / overflow**: 현재 사용 중인 커넥션 수 / 초과 생성된 커넥션 수
+    - **wait_time_***: 커넥션 획득까지 기다린 시간 (풀 고갈 여부 판단용)
+    - **timeouts**: pool_timeout 초과로 실패한 횟수
+    """
+    return {
+        "config": {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+            "statement_timeout_ms": settings.DB_STATEMENT_TIMEOUT_MS,
+        },
+        "sync": pool_status(engine.pool, sync_pool_metrics),
+        "async": pool_status(async_engine.pool, async_pool_metrics),
+    }
+
 @router.get("/dashboard")
 async def admin_dashboard(db: Session = Depends(get_db)):
     """관리자 대시보드 통계 정보를 반환합니다."""
-    from sqlalchemy import func, and_
     from datetime import datetime, timedelta
     
-    # 기본 통계
-    total_products = product_crud.get_product_count(db)
-    total_categories = category_crud.get_category_count(db)
-    featured_products = product_crud.get_featured_product_count(db)
-    
-    # 카테고리별 제품 수
-    category_stats = db.query(
-        SafetyCategory.name,
-        SafetyCategory.code,
-        func.count(SafetyProduct.id).label('product_count')
-    ).outerjoin(SafetyProduct, SafetyCategory.id == SafetyProduct.category_id)\
-     .group_by(SafetyCategory.id, SafetyCategory.name, SafetyCategory.code)\
-     .order_by(func.count(SafetyProduct.id).desc())\
-     .all()
+    # 요약 / 카테고리별 통계 (category_stats 카운터 한 번 조회)
+    stats = catalog_stats.get_dashboard_stats(db)
     
     # 최근 7일간 등록된 제품
     seven_days_ago = datetime.now() - timedelta(days=7)
@@ -76,31 +98,8 @@ async def admin_dashboard(db: Session = Depends(get_db)):
         .limit(10)\
         .all()
     
-    # 이미지 없는 제품 (file_path가 default인 경우)
-    products_without_images = db.query(SafetyProduct)\
-        .filter(SafetyProduct.file_path.like('%default%'))\
-        .count()
-    
-    # 재고 부족 제품 (stock_status가 'out_of_stock'인 경우)
-    out_of_stock_count = db.query(SafetyProduct)\
-        .filter(SafetyProduct.stock_status == 'out_of_stock')\
-        .count()
-    
     return {
-        "summary": {
-            "total_products": total_products,
-            "total_categories": total_categories,
-            "featured_products": featured_products,
-            "out_of_stock": out_of_stock_count,
-            "missing_images": products_without_images
-        },
-        "category_stats": [
-            {
-                "name": stat.name,
-                "code": stat.code,
-                "count": stat.product_count
-            } for stat in category_stats
-        ],
+        **stats,
         "recent_products": [
             {
                 "id": p.id,
@@ -120,38 +119,13 @@ async def admin_dashboard(db: Session = Depends(get_db)):
     }
 
 @router.post("/upload-image")
-async def upload_image(file: UploadFile = File(...)):
-    """제품 이미지를 업로드합니다."""
-    import os
-    import uuid
-    from pathlib import Path
-    
+async def upload_image(file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """제품 이미지를 업로드합니다 (같은 내용의 이미지가 이미 있으면 그 경로를 반환)."""
     try:
-        # 허용된 파일 형식 체크
-        allowed_extensions = {'.jpg', '.jpeg', '.png', '.gif'}
-        file_extension = os.path.splitext(file.filename)[1].lower()
-        
-        if file_extension not in allowed_extensions:
-            raise HTTPException(status_code=400, detail="지원하지 않는 파일 형식입니다")
-        
-        # 고유한 파일명 생성
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        
-        # 업로드 디렉토리 설정 (public/images/)
-        upload_dir = Path("../frontend/public/images")
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        
-        # 파일 저장
-        file_path = upload_dir / unique_filename
-        
-        contents = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(contents)
+        saved = await save_image_upload(file, db)
         
         # 웹에서 접근 가능한 URL 반환
-        file_url = f"/images/{unique_filename}"
-        
-        return {"url": file_url, "filename": unique_filename}
+        return {"url": saved.url, "filename": saved.filename, "variants": saved.variants}
         
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -191,7 +165,7 @@ async def create_category(
     created_category = category_crud.create_category(db, category)
     
     # Audit Log 기록
-    log_category_create(db, created_category.id, category.dict(), request)
+    await log_category_create(db, created_category.id, category.dict(), request)
     
     return created_category
 
@@ -244,7 +218,7 @@ async def update_category(
     
     # Audit Log 기록
     new_data = model_to_dict(db_category)
-    log_category_update(db, category_id, old_data, new_data, request)
+    await log_category_update(db, category_id, old_data, new_data, request)
     
     return db_category
 
@@ -303,7 +277,7 @@ async def delete_category(
     db_category = category_crud.delete_category(db, category_id)
     
     # Audit Log 기록
-    log_category_delete(db, category_id, old_data, request)
+    await log_category_delete(db, category_id, old_data, request)
     
     return {"message": f"카테고리 {category_id}가 성공적으로 삭제되었습니다"}
 
@@ -343,10 +317,25 @@ async def create_product(
     created_product = product_crud.create_product(db, product)
     
     # Audit Log 기록
-    log_product_create(db, created_product.id, product.dict(), request)
+    await log_product_create(db, created_product.id, product.dict(), request)
     
     return created_product
 
+async def _save_form_images(images: List[UploadFile], db: Session) -> List[str]:
+    """폼으로 받은 이미지들을 저장하고 웹 경로 목록을 반환합니다 (하나라도 실패하면 새로 저장한 파일을 지우고 400)."""
+    saved_uploads = []
+    try:
+        for image in images:
+            if image.filename and image.filename.strip():
+                saved = await save_image_upload(image, db)
+                saved_uploads.append(saved)
+                logger.info(f"이미지 저장 완료: {saved.filename}")
+    except UploadError as e:
+        for saved in saved_uploads:
+            await discard_image_upload(db, saved)
+        raise HTTPException(status_code=400, detail=f"{image.filename}: {e}")
+    return [saved.url for saved in saved_uploads]
+
 @router.post("/products/form", response_model=ProductResponse)
 async def create_product_form(
     name: str = Form(...),
@@ -376,32 +365,12 @@ async def create_product_form(
     }
     
     # 여러 이미지 파일 처리 및 저장
+    import os
+    import json
+    
     image_paths = []
     if images and len(images) > 0:
-        import os
-        import uuid
-        import json
-        from pathlib import Path
-        
-        # 업로드 디렉토리 설정
-        upload_dir = Path("../frontend/public/images")
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        
-        for image in images:
-            if image.filename and image.filename.strip():
-                # 고유한 파일명 생성
-                file_extension = os.path.splitext(image.filename)[1].lower()
-                unique_filename = f"{uuid.uuid4()}{file_extension}"
-                
-                # 파일 저장
-                file_path = upload_dir / unique_filename
-                contents = await image.read()
-                with open(file_path, "wb") as f:
-                    f.write(contents)
-                
-                image_path = f"/images/{unique_filename}"
-                image_paths.append(image_path)
-                logger.info(f"이미지 저장 완료: {unique_filename}")
+        image_paths = await _save_form_images(images, db)
         
         if image_paths:
             # 첫 번째 이미지를 메인 이미지로 설정
@@ -454,6 +423,87 @@ async def create_product_form(
         print(f"product_data that failed: {product_data}")
         raise HTTPException(status_code=400, detail=f"제품 생성 실패: {str(e)}")
 
+@router.put("/products/bulk")
+async def bulk_update_products(
+    product_ids: List[int],
+    updates: dict,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    여러 제품을 일괄 수정합니다.
+    
+    UPDATE ... WHERE id IN (...) 문으로 처리하며(대량 요청은 나누어 실행), 감사 로그와 함께 한 트랜잭션으로 커밋합니다.
+    """
+    if not product_ids:
+        raise HTTPException(status_code=400, detail="제품 ID 목록이 비어있습니다")
+    
+    # 허용된 필드만 업데이트
+    allowed_fields = ['category_id', 'price', 'is_featured', 'stock_status', 'display_order']
+    filtered_updates = {k: v for k, v in updates.items() if k in allowed_fields}
+    
+    if not filtered_updates:
+        raise HTTPException(status_code=400, detail="업데이트할 필드가 없습니다")
+    
+    # is_featured 타입 변환
+    if 'is_featured' in filtered_updates:
+        filtered_updates['is_featured'] = 1 if filtered_updates['is_featured'] else 0
+    
+    if 'category_id' in filtered_updates and not category_crud.get_category(db, filtered_updates['category_id']):
+        raise HTTPException(status_code=400, detail="존재하지 않는 카테고리입니다")
+    
+    # 일괄 업데이트 실행
+    updated_ids = product_crud.bulk_update_products(db, product_ids, filtered_updates)
+    if updated_ids:
+        db.commit()
+        # Audit Log 기록 (백그라운드에서 모아서 INSERT)
+        await log_bulk_update(
+            db, AuditEntityType.PRODUCT, len(updated_ids),
+            f"제품 일괄 수정 ({', '.join(f'{k}={v}' for k, v in filtered_updates.items())})", request
+        )
+    else:
+        db.rollback()
+    
+    logger.info(f"일괄 수정 완료: {len(updated_ids)}개 제품")
+    return {
+        "message": f"{len(updated_ids)}개 제품이 성공적으로 수정되었습니다",
+        "updated_count": len(updated_ids),
+        "updated_ids": updated_ids,
+        "total_requested": len(product_ids)
+    }
+
+@router.delete("/products/bulk")
+async def bulk_delete_products(
+    product_ids: List[int],
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """
+    여러 제품을 일괄 삭제합니다.
+    
+    한 트랜잭션으로 삭제한 뒤, 이미지 파일은 커밋 후 백그라운드에서 한꺼번에 정리합니다.
+    """
+    if not product_ids:
+        raise HTTPException(status_code=400, detail="제품 ID 목록이 비어있습니다")
+    
+    deleted_ids, image_paths = product_crud.bulk_delete_products(db, product_ids)
+    if deleted_ids:
+        db.commit()
+        # Audit Log 기록 (백그라운드에서 모아서 INSERT)
+        await log_bulk_delete(db, AuditEntityType.PRODUCT, len(deleted_ids), "제품 일괄 삭제", request)
+        background_tasks.add_task(image_files.remove_image_files, image_paths)
+    else:
+        db.rollback()
+    
+    logger.info(f"일괄 삭제 완료: {len(deleted_ids)}개 제품, 이미지 {len(image_paths)}개 정리 예약")
+    return {
+        "message": f"{len(deleted_ids)}개 제품이 성공적으로 삭제되었습니다",
+        "deleted_count": len(deleted_ids),
+        "deleted_ids": deleted_ids,
+        "total_requested": len(product_ids)
+    }
+
 @router.put("/products/{product_id}", response_model=ProductResponse)
 async def update_product(
     product_id: int,
@@ -476,7 +526,7 @@ async def update_product(
     
     # Audit Log 기록
     new_data = model_to_dict(db_product)
-    log_product_update(db, product_id, old_data, new_data, request)
+    await log_product_update(db, product_id, old_data, new_data, request)
     
     return db_product
 
@@ -519,7 +569,6 @@ async def update_product_form(
     
     # 이미지 처리 (기존 + 새로운 이미지)
     import os
-    import uuid
     import json
     from pathlib import Path
     
@@ -538,45 +587,11 @@ async def update_product_form(
         except (json.JSONDecodeError, TypeError):
             keep_existing_paths = []
     
-    # 2. 삭제될 기존 이미지 파악 및 실제 파일 삭제
-    if existing_product.file_path:
-        try:
-            all_existing_paths = json.loads(existing_product.file_path)
-            if isinstance(all_existing_paths, list):
-                paths_to_delete = [path for path in all_existing_paths if path not in keep_existing_paths]
-                for path_to_delete in paths_to_delete:
-                    if path_to_delete and path_to_delete.startswith('/images/'):
-                        file_path = Path("../frontend/public") / path_to_delete.lstrip('/')
-                        if file_path.exists():
-                            try:
-                                os.remove(file_path)
-                                logger.info(f"삭제된 이미지 파일: {file_path}")
-                            except Exception as e:
-                                logger.error(f"이미지 파일 삭제 실패: {file_path}, 오류: {e}")
-        except (json.JSONDecodeError, TypeError):
-            pass
-    
+    # 2. 빠진 기존 이미지 파일은 update_product에서 참조 수를 반영해 정리
     # 3. 새 이미지들 저장
     new_image_paths = []
     if images and len(images) > 0:
-        upload_dir = Path("../frontend/public/images")
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        
-        for image in images:
-            if image.filename and image.filename.strip():
-                # 고유한 파일명 생성
-                file_extension = os.path.splitext(image.filename)[1].lower()
-                unique_filename = f"{uuid.uuid4()}{file_extension}"
-                
-                # 파일 저장
-                file_path = upload_dir / unique_filename
-                contents = await image.read()
-                with open(file_path, "wb") as f:
-                    f.write(contents)
-                
-                image_path = f"/images/{unique_filename}"
-                new_image_paths.append(image_path)
-                logger.info(f"새 이미지 저장 완료: {unique_filename}")
+        new_image_paths = await _save_form_images(images, db)
     
     # 4. 최종 이미지 경로 리스트 구성 (기존 유지 + 새 이미지)
     final_image_paths = keep_existing_paths + new_image_paths
@@ -621,7 +636,7 @@ async def delete_product(
     db_product = product_crud.delete_product(db, product_id)
     
     # Audit Log 기록
-    log_product_delete(db, product_id, old_data, request)
+    await log_product_delete(db, product_id, old_data, request)
     
     return {"message": f"제품 {product_id}가 성공적으로 삭제되었습니다"}
 
@@ -653,78 +668,16 @@ async def duplicate_product(
         "file_path": original.file_path
     }
     
-    # 새 제품 생성
+    # 새 제품 생성 (이미지는 복사하지 않고 같은 파일을 참조)
     new_product = SafetyProduct(**new_product_data)
     db.add(new_product)
+    image_blob_crud.retain(db, set(image_files.parse_image_paths(original.file_path)))
     db.commit()
     db.refresh(new_product)
     
     logger.info(f"제품 복사 완료: {product_id} → {new_product.id}")
     return product_crud.get_product(db, new_product.id)
 
-@router.put("/products/bulk")
-async def bulk_update_products(
-    product_ids: List[int],
-    updates: dict,
-    db: Session = Depends(get_db)
-):
-    """여러 제품을 일괄 수정합니다."""
-    from schemas.product import ProductUpdate
-    
-    if not product_ids:
-        raise HTTPException(status_code=400, detail="제품 ID 목록이 비어있습니다")
-    
-    # 허용된 필드만 업데이트
-    allowed_fields = ['category_id', 'price', 'is_featured', 'stock_status', 'display_order']
-    filtered_updates = {k: v for k, v in updates.items() if k in allowed_fields}
-    
-    if not filtered_updates:
-        raise HTTPException(status_code=400, detail="업데이트할 필드가 없습니다")
-    
-    # is_featured 타입 변환
-    if 'is_featured' in filtered_updates:
-        filtered_updates['is_featured'] = 1 if filtered_updates['is_featured'] else 0
-    
-    # 일괄 업데이트 실행
-    updated_count = 0
-    for product_id in product_ids:
-        product = db.query(SafetyProduct).filter(SafetyProduct.id == product_id).first()
-        if product:
-            for key, value in filtered_updates.items():
-                setattr(product, key, value)
-            updated_count += 1
-    
-    db.commit()
-    
-    logger.info(f"일괄 수정 완료: {updated_count}개 제품")
-    return {
-        "message": f"{updated_count}개 제품이 성공적으로 수정되었습니다",
-        "updated_count": updated_count,
-        "total_requested": len(product_ids)
-    }
-
-@router.delete("/products/bulk")
-async def bulk_delete_products(
-    product_ids: List[int],
-    db: Session = Depends(get_db)
-):
-    """여러 제품을 일괄 삭제합니다."""
-    if not product_ids:
-        raise HTTPException(status_code=400, detail="제품 ID 목록이 비어있습니다")
-    
-    deleted_count = 0
-    for product_id in product_ids:
-        product = product_crud.delete_product(db, product_id)
-        if product:
-            deleted_count += 1
-    
-    logger.info(f"일괄 삭제 완료: {deleted_count}개 제품")
-    return {
-        "message": f"{deleted_count}개 제품이 성공적으로 삭제되었습니다",
-        "deleted_count": deleted_count,
-        "total_requested": len(product_ids)
-    }
-
 @router.get("/products/export/template")
 async def download_product_template():
     """제품 등록용 엑셀 템플릿을 다운로드합니다."""
@@ -771,100 +724,46 @@ async def import_products_from_excel(
     file: UploadFile = File(...),
     db: Session = Depends(get_db)
 ):
-    """엑셀 파일로 제품을 일괄 등록합니다."""
-    import openpyxl
-    from io import BytesIO
-    import json
+    """
+    엑셀 파일로 제품을 일괄 등록합니다.
     
+    업로드 파일을 메모리로 읽지 않고 행 단위로 스트리밍하며(ExcelHandler.iter_rows),
+    전체를 한 트랜잭션으로 처리해 제품은 청크 단위 INSERT로 등록합니다 (utils.product_import).
+    """
     if not file.filename.endswith(('.xlsx', '.xls')):
         raise HTTPException(status_code=400, detail="엑셀 파일만 업로드 가능합니다 (.xlsx, .xls)")
     
-    # 파일 읽기
-    contents = await file.read()
-    wb = openpyxl.load_workbook(BytesIO(contents))
-    ws = wb.active
+    is_valid, message = ExcelHandler.validate_excel_file(file)
+    if not is_valid:
+        raise HTTPException(status_code=400, detail=message)
+    
+    # 열 순서: 제품명, 모델번호, 카테고리코드, 설명, 규격, 가격, 재고상태, 추천제품, 표시순서
+    fields = [
+        "name", "model_number", "category_code", "description", "specifications",
+        "price", "stock_status", "is_featured", "display_order"
+    ]
+    
+    def run_import() -> ProductImporter:
+        importer = ProductImporter(db, required=("name", "model_number", "category_code"))
+        # 데이터 행 처리 (2행부터, 빈 행 건너뛰기)
+        for row_idx, row in ExcelHandler.iter_rows(file.file, min_row=2):
+            importer.add(row_idx, dict(zip(fields, row)))
+        importer.finish()
+        db.commit()
+        return importer
     
-    # 헤더 검증 (첫 번째 행)
-    headers = [cell.value for cell in ws[1]]
-    required_headers = ["제품명", "모델번호", "카테고리코드"]
+    try:
+        importer = await run_in_threadpool(run_import)
+    except (InvalidFileException, zipfile.BadZipFile) as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"엑셀 파일을 읽을 수 없습니다: {e}")
     
-    # 결과 저장
     results = {
-        "success": [],
-        "errors": [],
-        "total": 0
+        "success": importer.created,
+        "errors": importer.errors,
+        "total": importer.total
     }
     
-    # 데이터 행 처리 (2행부터)
-    for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
-        results["total"] += 1
-        
-        try:
-            # 빈 행 건너뛰기
-            if not any(row):
-                continue
-            
-            # 데이터 파싱
-            name = row[0]
-            model_number = row[1]
-            category_code = row[2]
-            description = row[3] if len(row) > 3 else None
-            specifications = row[4] if len(row) > 4 else None
-            price = float(row[5]) if len(row) > 5 and row[5] else None
-            stock_status = row[6] if len(row) > 6 else "in_stock"
-            is_featured = str(row[7]).upper() == "TRUE" if len(row) > 7 else False
-            display_order = int(row[8]) if len(row) > 8 and row[8] else 0
-            
-            # 필수 필드 검증
-            if not name or not model_number or not category_code:
-                results["errors"].append({
-                    "row": row_idx,
-                    "error": "필수 필드 누락 (제품명, 모델번호, 카테고리코드)"
-                })
-                continue
-            
-            # 카테고리 존재 확인
-            category = category_crud.get_category_by_code(db, category_code)
-            if not category:
-                results["errors"].append({
-                    "row": row_idx,
-                    "error": f"존재하지 않는 카테고리 코드: {category_code}"
-                })
-                continue
-            
-            # 제품 생성
-            product_data = {
-                "name": name,
-                "model_number": model_number,
-                "category_id": category.id,
-                "description": description,
-                "specifications": specifications,
-                "price": price,
-                "stock_status": stock_status,
-                "is_featured": 1 if is_featured else 0,
-                "display_order": display_order,
-                "file_name": "default.jpg",
-                "file_path": json.dumps(["/images/default.jpg"])
-            }
-            
-            new_product = SafetyProduct(**product_data)
-            db.add(new_product)
-            db.commit()
-            db.refresh(new_product)
-            
-            results["success"].append({
-                "row": row_idx,
-                "id": new_product.id,
-                "name": name
-            })
-            
-        except Exception as e:
-            results["errors"].append({
-                "row": row_idx,
-                "error": str(e)
-            })
-            db.rollback()
-    
     logger.info(f"엑셀 업로드 완료: 성공 {len(results['success'])}개, 실패 {len(results['errors'])}개")
     
     return {
@@ -877,70 +776,53 @@ async def import_products_from_excel(
 @router.post("/images/bulk")
 async def bulk_upload_images(
     files: List[UploadFile] = File(...),
+    thumbnails: bool = Form(False),
     db: Session = Depends(get_db)
 ):
-    """여러 이미지를 동시에 업로드합니다."""
-    import os
-    import uuid
-    from pathlib import Path
+    """
+    여러 이미지를 동시에 업로드합니다.
     
+    파일마다 검증/저장/변형 생성을 BULK_UPLOAD_CONCURRENCY개까지 동시에 처리하며,
+    결과 순서는 업로드한 파일 순서와 같습니다.
+    
+    - variants: 크기별 변형 URL (thumb/card/detail), thumbnail_url: thumb 변형
+    - thumbnails: true면 IMAGE_VARIANTS_ENABLED가 꺼져 있어도 변형을 만들어 thumbnail_url을 항상 반환합니다
+    """
     if not files:
         raise HTTPException(status_code=400, detail="업로드할 파일이 없습니다")
     
-    upload_dir = Path("../frontend/public/images")
-    upload_dir.mkdir(parents=True, exist_ok=True)
-    
+    semaphore = asyncio.Semaphore(settings.BULK_UPLOAD_CONCURRENCY)
+    
+    async def process(file: UploadFile):
+        async with semaphore:
+            saved = None
+            try:
+                # 형식 / 크기 검증하며 청크 단위로 저장
+                saved = await save_image_upload(file, db, with_variants=True if thumbnails else None)
+                item = {
+                    "original_filename": file.filename,
+                    "saved_filename": saved.filename,
+                    "url": saved.url,
+                    "size": saved.size
+                }
+                if saved.variants:
+                    item["variants"] = saved.variants
+                    item["thumbnail_url"] = saved.variants["thumb"]
+                logger.info(f"이미지 업로드 성공: {file.filename} → {saved.filename}")
+                return item, None
+            except Exception as e:
+                if saved is not None:
+                    await discard_image_upload(db, saved)
+                if not isinstance(e, UploadError):
+                    logger.error(f"이미지 업로드 실패: {file.filename}, 오류: {e}")
+                return None, {"filename": file.filename, "error": str(e)}
+    
+    outcomes = await asyncio.gather(*(process(file) for file in files))
     results = {
-        "success": [],
-        "errors": []
+        "success": [item for item, _ in outcomes if item is not None],
+        "errors": [error for _, error in outcomes if error is not None]
     }
     
-    for file in files:
-        try:
-            # 파일 형식 검증
-            allowed_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
-            file_extension = os.path.splitext(file.filename)[1].lower()
-            
-            if file_extension not in allowed_extensions:
-                results["errors"].append({
-                    "filename": file.filename,
-                    "error": "지원하지 않는 파일 형식"
-                })
-                continue
-            
-            # 파일 크기 검증 (10MB 제한)
-            contents = await file.read()
-            if len(contents) > 10 * 1024 * 1024:  # 10MB
-                results["errors"].append({
-                    "filename": file.filename,
-                    "error": "파일 크기가 너무 큽니다 (최대 10MB)"
-                })
-                continue
-            
-            # 고유한 파일명 생성
-            unique_filename = f"{uuid.uuid4()}{file_extension}"
-            file_path = upload_dir / unique_filename
-            
-            # 파일 저장
-            with open(file_path, "wb") as f:
-                f.write(contents)
-            
-            results["success"].append({
-                "original_filename": file.filename,
-                "saved_filename": unique_filename,
-                "url": f"/images/{unique_filename}",
-                "size": len(contents)
-            })
-            
-            logger.info(f"이미지 업로드 성공: {file.filename} → {unique_filename}")
-            
-        except Exception as e:
-            results["errors"].append({
-                "filename": file.filename,
-                "error": str(e)
-            })
-            logger.error(f"이미지 업로드 실패: {file.filename}, 오류: {e}")
-    
     return {
         "message": f"총 {len(files)}개 중 {len(results['success'])}개 성공, {len(results['errors'])}개 실패",
         "success_count": len(results["success"]),
@@ -991,9 +873,11 @@ async def admin_advanced_search_products(
     - **stock_status**: 재고 상태 ("재고있음", "품절", "입고예정" 등)
     - **is_featured**: 추천 제품 여부
     - **created_after / created_before**: 등록 날짜 범위
-    - **sort_by**: 정렬 필드 (name, price, created_at, updated_at, display_order)
+    - **sort_by**: 정렬 필드 (name, price, created_at, updated_at, display_order, relevance)
     - **sort_order**: 정렬 순서 (asc, desc)
     - **skip / limit**: 페이징
+    - **count_mode**: 전체 개수 계산 방식 (window: 한 번의 쿼리로 계산(기본), estimated: 결과가 많으면 추정치, exact: 별도 COUNT)
+    - **cursor**: 이전 응답의 next_cursor (커서 기반 페이징)
     
     예시:
     ```json
@@ -1011,7 +895,10 @@ async def admin_advanced_search_products(
     }
     ```
     """
-    products, total = product_crud.advanced_search_products(db, params)
+    try:
+        products, total, next_cursor, total_is_estimate = product_crud.advanced_search_products(db, params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     # 페이지 정보 계산
     page = (params.skip // params.limit) + 1 if params.limit > 0 else 1
@@ -1022,7 +909,9 @@ async def admin_advanced_search_products(
         items=products,
         page=page,
         page_size=params.limit,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor,
+        total_is_estimate=total_is_estimate
     )
 
 
@@ -1285,6 +1174,10 @@ async def get_product_draft(
 # ==================== Excel 업로드/다운로드 ====================
 
 from utils.excel_handler import ExcelHandler
+from core.jobs import JobContext, job_dir, runner as job_runner
+from crud import job as job_crud
+from models.job import JobKind, JobStatus
+from schemas.job import JobResponse, JobSubmitted
 
 @router.get("/excel/template")
 async def download_excel_template():
@@ -1310,6 +1203,8 @@ async def download_excel_template():
 @router.get("/excel/export")
 async def export_products_excel(
     category_code: Optional[str] = None,
+    file_format: str = Query("xlsx", alias="format", pattern="^(xlsx|csv|ndjson)$"),
+    background: bool = False,
     db: Session = Depends(get_db)
 ):
     """
@@ -1317,30 +1212,44 @@ async def export_products_excel(
     
     - 전체 또는 특정 카테고리의 제품을 Excel 파일로 다운로드합니다
     - category_code: 특정 카테고리만 내보내기 (선택사항)
+    - format: xlsx (기본) / csv / ndjson - 행을 DB에서 나누어 읽으며 스트리밍합니다
+    - background: true면 백그라운드 작업으로 실행하고 작업 ID를 반환합니다 (202).
+      GET /jobs/{job_id}로 진행 상태를, 완료 후 GET /jobs/{job_id}/download로 파일을 받습니다.
     """
-    logger.info(f"Excel 내보내기 - 카테고리: {category_code or '전체'}")
-    
-    try:
-        excel_file = await ExcelHandler.export_products(db, category_code)
-        
-        filename = f"products_{category_code if category_code else 'all'}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    logger.info(f"Excel 내보내기 - 카테고리: {category_code or '전체'}, 형식: {file_format}, 백그라운드: {background}")
+    
+    media_type, extension = ExcelHandler.EXPORT_FORMATS[file_format]
+    filename = f"products_{category_code if category_code else 'all'}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extension}"
+    
+    if background:
+        def run_export(job_db: Session, context: JobContext):
+            output_path = context.path(extension)
+            with open(output_path, "wb") as output:
+                ExcelHandler.write_products(job_db, category_code, file_format, output)
+            context.set_output(output_path, filename)
+            return {"message": f"{filename} 생성 완료"}
         
-        return StreamingResponse(
-            excel_file,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}"
-            }
+        job = job_runner.submit(
+            db, JobKind.PRODUCT_EXPORT, {"category_code": category_code, "format": file_format}, run_export
         )
-    except Exception as e:
-        logger.error(f"Excel 내보내기 실패: {e}")
-        raise HTTPException(status_code=500, detail=f"Excel 내보내기 실패: {str(e)}")
+        return _job_submitted(job)
+    
+    # 응답 전송 중에 DB를 읽으므로 요청 세션과 같은 DB의 전용 세션으로 스트리밍
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind())
+    return StreamingResponse(
+        ExcelHandler.stream_products(session_factory, category_code, file_format),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}"
+        }
+    )
 
 
 @router.post("/excel/import")
 async def import_products_excel(
     file: UploadFile = File(...),
     mode: str = Form('append'),
+    background: bool = Form(False),
     db: Session = Depends(get_db)
 ):
     """
@@ -1348,6 +1257,8 @@ async def import_products_excel(
     
     - file: Excel 파일 (.xlsx, .xls)
     - mode: 'append' (기존 데이터에 추가) 또는 'replace' (전체 교체)
+    - background: true면 업로드 파일을 저장한 뒤 백그라운드 작업으로 가져오고 작업 ID를 반환합니다 (202).
+      GET /jobs/{job_id}로 처리 행 수, 오류 목록을 확인합니다.
     
     Returns:
         - total: 전체 처리 건수
@@ -1362,6 +1273,29 @@ async def import_products_excel(
     if not is_valid:
         raise HTTPException(status_code=400, detail=message)
     
+    if background:
+        # 업로드 임시 파일은 요청이 끝나면 사라지므로 작업 디렉토리로 복사 (청크 단위, 메모리 사용량 일정)
+        source_path = job_dir() / f"upload_{uuid.uuid4().hex}.xlsx"
+        await run_in_threadpool(_save_upload, file, source_path)
+        
+        def run_import(job_db: Session, context: JobContext):
+            try:
+                with open(source_path, "rb") as source:
+                    result = ExcelHandler.import_from_source(
+                        source, job_db, mode,
+                        on_progress=lambda importer: context.progress(importer.total, len(importer.errors))
+                    )
+            finally:
+                source_path.unlink(missing_ok=True)
+            if not result['success']:
+                raise RuntimeError(result['message'])
+            context.progress(result['total'], result['error_count'])
+            context.errors = result['errors']
+            return {key: value for key, value in result.items() if key != 'errors'}
+        
+        job = job_runner.submit(db, JobKind.PRODUCT_IMPORT, {"file_name": file.filename, "mode": mode}, run_import)
+        return _job_submitted(job)
+    
     try:
         result = await ExcelHandler.import_products(file, db, mode)
         
@@ -1377,6 +1311,61 @@ async def import_products_excel(
         raise HTTPException(status_code=500, detail=f"파일 처리 중 오류: {str(e)}")
 
 
+def _save_upload(file: UploadFile, path: Path):
+    file.file.seek(0)
+    with open(path, "wb") as out:
+        shutil.copyfileobj(file.file, out, 1024 * 1024)
+
+
+def _job_submitted(job) -> JSONResponse:
+    return JSONResponse(
+        status_code=202,
+        content=JobSubmitted(job_id=job.id, status=job.status, status_url=f"/api/admin/jobs/{job.id}").model_dump(mode="json")
+    )
+
+
+# ==================== 백그라운드 작업 ====================
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job_status(job_id: str, db: Session = Depends(get_db)):
+    """
+    백그라운드 작업 상태 조회
+    
+    - status: QUEUED / RUNNING / SUCCEEDED / FAILED
+    - processed_rows, error_count: 진행률 (실행 중이면 이 워커의 최신 값)
+    - errors: 행 단위 오류 (최대 100건)
+    - download_url: 결과 파일이 있는 완료된 작업
+    """
+    job = job_crud.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    
+    response = JobResponse.model_validate(job)
+    live = job_runner.live_progress(job_id)
+    if live is not None and job.status in (JobStatus.QUEUED, JobStatus.RUNNING):
+        response.processed_rows, response.error_count = live
+    if job.status == JobStatus.SUCCEEDED and job.file_path:
+        response.download_url = f"/api/admin/jobs/{job_id}/download"
+    return response
+
+
+@router.get("/jobs/{job_id}/download")
+async def download_job_result(job_id: str, db: Session = Depends(get_db)):
+    """완료된 작업의 결과 파일 다운로드"""
+    job = job_crud.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    if job.status != JobStatus.SUCCEEDED or not job.file_path:
+        raise HTTPException(status_code=409, detail="다운로드할 결과 파일이 없습니다")
+    if not Path(job.file_path).exists():
+        raise HTTPException(status_code=410, detail="결과 파일이 만료되었습니다")
+    media_type = next(
+        (media for media, extension in ExcelHandler.EXPORT_FORMATS.values() if job.file_name.endswith(extension)),
+        "application/octet-stream"
+    )
+    return FileResponse(job.file_path, media_type=media_type, filename=job.file_name)
+
+
 @router.post("/products/{product_id}/duplicate")
 async def duplicate_product(
     product_id: int,
@@ -1412,13 +1401,14 @@ async def duplicate_product(
         )
         
         db.add(new_product)
+        image_blob_crud.retain(db, set(image_files.parse_image_paths(original.file_path)))
         db.commit()
         db.refresh(new_product)
         
         logger.info(f"제품 복제 완료 - 새 ID: {new_product.id}")
         
         # Audit Log
-        log_product_create(db, new_product, user_id="admin", notes=f"제품 #{product_id} 복제")
+        await log_product_create(db, new_product, user_id="admin", notes=f"제품 #{product_id} 복제")
         
         return {
             "success": True,
@@ -0,0 +1,196 @@
+"""
+Audit log writer
+감사 로그를 요청 세션에서 바로 커밋하지 않고 메모리 큐에 넣은 뒤, 백그라운드 스레드가 모아서 INSERT 합니다.
+
+- 큐 크기는 AUDIT_QUEUE_SIZE로 제한하며, 가득 차면 기록을 버리지 않고 자리가 날 때까지 호출한 쪽을 기다리게 합니다.
+  관리자 라우트(async def)는 put으로 스레드풀에서 기다리므로 이벤트 루프는 막히지 않습니다.
+- AUDIT_FLUSH_INTERVAL마다, 또는 AUDIT_BATCH_SIZE건이 쌓이면 바로 한 번의 INSERT로 기록합니다.
+- 일괄 INSERT가 실패하면 한 건씩 다시 넣어 문제 있는 행만 남기고, 남은 행은 지수 백오프로
+  MAX_ATTEMPTS번까지 다시 시도합니다. 끝내 실패한 행은 내용을 에러 로그로 남깁니다.
+- 기록 시각(created_at)은 큐에 넣을 때 정하므로 지연 기록되어도 실제 작업 시각이 남습니다.
+- 종료 시(main.py lifespan, 프로세스 종료) 남은 기록을 모두 쓰고 끝냅니다.
+"""
+import atexit
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+from core.logger import get_logger
+from models.audit import AuditLog
+
+logger = get_logger(__name__)
+
+# (기록할 DB 엔진, audit_logs 행 값, 실패 횟수)
+AuditRecord = Tuple[Engine, Dict[str, Any], int]
+
+# 실패한 기록 재시도 (1초부터 두 배씩, 최대 60초 간격, 5번 실패하면 포기)
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+MAX_ATTEMPTS = 5
+
+
+def _describe(values: Dict[str, Any]) -> str:
+    return (f"{values.get('entity_type')} #{values.get('entity_id')} {values.get('action')} "
+            f"({values.get('created_at')}): {values.get('changes_summary')}")
+
+
+class AuditWriter:
+    """감사 로그 배치 기록기"""
+
+    def __init__(self, max_size: int = 10000, batch_size: int = 500, flush_interval: float = 1.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[AuditRecord]" = queue.Queue(maxsize=max_size)
+        self._retries: List[Tuple[float, AuditRecord]] = []  # (다시 시도할 시각, 기록)
+        self._lock = threading.Lock()
+        self._retry_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def _wait_for_space(self, record: AuditRecord):
+        # 기록기가 밀려 있으면 유실 대신 자리가 날 때까지 대기 (기록기는 바로 깨움)
+        logger.warning("감사 로그 큐가 가득 차 기록기가 비울 때까지 기다립니다")
+        self._wakeup.set()
+        self._queue.put(record)
+
+    def _notify(self):
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+
+    def enqueue(self, bind: Engine, values: Dict[str, Any]):
+        """기록 예약 (동기 코드/스레드용, DB 왕복 없음). 큐가 가득 차면 이 스레드에서 기다립니다."""
+        self._ensure_started()
+        record = (bind, values, 0)
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self._wait_for_space(record)
+        self._notify()
+
+    async def put(self, bind: Engine, values: Dict[str, Any]):
+        """기록 예약 (비동기 라우트용). 큐가 가득 차면 스레드풀에서 기다려 이벤트 루프를 막지 않습니다."""
+        self._ensure_started()
+        record = (bind, values, 0)
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            await run_in_threadpool(self._wait_for_space, record)
+        self._notify()
+
+    def _drain(self) -> List[AuditRecord]:
+        records = []
+        while len(records) < self.batch_size:
+            try:
+                records.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return records
+
+    def _insert(self, bind: Engine, rows: List[Dict[str, Any]]):
+        with bind.begin() as connection:
+            connection.execute(insert(AuditLog), rows)
+
+    def _write(self, records: List[AuditRecord]) -> List[AuditRecord]:
+        """기록 후 실패한 기록을 반환합니다. 일괄 INSERT가 실패하면 한 건씩 다시 넣습니다."""
+        by_bind: Dict[Engine, List[AuditRecord]] = defaultdict(list)
+        for record in records:
+            by_bind[record[0]].append(record)
+        failed = []
+        for bind, grouped in by_bind.items():
+            try:
+                self._insert(bind, [values for _, values, _ in grouped])
+                continue
+            except Exception as e:
+                logger.warning(f"감사 로그 {len(grouped)}건 일괄 기록 실패 - 한 건씩 다시 기록합니다: {e}")
+            for index, record in enumerate(grouped):
+                try:
+                    self._insert(bind, [record[1]])
+                except OperationalError as e:
+                    # DB 연결 문제 - 나머지도 실패할 것이므로 함께 재시도로 넘김
+                    logger.error(f"감사 로그 기록 실패 (DB 연결): {e}")
+                    failed.extend(grouped[index:])
+                    break
+                except Exception as e:
+                    logger.error(f"감사 로그 기록 실패: {_describe(record[1])}: {e}")
+                    failed.append(record)
+        return failed
+
+    def _schedule_retries(self, failed: List[AuditRecord]):
+        now = time.monotonic()
+        with self._retry_lock:
+            for bind, values, attempts in failed:
+                attempts += 1
+                if attempts >= MAX_ATTEMPTS:
+                    logger.error(f"감사 로그 기록 포기 ({attempts}회 실패): {_describe(values)}")
+                    continue
+                delay = min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+                self._retries.append((now + delay, (bind, values, attempts)))
+
+    def _due_retries(self, force: bool = False) -> List[AuditRecord]:
+        now = time.monotonic()
+        with self._retry_lock:
+            due = [record for retry_at, record in self._retries if force or retry_at <= now]
+            self._retries = [(retry_at, record) for retry_at, record in self._retries
+                             if not (force or retry_at <= now)]
+        return due
+
+    def flush(self, force: bool = False) -> int:
+        """
+        큐에 쌓인 기록과 다시 시도할 때가 된 기록을 씁니다 (force면 대기 중인 재시도 전부).
+        기록한 건수를 반환합니다.
+        """
+        total = 0
+        with self._flush_lock:
+            records = self._due_retries(force)
+            while True:
+                records += self._drain()
+                if not records:
+                    return total
+                failed = self._write(records)
+                self._schedule_retries(failed)
+                total += len(records) - len(failed)
+                records = []
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def shutdown(self):
+        """기록 스레드 종료 후 남은 기록을 모두 씁니다 (재시도 대기 중인 기록도 한 번 더 시도)."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stopping.set()
+            self._wakeup.set()
+            thread.join()
+        self.flush(force=True)
+        for _, values, attempts in self._due_retries(force=True):
+            logger.error(f"감사 로그 기록 포기 (종료 시 {attempts}회 실패): {_describe(values)}")
+
+
+writer = AuditWriter(
+    max_size=settings.AUDIT_QUEUE_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL,
+)
+atexit.register(writer.shutdown)
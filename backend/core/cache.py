@@ -0,0 +1,68 @@
+"""
+In-process cache utilities
+워커 프로세스 내부에서 사용하는 간단한 TTL 캐시
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """스레드 안전한 인메모리 TTL 캐시 (최대 크기 초과 시 가장 오래된 항목부터 제거)"""
+
+    def __init__(self, ttl: Optional[float], maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # clear()/delete() 때마다 증가 - 조회 중에 무효화된 값을 저장하지 않도록 사용
+        self.generation = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """캐시된 값을 반환합니다 (만료되었거나 없으면 default)."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, generation: Optional[int] = None) -> bool:
+        """
+        값을 저장합니다.
+
+        - ttl: None이면 캐시 기본값 사용 (기본값도 None이면 만료 없음), 0 이하이면 저장하지 않음
+        - generation: 그 사이에 무효화가 일어났다면 저장하지 않고 False를 반환
+        """
+        ttl = self.ttl if ttl is None else ttl
+        if ttl is not None and ttl <= 0:
+            return False
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return False
+            expires_at = time.monotonic() + ttl if ttl is not None else None
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return True
+
+    def delete(self, key: Hashable):
+        """특정 키를 무효화합니다."""
+        with self._lock:
+            self._data.pop(key, None)
+            self.generation += 1
+
+    def clear(self):
+        """전체 캐시를 무효화합니다."""
+        with self._lock:
+            self._data.clear()
+            self.generation += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
@@ -0,0 +1,118 @@
+"""
+Cache backends
+워커/컨테이너 간 공유 가능한 키-값 캐시 백엔드
+
+- MemoryCacheBackend: 프로세스 내부 LRU (단일 워커, 개발/테스트용)
+- RedisCacheBackend: Redis 프로토콜 서버 (운영, 테스트에서는 fakeredis 클라이언트 주입)
+
+값은 bytes로 저장하며, 태그 기반 무효화는 utils.response_cache에서 incr 카운터로 구현합니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+
+class CacheBackend:
+    """캐시 백엔드 인터페이스"""
+
+    # 네트워크 I/O가 있는 백엔드는 이벤트 루프를 막지 않도록 스레드풀에서 호출
+    blocking = False
+
+    def mget(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        """여러 키를 한 번에 조회합니다 (없으면 None)."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float):
+        """값을 저장합니다 (ttl초 후 만료)."""
+        raise NotImplementedError
+
+    def incr(self, key: str) -> int:
+        """만료 없는 정수 카운터를 1 증가시키고 새 값을 반환합니다."""
+        raise NotImplementedError
+
+    def clear(self):
+        """이 백엔드가 저장한 모든 값을 삭제합니다."""
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """스레드 안전한 프로세스 내부 LRU 백엔드"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def mget(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        now = time.monotonic()
+        values = []
+        with self._lock:
+            for key in keys:
+                if key in self._counters:
+                    values.append(str(self._counters[key]).encode())
+                    continue
+                item = self._data.get(key)
+                if item is None or item[0] <= now:
+                    self._data.pop(key, None)
+                    values.append(None)
+                    continue
+                self._data.move_to_end(key)
+                values.append(item[1])
+        return values
+
+    def set(self, key: str, value: bytes, ttl: float):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._counters.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis 백엔드 (모든 키에 prefix를 붙여 다른 용도의 키와 분리)"""
+
+    blocking = True
+
+    def __init__(self, client, prefix: str = "cache"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "cache", timeout: float = 0.5) -> "RedisCacheBackend":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis 를 사용하려면 redis 패키지가 필요합니다") from e
+        client = redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        return cls(client, prefix=prefix)
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def mget(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+        return self.client.mget([self._key(key) for key in keys])
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self.client.set(self._key(key), value, px=max(int(ttl * 1000), 1))
+
+    def incr(self, key: str) -> int:
+        return self.client.incr(self._key(key))
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=f"{self.prefix}:*", count=500))
+        for start in range(0, len(keys), 500):
+            self.client.delete(*keys[start:start + 500])
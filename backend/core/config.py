@@ -12,11 +12,19 @@ class Settings(BaseSettings):
     
     # Database
     DB_USER: str = "postgres"
-    DB_PASSWORD: str
+    DB_PASSWORD: str = ""  # 운영에서는 반드시 설정 (비어 있으면 import는 되고 DB 연결 시 인증 실패)
     DB_HOST: str = "localhost"
     DB_PORT: int = 5432
     DB_NAME: str = "boram_safety"
     
+    # Database connection pool
+    DB_POOL_SIZE: int = 5  # 워커당 상시 유지 커넥션 수
+    DB_MAX_OVERFLOW: int = 10  # 풀 크기를 초과해 임시로 허용할 커넥션 수
+    DB_POOL_TIMEOUT: float = 30  # 커넥션 대기 최대 시간 (초)
+    DB_POOL_RECYCLE: int = 1800  # 커넥션 재생성 주기 (초, -1이면 비활성화)
+    DB_POOL_PRE_PING: bool = True  # 체크아웃 시 커넥션 유효성 확인
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 쿼리 실행 제한 시간 (밀리초, 0이면 제한 없음)
+    
     # Backend
     BACKEND_HOST: str = "0.0.0.0"
     BACKEND_PORT: int = 8000
@@ -26,6 +34,56 @@ class Settings(BaseSettings):
     
     # Upload
     UPLOAD_DIR: str = "../frontend/public/images"
+    MAX_FILE_SIZE: int = 10  # 이미지 업로드 최대 크기 (MB)
+    BULK_UPLOAD_CONCURRENCY: int = 8  # 이미지 일괄 업로드 동시 처리 파일 수
+    IMAGE_VARIANTS_ENABLED: bool = True  # 업로드 시 크기별 변형(thumb/card/detail) 생성
+    IMAGE_VARIANT_FORMAT: str = "webp"  # 변형 형식: webp / jpeg
+    IMAGE_VARIANT_QUALITY: int = 80
+    IMAGE_UPLOAD_LEASE: float = 86400  # 업로드 후 제품에 연결되지 않은 이미지를 보존하는 시간 (초)
+    IMAGE_GC_INTERVAL: float = 3600  # 참조 없는 업로드 이미지 정리 주기 (초, 0이면 시작 시 한 번만)
+    IMAGE_RESIZE_MAX_DIM: int = 2400  # /images/...?w=&h= 최대 크기 (px)
+    IMAGE_CACHE_DIR: str = "./data/image_cache"  # 리사이즈 결과 캐시 경로
+    IMAGE_CACHE_MAX_MB: int = 512  # 리사이즈 캐시 최대 크기 (넘으면 오래 안 쓴 파일부터 삭제)
+    IMAGE_CACHE_MAX_AGE: int = 86400  # 리사이즈 응답 Cache-Control max-age (초)
+    EXCEL_MAX_UPLOAD_MB: int = 50  # 엑셀 가져오기 최대 파일 크기 (MB, 행 단위 스트리밍으로 처리)
+    
+    # Background Jobs (엑셀 가져오기/내보내기 background=true)
+    JOB_WORKERS: int = 2  # 워커 프로세스당 동시 실행 작업 수
+    JOB_DIR: str = "./data/jobs"  # 업로드 원본 / 결과 파일 저장 경로
+    JOB_PROGRESS_INTERVAL: float = 2  # 진행률 DB 기록 주기 (초)
+    JOB_HEARTBEAT_INTERVAL: float = 30  # 실행 중인 작업 heartbeat 기록 주기 (초)
+    JOB_STALE_AFTER: float = 300  # heartbeat가 이 시간 동안 없는 미완료 작업은 중단된 것으로 보고 FAILED 처리 (초)
+    JOB_RETENTION: float = 604800  # 끝난 작업 행과 결과/업로드 파일 보존 기간 (초)
+    JOB_SWEEP_INTERVAL: float = 300  # 중단된 작업 / 보존 기간 정리 주기 (초, 0이면 시작 시 한 번만)
+    
+    # Dashboard Stats
+    STATS_RECONCILE_INTERVAL: float = 3600  # 대시보드 통계 전체 재계산 주기 (초, 0이면 시작 시 한 번만)
+    
+    # Audit Log (요청과 분리해 백그라운드 스레드에서 모아서 기록)
+    AUDIT_QUEUE_SIZE: int = 10000  # 기록 대기 최대 건수 (가득 차면 자리가 날 때까지 요청이 대기)
+    AUDIT_BATCH_SIZE: int = 500  # 한 번에 INSERT 하는 최대 건수
+    AUDIT_FLUSH_INTERVAL: float = 1.0  # 기록 주기 (초)
+    
+    # Cache
+    CATEGORY_CACHE_TTL: float = 300  # 카테고리 캐시 유지 시간 (초, 0이면 캐시 사용 안 함)
+    SETTINGS_CACHE_TTL: float = 60  # 사이트 설정 캐시 유지 시간 (초, 다른 워커의 변경 반영 주기)
+    SUGGESTION_INDEX_TTL: float = 3600  # 자동완성 인덱스 전체 재구성 주기 (초, 다른 워커/벌크 변경은 따라잡기로 반영 - 시각을 남기지 않는 직접 SQL 변경의 상한)
+    CATALOG_VERSION_TTL: float = 2  # 카탈로그 버전(ETag) 캐시 유지 시간 (초, 다른 워커의 변경이 ETag와 워커별 캐시에 반영되는 주기)
+    
+    # Response Cache (공개 API 응답 공유 캐시)
+    RESPONSE_CACHE_BACKEND: str = "memory"  # memory(워커별, 카탈로그 응답은 버전 키로 다른 워커 변경 반영) / redis(워커·컨테이너 공유) / none
+    RESPONSE_CACHE_TTL: float = 300  # 응답 캐시 유지 시간 (초, 변경 시에는 태그로 즉시 무효화)
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1000  # memory 백엔드 최대 항목 수
+    RESPONSE_CACHE_PREFIX: str = "boram:cache"  # redis 키 접두어
+    REDIS_URL: str = "redis://localhost:6379/0"
+    
+    # HTTP Cache (공개 카탈로그 GET 응답의 Cache-Control max-age, 초)
+    HTTP_CACHE_PRODUCTS_MAX_AGE: int = 60
+    HTTP_CACHE_CATEGORIES_MAX_AGE: int = 300
+    HTTP_CACHE_SUGGESTIONS_MAX_AGE: int = 60
+    
+    # Search
+    SEARCH_COUNT_ESTIMATE_THRESHOLD: int = 10000  # count_mode=estimated일 때 이 행 수 이상이면 추정치 사용
     
     # Environment
     ENVIRONMENT: str = "development"
@@ -39,6 +97,11 @@ class Settings(BaseSettings):
         """Build PostgreSQL database URL"""
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
     
+    @property
+    def async_database_url(self) -> str:
+        """Build PostgreSQL database URL for the asyncpg driver"""
+        return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+    
     @property
     def is_development(self) -> bool:
         """Check if running in development mode"""
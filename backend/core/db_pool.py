@@ -0,0 +1,90 @@
+"""
+Database connection pool instrumentation
+커넥션 풀 사용량(체크아웃, 오버플로, 대기 시간) 지표 수집
+"""
+import threading
+import time
+from typing import Dict, Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool
+
+
+class PoolMetrics:
+    """커넥션 풀 누적 지표"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """누적 지표 초기화"""
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_time_total = 0.0
+            self.wait_time_max = 0.0
+            self.peak_checked_out = 0
+
+    def record_checkout(self, wait_seconds: float, checked_out: int, timed_out: bool = False):
+        """커넥션 획득(또는 대기 시간 초과) 기록"""
+        with self._lock:
+            self.wait_time_total += wait_seconds
+            self.wait_time_max = max(self.wait_time_max, wait_seconds)
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재까지의 누적 지표 반환"""
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "peak_checked_out": self.peak_checked_out,
+                "wait_time_total_ms": round(self.wait_time_total * 1000, 3),
+                "wait_time_avg_ms": round(self.wait_time_total * 1000 / attempts, 3) if attempts else 0.0,
+                "wait_time_max_ms": round(self.wait_time_max * 1000, 3),
+            }
+
+
+def _checked_out(pool: Pool) -> int:
+    checkedout = getattr(pool, "checkedout", None)
+    return checkedout() if checkedout else 0
+
+
+def instrument_pool_class(pool_class: type, metrics: PoolMetrics) -> type:
+    """
+    커넥션 획득 대기 시간을 기록하는 풀 클래스를 생성합니다.
+
+    SQLAlchemy는 dispose() 시 같은 클래스로 풀을 다시 만들기 때문에
+    지표 객체는 인스턴스가 아닌 클래스에 묶어 둡니다.
+    """
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = pool_class._do_get(self)
+        except exc.TimeoutError:
+            metrics.record_checkout(time.perf_counter() - started, _checked_out(self), timed_out=True)
+            raise
+        metrics.record_checkout(time.perf_counter() - started, _checked_out(self))
+        return connection
+
+    return type(f"Instrumented{pool_class.__name__}", (pool_class,), {"_do_get": _do_get})
+
+
+def pool_status(pool: Pool, metrics: PoolMetrics) -> Dict[str, Any]:
+    """풀의 현재 상태와 누적 지표를 함께 반환합니다."""
+    status: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow", "timeout"):
+        method = getattr(pool, name, None)
+        if method is not None:
+            status[name] = method()
+    if "overflow" in status:
+        # QueuePool은 풀이 다 차기 전까지 음수(-pool_size부터 시작)를 반환함
+        status["overflow"] = max(status["overflow"], 0)
+    status.update(metrics.snapshot())
+    return status
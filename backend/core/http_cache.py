@@ -0,0 +1,115 @@
+"""
+HTTP caching helpers
+ETag 생성 및 조건부 요청(If-None-Match / If-Modified-Since) 처리
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def make_etag(*parts: object, weak: bool = False) -> str:
+    """주어진 값들로부터 ETag 문자열을 생성합니다."""
+    digest = hashlib.sha1("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+
+def _opaque_tag(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 현재 ETag와 일치하는지 확인합니다 (약한 비교)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = _opaque_tag(etag)
+    return any(_opaque_tag(candidate) == current for candidate in if_none_match.split(","))
+
+
+def _http_date(value: datetime) -> str:
+    return format_datetime(value.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def _not_modified_since(if_modified_since: Optional[str], last_modified: Optional[datetime]) -> bool:
+    if not if_modified_since or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+VersionProvider = Callable[[Request], Awaitable[Tuple[object, Optional[datetime]]]]
+
+
+class ConditionalGetMiddleware:
+    """
+    버전 기반 조건부 GET 미들웨어 (ASGI)
+
+    rules의 경로 접두어에 해당하는 GET/HEAD 요청에 대해
+    version_provider가 돌려준 (버전, 마지막 변경 시각)으로 ETag / Last-Modified를 만들고,
+    클라이언트 검증자(If-None-Match, If-Modified-Since)가 일치하면 라우트를 실행하지 않고 304를 반환합니다.
+    이미 자체 ETag를 붙이는 라우트의 응답 헤더는 덮어쓰지 않습니다.
+    """
+
+    def __init__(self, app: ASGIApp, rules: Dict[str, str], version_provider: VersionProvider):
+        self.app = app
+        # 긴 접두어부터 비교
+        self.rules = sorted(rules.items(), key=lambda rule: len(rule[0]), reverse=True)
+        self.version_provider = version_provider
+
+    def _cache_control(self, path: str) -> Optional[str]:
+        for prefix, cache_control in self.rules:
+            if path == prefix or path.startswith(prefix.rstrip("/") + "/"):
+                return cache_control
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            return await self.app(scope, receive, send)
+        cache_control = self._cache_control(scope["path"])
+        if cache_control is None:
+            return await self.app(scope, receive, send)
+
+        request = Request(scope)
+        try:
+            version, last_modified = await self.version_provider(request)
+        except Exception as e:
+            logger.warning(f"캐시 버전 조회 실패, 검증자 없이 응답: {e}")
+            return await self.app(scope, receive, send)
+
+        etag = make_etag("catalog", version, weak=True)
+        validators = {"ETag": etag, "Cache-Control": cache_control}
+        if last_modified is not None:
+            validators["Last-Modified"] = _http_date(last_modified)
+
+        if_none_match = request.headers.get("if-none-match")
+        if etag_matches(if_none_match, etag) or (
+            if_none_match is None and _not_modified_since(request.headers.get("if-modified-since"), last_modified)
+        ):
+            return await Response(status_code=304, headers=validators)(scope, receive, send)
+
+        async def send_with_validators(message: Message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                if "etag" not in headers:
+                    for name, value in validators.items():
+                        headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_validators)
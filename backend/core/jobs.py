@@ -0,0 +1,247 @@
+"""
+Background jobs
+엑셀 가져오기/내보내기처럼 오래 걸리는 작업을 요청과 분리해 로컬 프로세스 스레드풀에서 실행합니다.
+
+- 작업 상태/진행률/결과는 jobs 테이블에 저장하므로 어느 워커에서든 GET /jobs/{id}로 조회할 수 있습니다.
+- 결과 파일(내보내기)과 업로드 원본(가져오기)은 JOB_DIR에 저장합니다.
+- 진행률은 이 프로세스 메모리에 즉시 반영하고, DB에는 JOB_PROGRESS_INTERVAL마다 별도 세션으로 기록합니다.
+  (SQLite는 작업 트랜잭션이 쓰기 잠금을 잡고 있어 중간 기록을 생략하고 완료 시에만 기록)
+- 대기/실행 중인 작업은 JOB_HEARTBEAT_INTERVAL마다 heartbeat_at을 갱신합니다 (SQLite는 진행률과 같은 이유로 생략).
+  워커가 죽거나 재시작되어 JOB_STALE_AFTER 동안 heartbeat가 없는 작업은 정리 작업이 FAILED로 기록합니다.
+- 정리 작업(sweep_periodically, main.py lifespan)은 JOB_RETENTION이 지난 작업 행과 JOB_DIR 파일도 삭제합니다.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+from core.logger import get_logger
+from crud import job as job_crud
+from models.job import Job, JobKind, JobStatus
+
+logger = get_logger(__name__)
+
+# jobs 테이블에 저장하는 행 단위 오류 최대 건수
+JOB_MAX_ERRORS = 100
+
+
+def job_dir() -> Path:
+    path = Path(settings.JOB_DIR).resolve()
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+class JobContext:
+    """작업 함수에 전달되는 진행률 보고 / 결과 파일 도우미"""
+
+    def __init__(self, runner: "JobRunner", job_id: str, session_factory: sessionmaker, persist_progress: bool):
+        self.job_id = job_id
+        self.processed_rows = 0
+        self.error_count = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.file_path: Optional[str] = None
+        self.file_name: Optional[str] = None
+        self._runner = runner
+        self._session_factory = session_factory
+        self._persist_progress = persist_progress
+        self._last_persisted = time.monotonic()
+
+    def path(self, suffix: str) -> Path:
+        """이 작업 전용 파일 경로 (JOB_DIR/<job_id><suffix>)"""
+        return job_dir() / f"{self.job_id}{suffix}"
+
+    def set_output(self, path: Path, file_name: str):
+        """다운로드할 결과 파일 지정"""
+        self.file_path, self.file_name = str(path), file_name
+
+    def progress(self, processed_rows: int, error_count: int = 0):
+        """진행률 보고"""
+        self.processed_rows, self.error_count = processed_rows, error_count
+        self._runner._live[self.job_id] = (processed_rows, error_count)
+        if not self._persist_progress or time.monotonic() - self._last_persisted < settings.JOB_PROGRESS_INTERVAL:
+            return
+        self._last_persisted = time.monotonic()
+        db = self._session_factory()
+        try:
+            job_crud.update_job(db, self.job_id, processed_rows=processed_rows, error_count=error_count)
+        except Exception as e:
+            logger.warning(f"작업 진행률 기록 실패 ({self.job_id}): {e}")
+        finally:
+            db.close()
+
+
+# 작업 함수: (전용 세션, 컨텍스트) -> 결과 dict. 예외가 발생하면 FAILED로 기록
+JobFunction = Callable[[Session, JobContext], Optional[Dict[str, Any]]]
+
+
+class JobRunner:
+    """로컬 프로세스 작업 실행기"""
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._live: Dict[str, Tuple[int, int]] = {}
+        # 대기/실행 중인 작업 id -> 세션 팩토리 (제출 시 등록, 끝나면 제거 - heartbeat 기록 대상)
+        self._heartbeats: Dict[str, sessionmaker] = {}
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+            return self._executor
+
+    def submit(self, db: Session, kind: JobKind, params: Optional[Dict[str, Any]], func: JobFunction) -> Job:
+        """
+        작업을 등록하고 바로 반환합니다.
+        작업 함수는 요청 세션과 같은 DB에 연결된 별도 세션으로 실행됩니다.
+        """
+        job = job_crud.create_job(db, kind, params)
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind())
+        with self._lock:
+            self._heartbeats[job.id] = session_factory
+        if db.get_bind().dialect.name != "sqlite":
+            self._ensure_heartbeat()
+        self._get_executor().submit(self._run, job.id, session_factory, func)
+        return job
+
+    def live_progress(self, job_id: str) -> Optional[Tuple[int, int]]:
+        """이 프로세스에서 실행 중인 작업의 (처리 행 수, 오류 수)"""
+        return self._live.get(job_id)
+
+    def live_job_ids(self) -> List[str]:
+        """이 프로세스에서 대기/실행 중인 작업 id"""
+        with self._lock:
+            return list(self._heartbeats)
+
+    def _ensure_heartbeat(self):
+        with self._lock:
+            if self._heartbeat_thread is not None and self._heartbeat_thread.is_alive():
+                return
+            self._stopping.clear()
+            self._heartbeat_thread = threading.Thread(target=self._beat, name="job-heartbeat", daemon=True)
+            self._heartbeat_thread.start()
+
+    def _beat(self):
+        while not self._stopping.wait(settings.JOB_HEARTBEAT_INTERVAL):
+            with self._lock:
+                by_factory: Dict[sessionmaker, List[str]] = {}
+                for job_id, session_factory in self._heartbeats.items():
+                    if session_factory.kw["bind"].dialect.name == "sqlite":
+                        continue
+                    by_factory.setdefault(session_factory, []).append(job_id)
+            for session_factory, job_ids in by_factory.items():
+                db = session_factory()
+                try:
+                    job_crud.touch_jobs(db, job_ids)
+                except Exception as e:
+                    logger.warning(f"작업 heartbeat 기록 실패 ({len(job_ids)}건): {e}")
+                finally:
+                    db.close()
+
+    def _run(self, job_id: str, session_factory: sessionmaker, func: JobFunction):
+        db = session_factory()
+        persist_progress = db.get_bind().dialect.name != "sqlite"
+        context = JobContext(self, job_id, session_factory, persist_progress)
+        self._live[job_id] = (0, 0)
+        try:
+            job_crud.start_job(db, job_id)
+            try:
+                result = func(db, context) or {}
+            except Exception as e:
+                db.rollback()
+                logger.error(f"작업 실패 ({job_id}): {e}")
+                job_crud.finish_job(
+                    db, job_id, JobStatus.FAILED, message=str(e),
+                    processed_rows=context.processed_rows, error_count=context.error_count,
+                    errors=context.errors[:JOB_MAX_ERRORS] or None
+                )
+                return
+            job_crud.finish_job(
+                db, job_id, JobStatus.SUCCEEDED, result=result, message=result.get("message"),
+                processed_rows=context.processed_rows, error_count=context.error_count,
+                errors=context.errors[:JOB_MAX_ERRORS] or None,
+                file_path=context.file_path, file_name=context.file_name
+            )
+            logger.info(f"작업 완료 ({job_id}): {context.processed_rows}행, 오류 {context.error_count}건")
+        except Exception as e:
+            logger.error(f"작업 상태 기록 실패 ({job_id}): {e}")
+        finally:
+            self._live.pop(job_id, None)
+            with self._lock:
+                self._heartbeats.pop(job_id, None)
+            db.close()
+
+    def shutdown(self, wait: bool = True):
+        """실행기 종료 (실행 중인 작업은 wait=True면 끝날 때까지 기다림)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+        self._stopping.set()
+
+
+runner = JobRunner(max_workers=settings.JOB_WORKERS)
+
+
+def _remove_job_file(path: Path, root: Path):
+    # 작업 디렉토리 밖 경로는 건드리지 않음
+    if path.resolve().parent == root:
+        path.unlink(missing_ok=True)
+
+
+def _sweep(session_factory) -> Tuple[int, int]:
+    now = datetime.now(timezone.utc)
+    retention_cutoff = now - timedelta(seconds=settings.JOB_RETENTION)
+    root = job_dir()
+    db = session_factory()
+    try:
+        failed = job_crud.fail_stale_jobs(
+            db, now - timedelta(seconds=settings.JOB_STALE_AFTER), exclude=runner.live_job_ids()
+        )
+        if failed:
+            logger.warning(f"중단된 백그라운드 작업 {failed}건을 실패로 기록했습니다")
+        file_paths = job_crud.delete_finished_jobs(db, retention_cutoff)
+        kept = {str(Path(file_path).resolve()) for file_path in job_crud.active_file_paths(db)}
+    finally:
+        db.close()
+    for file_path in file_paths:
+        _remove_job_file(Path(file_path), root)
+    # 행이 없는 오래된 파일 (작업 행보다 먼저 만들어지는 가져오기 업로드 원본, 수동 삭제된 행 등)
+    cutoff = retention_cutoff.timestamp()
+    for path in root.iterdir():
+        try:
+            if path.is_file() and str(path) not in kept and path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"작업 파일 삭제 실패 ({path}): {e}")
+    return failed, len(file_paths)
+
+
+def sweep_jobs(session_factory) -> Tuple[int, int]:
+    """
+    중단된 작업을 FAILED로 기록하고, 보존 기간이 지난 작업 행과 JOB_DIR 파일을 삭제합니다 (주기 작업).
+    (실패 기록 수, 삭제한 작업 행 수)를 반환합니다. 여러 워커가 동시에 실행해도 결과는 같습니다.
+    """
+    try:
+        return _sweep(session_factory)
+    except Exception as e:
+        logger.warning(f"백그라운드 작업 정리 실패: {e}")
+        return 0, 0
+
+
+async def sweep_periodically(session_factory):
+    """JOB_SWEEP_INTERVAL마다 정리 (main.py lifespan에서 실행, 시작 시 바로 한 번 - 재시작 전 작업 정리)"""
+    await run_in_threadpool(sweep_jobs, session_factory)
+    while settings.JOB_SWEEP_INTERVAL > 0:
+        await asyncio.sleep(settings.JOB_SWEEP_INTERVAL)
+        await run_in_threadpool(sweep_jobs, session_factory)
@@ -0,0 +1,38 @@
+"""
+Query planner estimates
+PostgreSQL 실행 계획(EXPLAIN)의 예상 행 수로 COUNT(*) 없이 결과 규모를 추정합니다.
+"""
+import json
+from typing import Any, Optional
+
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) <statement> - 쿼리를 실행하지 않고 계획만 조회"""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def supports_estimate(dialect_name: str) -> bool:
+    """실행 계획 기반 추정을 지원하는 DB인지 확인합니다."""
+    return dialect_name == "postgresql"
+
+
+def plan_rows(plan: Any) -> Optional[int]:
+    """EXPLAIN 결과(JSON 문자열 또는 파싱된 값)에서 최상위 노드의 예상 행 수를 꺼냅니다."""
+    if isinstance(plan, (str, bytes)):
+        plan = json.loads(plan)
+    try:
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (LookupError, TypeError, ValueError):
+        return None
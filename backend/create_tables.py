@@ -4,6 +4,10 @@ from models.company import CompanyInfo, History, Certification, Client
 from models.audit import AuditLog
 from models.draft import DraftProduct
 from models.settings import SiteSettings
+from models.catalog import CatalogState
+from models.job import Job
+from models.image_blob import ImageBlob
+from models.stats import CategoryStats, MaintenanceLease
 
 print("Creating database tables...")
 
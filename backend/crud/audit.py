@@ -1,13 +1,33 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
-from typing import List, Optional, Tuple
-from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
 import json
 
+from core.audit_writer import writer as audit_writer
 from models.audit import AuditLog, AuditAction, AuditEntityType
 from schemas.audit import AuditLogCreate, AuditLogFilter
 
 
+def _audit_values(
+    entity_type: AuditEntityType,
+    entity_id: Optional[int],
+    action: AuditAction,
+    old_values: Optional[dict],
+    new_values: Optional[dict],
+    **meta: Optional[str]
+) -> Dict[str, Any]:
+    """audit_logs 행 값 (old/new 값은 JSON 문자열로 저장)"""
+    return dict(
+        entity_type=entity_type,
+        entity_id=entity_id,
+        action=action,
+        old_values=json.dumps(old_values, ensure_ascii=False) if old_values else None,
+        new_values=json.dumps(new_values, ensure_ascii=False) if new_values else None,
+        **meta
+    )
+
+
 def create_audit_log(
     db: Session,
     entity_type: AuditEntityType,
@@ -21,25 +41,44 @@ def create_audit_log(
     ip_address: Optional[str] = None,
     user_agent: Optional[str] = None
 ) -> AuditLog:
-    """Audit Log 생성"""
-    audit_log = AuditLog(
-        entity_type=entity_type,
-        entity_id=entity_id,
-        action=action,
-        old_values=json.dumps(old_values, ensure_ascii=False) if old_values else None,
-        new_values=json.dumps(new_values, ensure_ascii=False) if new_values else None,
-        changes_summary=changes_summary,
-        user_id=user_id,
-        user_name=user_name,
-        ip_address=ip_address,
-        user_agent=user_agent
-    )
+    """Audit Log 생성 (즉시 커밋)"""
+    audit_log = AuditLog(**_audit_values(
+        entity_type, entity_id, action, old_values, new_values,
+        changes_summary=changes_summary, user_id=user_id, user_name=user_name,
+        ip_address=ip_address, user_agent=user_agent
+    ))
     db.add(audit_log)
     db.commit()
     db.refresh(audit_log)
     return audit_log
 
 
+async def enqueue_audit_log(
+    db: Session,
+    entity_type: AuditEntityType,
+    entity_id: Optional[int],
+    action: AuditAction,
+    old_values: Optional[dict] = None,
+    new_values: Optional[dict] = None,
+    changes_summary: Optional[str] = None,
+    user_id: Optional[str] = None,
+    user_name: Optional[str] = None,
+    ip_address: Optional[str] = None,
+    user_agent: Optional[str] = None
+) -> None:
+    """
+    Audit Log 기록 예약 (core.audit_writer가 백그라운드에서 모아서 INSERT)
+    요청 세션에는 쓰지 않으므로 업무 트랜잭션에 왕복/커밋이 추가되지 않습니다.
+    기록 대기열이 가득 차면 자리가 날 때까지 기다립니다 (이벤트 루프는 막지 않음).
+    """
+    await audit_writer.put(db.get_bind(), _audit_values(
+        entity_type, entity_id, action, old_values, new_values,
+        changes_summary=changes_summary, user_id=user_id, user_name=user_name,
+        ip_address=ip_address, user_agent=user_agent,
+        created_at=datetime.now(timezone.utc)
+    ))
+
+
 def get_audit_logs(
     db: Session,
     filters: AuditLogFilter
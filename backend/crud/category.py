@@ -1,7 +1,10 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from typing import List, Optional
 from models.safety import SafetyCategory, SafetyProduct
 from schemas.category import CategoryCreate, CategoryUpdate
+from utils import category_cache
 
 def get_category_count(db: Session) -> int:
     """총 카테고리 수를 반환합니다."""
@@ -23,11 +26,34 @@ def get_category_by_slug(db: Session, slug: str) -> Optional[SafetyCategory]:
     """카테고리 slug로 카테고리를 조회합니다."""
     return db.query(SafetyCategory).filter(SafetyCategory.slug == slug).first()
 
+async def get_categories_async(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[SafetyCategory]:
+    """카테고리 목록을 조회합니다 (비동기 세션용)."""
+    result = await db.execute(
+        select(SafetyCategory).order_by(SafetyCategory.display_order).offset(skip).limit(limit)
+    )
+    return list(result.scalars().all())
+
+async def get_category_async(db: AsyncSession, category_id: int) -> Optional[SafetyCategory]:
+    """특정 카테고리를 조회합니다 (비동기 세션용)."""
+    result = await db.execute(select(SafetyCategory).where(SafetyCategory.id == category_id))
+    return result.scalars().first()
+
+async def get_category_by_code_async(db: AsyncSession, category_code: str) -> Optional[SafetyCategory]:
+    """카테고리 코드로 카테고리를 조회합니다 (비동기 세션용)."""
+    result = await db.execute(select(SafetyCategory).where(SafetyCategory.code == category_code))
+    return result.scalars().first()
+
+async def get_category_by_slug_async(db: AsyncSession, slug: str) -> Optional[SafetyCategory]:
+    """카테고리 slug로 카테고리를 조회합니다 (비동기 세션용)."""
+    result = await db.execute(select(SafetyCategory).where(SafetyCategory.slug == slug))
+    return result.scalars().first()
+
 def create_category(db: Session, category: CategoryCreate) -> SafetyCategory:
     """새로운 카테고리를 생성합니다."""
     db_category = SafetyCategory(**category.dict())
     db.add(db_category)
     db.commit()
+    category_cache.invalidate()
     db.refresh(db_category)
     return db_category
 
@@ -38,6 +64,7 @@ def update_category(db: Session, category_id: int, category: CategoryUpdate) ->
         for key, value in category.dict(exclude_unset=True).items():
             setattr(db_category, key, value)
         db.commit()
+        category_cache.invalidate()
         db.refresh(db_category)
     return db_category
 
@@ -52,4 +79,5 @@ def delete_category(db: Session, category_id: int) -> Optional[SafetyCategory]:
     if db_category:
         db.delete(db_category)
         db.commit()
+        category_cache.invalidate()
     return db_category 
\ No newline at end of file
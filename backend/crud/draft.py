@@ -10,6 +10,8 @@ import math
 from models.draft import DraftProduct
 from models.safety import SafetyProduct
 from schemas.draft import DraftProductCreate, DraftProductUpdate
+from crud import image_blob as image_blob_crud
+from utils import image_files
 
 
 def create_draft(db: Session, draft: DraftProductCreate) -> DraftProduct:
@@ -120,23 +122,25 @@ def publish_draft(
         'file_path': db_draft.file_path
     }
     
+    old_paths = []
+    db_product = None
     if db_draft.product_id:
         # 기존 제품 업데이트
         db_product = db.query(SafetyProduct).filter(SafetyProduct.id == db_draft.product_id).first()
-        if db_product:
-            for key, value in product_data.items():
-                setattr(db_product, key, value)
-        else:
-            # 제품이 없으면 새로 생성
-            db_product = SafetyProduct(**product_data)
-            db.add(db_product)
+    if db_product:
+        old_paths = image_files.parse_image_paths(db_product.file_path)
+        for key, value in product_data.items():
+            setattr(db_product, key, value)
     else:
-        # 새 제품 생성
+        # 새 제품 생성 (연결된 제품이 없어진 경우 포함)
         db_product = SafetyProduct(**product_data)
         db.add(db_product)
     
+    # 이미지 참조 수 반영 (더 이상 쓰지 않는 이미지는 커밋 후 삭제)
+    removable = image_blob_crud.replace(db, old_paths, image_files.parse_image_paths(db_product.file_path))
     db.commit()
     db.refresh(db_product)
+    image_files.remove_image_files(removable)
     
     # Draft 삭제
     if delete_after_publish:
@@ -0,0 +1,235 @@
+"""
+Image Blob CRUD 함수 (내용 주소 이미지 저장소 참조 수)
+
+제품의 file_path에 이미지가 추가되면 retain, 빠지면 release를 호출합니다 (커밋은 호출하는 쪽에서).
+
+저장소 이미지는 요청 중에 지우지 않습니다. 업로드한 뒤 제품에 연결되기 전(참조 0)에 다른 요청의
+release가 파일을 지우는 경쟁을 막기 위해 업로드(신규/재사용 모두)는 IMAGE_UPLOAD_LEASE 동안 임대를 걸고,
+참조 0이면서 임대가 끝난 이미지는 collect_garbage 정리 작업이 IMAGE_GC_INTERVAL마다 삭제합니다.
+행 삭제와 파일 삭제는 한 트랜잭션 안에서 조건부로 처리하므로 같은 내용의 동시 업로드와 겹치지 않습니다.
+
+저장소 도입 전 업로드나 엑셀 가져오기로 들어온 저장소 밖 경로는 release가 남은 제품의 이미지를
+한 번 더 확인한 뒤 삭제해도 되는 경로로 돌려주며, 파일은 커밋 후 호출하는 쪽에서
+utils.image_files.remove_image_files로 삭제합니다.
+"""
+import asyncio
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional
+
+from sqlalchemy import case, delete, inspect, or_, select, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+from core.logger import get_logger
+from models.draft import DraftProduct
+from models.image_blob import ImageBlob
+from models.safety import ProductImage
+from utils import image_files
+
+logger = get_logger(__name__)
+
+# 한 문장에 담는 최대 경로 수
+PATH_CHUNK_SIZE = 500
+
+
+def ensure_table(bind) -> None:
+    """image_blobs 테이블 생성 (main.py init_tables). 이전 버전 테이블에는 leased_until 컬럼을 추가합니다."""
+    table = ImageBlob.__table__
+    table.create(bind=bind, checkfirst=True)
+    columns = {column["name"] for column in inspect(bind).get_columns(table.name)}
+    if "leased_until" not in columns:
+        column_type = table.c.leased_until.type.compile(dialect=bind.dialect)
+        with bind.begin() as connection:
+            connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN leased_until {column_type}"))
+
+
+def _lease_expiry() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=settings.IMAGE_UPLOAD_LEASE)
+
+
+def get_blob(db: Session, sha256: str) -> Optional[ImageBlob]:
+    """내용 해시로 조회"""
+    return db.query(ImageBlob).filter(ImageBlob.sha256 == sha256).first()
+
+
+def lease_blob(db: Session, sha256: str) -> Optional[ImageBlob]:
+    """
+    업로드가 기존 이미지를 재사용할 때 임대 연장 (커밋 후 반환, 행이 없으면 None).
+    정리 작업이 같은 행을 지우는 중이면 그 트랜잭션이 끝난 뒤 0행이 갱신되어 None이 됩니다.
+    """
+    result = db.execute(
+        update(ImageBlob)
+        .where(ImageBlob.sha256 == sha256)
+        .values(leased_until=_lease_expiry())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    if not result.rowcount:
+        return None
+    return get_blob(db, sha256)
+
+
+def create_blob(db: Session, sha256: str, path: str, size: int) -> ImageBlob:
+    """새 이미지 등록 (참조 0, 임대 설정). 같은 내용이 동시에 등록되면 먼저 등록된 행의 임대를 연장해 반환합니다."""
+    db_blob = ImageBlob(sha256=sha256, path=path, size=size, ref_count=0, leased_until=_lease_expiry())
+    db.add(db_blob)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return lease_blob(db, sha256)
+    db.refresh(db_blob)
+    return db_blob
+
+
+def _expired(now: datetime):
+    return or_(ImageBlob.leased_until.is_(None), ImageBlob.leased_until < now)
+
+
+def _collect(db: Session, sha256: str, path: str, condition) -> bool:
+    """
+    조건을 만족하는 참조 없는 행을 지우고, 커밋 전에 파일도 삭제합니다.
+    삭제한 행이 잠겨 있는 동안 파일을 지우므로 그 사이의 lease_blob은 커밋을 기다린 뒤 0행을 갱신해 새로 저장합니다.
+    """
+    try:
+        result = db.execute(
+            delete(ImageBlob)
+            .where(ImageBlob.sha256 == sha256, ImageBlob.ref_count == 0, condition)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            image_files.remove_image_files([path])
+        db.commit()
+        return bool(result.rowcount)
+    except Exception:
+        db.rollback()
+        raise
+
+
+def discard_blob(db: Session, sha256: str, path: str, leased_until: datetime) -> bool:
+    """
+    업로드 실패 정리 - 이번 업로드가 건 임대가 그대로이고 참조가 없으면 바로 삭제합니다.
+    그 사이 다른 업로드가 재사용했다면(임대 연장) 남겨 둡니다.
+    """
+    return _collect(db, sha256, path, ImageBlob.leased_until == leased_until)
+
+
+def _draft_paths(db: Session) -> set:
+    """임시 저장(draft)이 참조하는 이미지 경로 (draft는 참조 수에 포함되지 않음)"""
+    paths = set()
+    for file_path in db.execute(select(DraftProduct.file_path).where(DraftProduct.file_path.isnot(None))).scalars():
+        paths.update(image_files.parse_image_paths(file_path))
+    return paths
+
+
+def collect_unreferenced(db: Session) -> int:
+    """참조 0이고 임대가 끝난 저장소 이미지를 삭제합니다. 삭제한 수를 반환합니다."""
+    now = datetime.now(timezone.utc)
+    candidates = db.execute(
+        select(ImageBlob.sha256, ImageBlob.path).where(ImageBlob.ref_count == 0, _expired(now))
+    ).all()
+    if not candidates:
+        return 0
+    # 참조 수와 달리 아직 쓰이는 경로(제품 이미지, draft)는 건너뜀
+    paths = [path for _, path in candidates]
+    kept = _draft_paths(db) | (set(paths) - set(unreferenced_paths(db, paths)))
+
+    removed = 0
+    for sha256, path in candidates:
+        if path not in kept and _collect(db, sha256, path, _expired(now)):
+            removed += 1
+    return removed
+
+
+def collect_garbage(session_factory) -> int:
+    """참조 없는 업로드 이미지 정리 (주기 작업)"""
+    db = session_factory()
+    try:
+        removed = collect_unreferenced(db)
+        if removed:
+            logger.info(f"참조 없는 이미지 {removed}개 삭제")
+        return removed
+    except Exception as e:
+        logger.warning(f"참조 없는 이미지 정리 실패: {e}")
+        return 0
+    finally:
+        db.close()
+
+
+async def collect_periodically(session_factory):
+    """IMAGE_GC_INTERVAL마다 정리 (main.py lifespan에서 실행, 0이면 시작 시 한 번만)"""
+    await run_in_threadpool(collect_garbage, session_factory)
+    while settings.IMAGE_GC_INTERVAL > 0:
+        await asyncio.sleep(settings.IMAGE_GC_INTERVAL)
+        await run_in_threadpool(collect_garbage, session_factory)
+
+
+def _chunks(paths: List[str]):
+    for start in range(0, len(paths), PATH_CHUNK_SIZE):
+        yield paths[start:start + PATH_CHUNK_SIZE]
+
+
+def retain(db: Session, paths: Iterable[str]) -> None:
+    """이미지 참조 추가 (같은 경로가 여러 번 있으면 그만큼 증가, 저장소 밖 경로는 무시)"""
+    counts = Counter(paths)
+    by_count = {}
+    for path, count in counts.items():
+        by_count.setdefault(count, []).append(path)
+    for count, grouped in by_count.items():
+        for chunk in _chunks(grouped):
+            db.execute(
+                update(ImageBlob)
+                .where(ImageBlob.path.in_(chunk))
+                .values(ref_count=ImageBlob.ref_count + count)
+                .execution_options(synchronize_session=False)
+            )
+
+
+def release(db: Session, paths: Iterable[str]) -> List[str]:
+    """
+    이미지 참조 제거 후 삭제해도 되는 경로 목록을 반환합니다.
+    저장소 이미지는 참조 수만 줄이고 (참조 0이 되면 정리 작업이 삭제), 저장소 밖 경로 중
+    남은 제품이 쓰지 않는 것만 포함합니다. 제품 변경/삭제를 flush 한 뒤 비교하도록 먼저 flush 합니다.
+    """
+    counts = Counter(path for path in paths if not image_files.is_default_image(path))
+    if not counts:
+        return []
+    db.flush()
+
+    by_count = {}
+    for path, count in counts.items():
+        by_count.setdefault(count, []).append(path)
+    for count, grouped in by_count.items():
+        for chunk in _chunks(grouped):
+            db.execute(
+                update(ImageBlob)
+                .where(ImageBlob.path.in_(chunk))
+                .values(ref_count=case((ImageBlob.ref_count > count, ImageBlob.ref_count - count), else_=0))
+                .execution_options(synchronize_session=False)
+            )
+
+    candidates = sorted(counts)
+    stored = set()
+    for chunk in _chunks(candidates):
+        stored.update(db.execute(select(ImageBlob.path).where(ImageBlob.path.in_(chunk))).scalars())
+    return unreferenced_paths(db, [path for path in candidates if path not in stored])
+
+
+def replace(db: Session, old_paths: Iterable[str], new_paths: Iterable[str]) -> List[str]:
+    """제품 이미지 목록 변경 반영 (추가분 retain, 제외분 release) - 삭제해도 되는 경로 반환"""
+    old_paths, new_paths = set(old_paths), set(new_paths)
+    retain(db, new_paths - old_paths)
+    return release(db, old_paths - new_paths)
+
+
+def unreferenced_paths(db: Session, paths: List[str]) -> List[str]:
+    """남은 제품 이미지(product_images) 어디에도 없는 경로만 반환합니다 (ix_product_images_path 인덱스 조회)."""
+    referenced = set()
+    for chunk in _chunks(paths):
+        referenced.update(db.execute(
+            select(ProductImage.path).where(ProductImage.path.in_(chunk)).distinct()
+        ).scalars())
+    return [path for path in paths if path not in referenced]
@@ -0,0 +1,99 @@
+"""
+Background Job CRUD 함수
+"""
+from datetime import datetime
+from sqlalchemy import inspect, or_, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from typing import Any, Dict, Iterable, List, Optional
+import uuid
+
+from models.job import Job, JobKind, JobStatus
+
+
+# 아직 끝나지 않은 작업 상태
+UNFINISHED_STATUSES = (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+def ensure_table(bind) -> None:
+    """jobs 테이블 생성 (main.py init_tables). 이전 버전 테이블에는 heartbeat_at 컬럼을 추가합니다."""
+    table = Job.__table__
+    table.create(bind=bind, checkfirst=True)
+    columns = {column["name"] for column in inspect(bind).get_columns(table.name)}
+    if "heartbeat_at" not in columns:
+        column_type = table.c.heartbeat_at.type.compile(dialect=bind.dialect)
+        with bind.begin() as connection:
+            connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN heartbeat_at {column_type}"))
+
+
+def create_job(db: Session, kind: JobKind, params: Optional[Dict[str, Any]] = None) -> Job:
+    """작업 생성 (QUEUED)"""
+    db_job = Job(id=uuid.uuid4().hex, kind=kind, status=JobStatus.QUEUED, params=params)
+    db.add(db_job)
+    db.commit()
+    db.refresh(db_job)
+    return db_job
+
+
+def get_job(db: Session, job_id: str) -> Optional[Job]:
+    """특정 작업 조회"""
+    return db.query(Job).filter(Job.id == job_id).first()
+
+
+def update_job(db: Session, job_id: str, **values) -> None:
+    """작업 상태/진행률 갱신"""
+    db.query(Job).filter(Job.id == job_id).update(values, synchronize_session=False)
+    db.commit()
+
+
+def start_job(db: Session, job_id: str) -> None:
+    update_job(db, job_id, status=JobStatus.RUNNING, started_at=func.now(), heartbeat_at=func.now())
+
+
+def touch_jobs(db: Session, job_ids: Iterable[str]) -> None:
+    """실행 중(대기 포함)인 작업의 heartbeat_at 갱신"""
+    db.query(Job).filter(Job.id.in_(list(job_ids)), Job.status.in_(UNFINISHED_STATUSES)).update(
+        {Job.heartbeat_at: func.now()}, synchronize_session=False
+    )
+    db.commit()
+
+
+def fail_stale_jobs(db: Session, stale_before: datetime, exclude: Iterable[str] = ()) -> int:
+    """
+    stale_before 이후로 heartbeat가 없는 미완료 작업을 FAILED로 기록합니다 (워커 중단/재시작으로 버려진 작업).
+    exclude: 이 프로세스에서 실행 중인 작업 id. 실패로 기록한 작업 수를 반환합니다.
+    """
+    query = db.query(Job).filter(
+        Job.status.in_(UNFINISHED_STATUSES),
+        or_(Job.heartbeat_at < stale_before, Job.heartbeat_at.is_(None) & (Job.created_at < stale_before))
+    )
+    exclude = list(exclude)
+    if exclude:
+        query = query.filter(Job.id.notin_(exclude))
+    count = query.update(
+        {Job.status: JobStatus.FAILED, Job.finished_at: func.now(),
+         Job.message: "작업을 실행하던 서버가 중단되어 작업이 끝나지 않았습니다. 다시 요청해 주세요."},
+        synchronize_session=False
+    )
+    db.commit()
+    return count
+
+
+def delete_finished_jobs(db: Session, finished_before: datetime) -> List[str]:
+    """finished_before 이전에 끝난 작업 행을 삭제하고, 그 작업들의 결과 파일 경로를 반환합니다."""
+    finished = db.query(Job).filter(
+        Job.status.notin_(UNFINISHED_STATUSES), Job.finished_at < finished_before
+    )
+    file_paths = [file_path for (file_path,) in finished.with_entities(Job.file_path) if file_path]
+    finished.delete(synchronize_session=False)
+    db.commit()
+    return file_paths
+
+
+def active_file_paths(db: Session) -> List[str]:
+    """남아 있는 작업 행의 결과 파일 경로 (보존 기간 정리에서 제외)"""
+    return [file_path for (file_path,) in db.query(Job.file_path).filter(Job.file_path.isnot(None))]
+
+
+def finish_job(db: Session, job_id: str, status: JobStatus, **values) -> None:
+    update_job(db, job_id, status=status, finished_at=func.now(), **values)
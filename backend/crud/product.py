@@ -1,10 +1,38 @@
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, func
-from typing import List, Optional, Tuple
-from models.safety import SafetyProduct, SafetyCategory
-from schemas.product import ProductCreate, ProductUpdate, ProductSearchParams, SortField, SortOrder
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, or_, func, select, update, delete
+from typing import Any, List, NamedTuple, Optional, Tuple
+from models.safety import SafetyProduct, SafetyCategory, ProductImage
+from schemas.product import ProductCreate, ProductUpdate, ProductSearchParams, SortField, SortOrder, CountMode
+from core.config import settings
+from core.query_estimate import Explain, supports_estimate, plan_rows
+from utils.product_search import search_condition, relevance_score
+from utils import image_files
+from crud import image_blob as image_blob_crud
+from utils import catalog_stats, product_images
+from utils.pagination import SortKey, order_by_clauses, keyset_condition, encode_cursor, decode_cursor
 from datetime import datetime
 
+# 기본 목록 정렬: 1) category_id, 2) is_featured (1이 먼저), 3) name, 4) id (동일 값 구분용)
+LISTING_SORT_KEYS: List[SortKey] = [
+    (SafetyProduct.category_id, False),
+    (SafetyProduct.is_featured, True),
+    (SafetyProduct.name, False),
+    (SafetyProduct.id, False),
+]
+LISTING_CURSOR_SIGNATURE = "listing"
+# 일괄 처리 시 한 문장에 담는 최대 id 수 (DB 파라미터 수 제한 고려)
+BULK_CHUNK_SIZE = 500
+# 제품 목록 search 파라미터의 검색 대상 (고급 검색은 사양까지 포함)
+LISTING_SEARCH_COLUMNS = [SafetyProduct.name, SafetyProduct.description, SafetyProduct.model_number]
+
+class AdvancedSearchResult(NamedTuple):
+    """고급 검색 결과"""
+    products: List[dict]
+    total: int
+    next_cursor: Optional[str]
+    total_is_estimate: bool
+
 def get_product_count(db: Session) -> int:
     """총 제품 수를 반환합니다."""
     return db.query(SafetyProduct).count()
@@ -13,16 +41,9 @@ def get_featured_product_count(db: Session) -> int:
     """추천 제품 수를 반환합니다."""
     return db.query(SafetyProduct).filter(SafetyProduct.is_featured == 1).count()
 
-def get_products(
-    db: Session, 
-    skip: int = 0, 
-    limit: int = 100,
-    category_code: Optional[str] = None,
-    search: Optional[str] = None
-) -> List[dict]:
-    """제품 목록을 조회합니다 (카테고리 정보 포함)."""
-    # 제품과 카테고리를 JOIN하여 조회
-    query = db.query(
+def _product_select():
+    """제품 + 카테고리 정보 조회용 SELECT 문을 생성합니다 (동기/비동기 공용)."""
+    return select(
         SafetyProduct.id,
         SafetyProduct.name,
         SafetyProduct.model_number,
@@ -40,91 +61,180 @@ def get_products(
         SafetyCategory.code.label('category_code'),
         SafetyCategory.name.label('category_name')
     ).join(SafetyCategory, SafetyProduct.category_id == SafetyCategory.id)
+
+def _row_to_dict(row) -> dict:
+    """조회 결과 Row를 dict 형태로 변환합니다."""
+    return {
+        'id': row.id,
+        'name': row.name,
+        'model_number': row.model_number,
+        'category_id': row.category_id,
+        'description': row.description,
+        'specifications': row.specifications,
+        'price': row.price,
+        'stock_status': row.stock_status,
+        'is_featured': row.is_featured,
+        'display_order': row.display_order,
+        'file_name': row.file_name,
+        'file_path': row.file_path,
+        'created_at': row.created_at,
+        'updated_at': row.updated_at,
+        'category_code': row.category_code,
+        'category_name': row.category_name
+    }
+
+def _images_statement(product_ids: List[int]):
+    """제품들의 이미지 행 SELECT 문 (product_images 인덱스 조회)"""
+    return select(
+        ProductImage.product_id,
+        ProductImage.position,
+        ProductImage.path,
+        ProductImage.width,
+        ProductImage.height,
+        ProductImage.bytes,
+        ProductImage.variants
+    ).where(ProductImage.product_id.in_(product_ids)).order_by(ProductImage.product_id, ProductImage.position)
+
+def _attach_images(items: List[dict], rows) -> List[dict]:
+    """조회한 이미지 행을 제품 dict의 'images'로 붙입니다."""
+    by_product = {}
+    for row in rows:
+        by_product.setdefault(row.product_id, []).append({
+            'position': row.position,
+            'path': row.path,
+            'width': row.width,
+            'height': row.height,
+            'bytes': row.bytes,
+            'variants': row.variants
+        })
+    for item in items:
+        item['images'] = by_product.get(item['id'], [])
+    return items
+
+def _with_images(db: Session, items: List[dict]) -> List[dict]:
+    """제품 목록의 이미지를 한 번의 쿼리로 함께 조회합니다 (N+1 방지)."""
+    if not items:
+        return items
+    return _attach_images(items, db.execute(_images_statement([item['id'] for item in items])).all())
+
+async def _with_images_async(db: AsyncSession, items: List[dict]) -> List[dict]:
+    """제품 목록의 이미지를 한 번의 쿼리로 함께 조회합니다 (비동기 세션용)."""
+    if not items:
+        return items
+    result = await db.execute(_images_statement([item['id'] for item in items]))
+    return _attach_images(items, result.all())
+
+def _products_statement(
+    skip: int = 0,
+    limit: int = 100,
+    category_code: Optional[str] = None,
+    search: Optional[str] = None,
+    after: Optional[list] = None
+):
+    """
+    제품 목록 조회 SELECT 문을 생성합니다.
+    after(커서 위치의 정렬 키 값)가 주어지면 OFFSET 대신 keyset 조건으로 다음 페이지를 조회합니다.
+    """
+    stmt = _product_select()
     
     if category_code:
-        query = query.filter(SafetyCategory.code == category_code)
+        stmt = stmt.where(SafetyCategory.code == category_code)
     
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            SafetyProduct.name.ilike(search_term) |
-            SafetyProduct.description.ilike(search_term) |
-            SafetyProduct.model_number.ilike(search_term)
-        )
+    condition = search_condition(search, columns=LISTING_SEARCH_COLUMNS) if search else None
+    if condition is not None:
+        stmt = stmt.where(condition)
     
-    # 정렬: 1) category_id, 2) is_featured (1이 먼저), 3) name
-    results = query.order_by(
-        SafetyProduct.category_id,
-        SafetyProduct.is_featured.desc(),  # 1이 먼저 오도록 내림차순
-        SafetyProduct.name
-    ).offset(skip).limit(limit).all()
-    
-    # 결과를 dict 형태로 변환
-    products = []
-    for row in results:
-        product = {
-            'id': row.id,
-            'name': row.name,
-            'model_number': row.model_number,
-            'category_id': row.category_id,
-            'description': row.description,
-            'specifications': row.specifications,
-            'price': row.price,
-            'stock_status': row.stock_status,
-            'is_featured': row.is_featured,
-            'display_order': row.display_order,
-            'file_name': row.file_name,
-            'file_path': row.file_path,
-            'created_at': row.created_at,
-            'updated_at': row.updated_at,
-            'category_code': row.category_code,
-            'category_name': row.category_name
-        }
-        products.append(product)
-    
-    return products
+    stmt = stmt.order_by(*order_by_clauses(LISTING_SORT_KEYS))
+    if after is not None:
+        return stmt.where(keyset_condition(LISTING_SORT_KEYS, after)).limit(limit)
+    return stmt.offset(skip).limit(limit)
+
+def _split_page(
+    items: List[dict],
+    limit: int,
+    keys: List[SortKey],
+    signature: str,
+    position: int = 0
+) -> Tuple[List[dict], Optional[str]]:
+    """limit + 1개로 조회한 결과를 현재 페이지와 다음 페이지 커서로 나눕니다."""
+    if limit <= 0 or len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    return items, encode_cursor(keys, items[-1], signature, position=position + limit)
+
+def get_products(
+    db: Session, 
+    skip: int = 0, 
+    limit: int = 100,
+    category_code: Optional[str] = None,
+    search: Optional[str] = None
+) -> List[dict]:
+    """제품 목록을 조회합니다 (카테고리 정보 포함)."""
+    stmt = _products_statement(skip=skip, limit=limit, category_code=category_code, search=search)
+    return _with_images(db, [_row_to_dict(row) for row in db.execute(stmt).all()])
+
+async def get_products_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    category_code: Optional[str] = None,
+    search: Optional[str] = None
+) -> List[dict]:
+    """제품 목록을 조회합니다 (비동기 세션용)."""
+    stmt = _products_statement(skip=skip, limit=limit, category_code=category_code, search=search)
+    result = await db.execute(stmt)
+    return await _with_images_async(db, [_row_to_dict(row) for row in result.all()])
+
+async def get_products_page_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    category_code: Optional[str] = None,
+    search: Optional[str] = None,
+    cursor: Optional[str] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    제품 목록 한 페이지와 다음 페이지 커서를 조회합니다 (비동기 세션용).
+    cursor가 주어지면 skip은 무시합니다 (빈 문자열은 첫 페이지). 유효하지 않은 커서는 ValueError.
+    """
+    after, position = decode_cursor(LISTING_SORT_KEYS, cursor, LISTING_CURSOR_SIGNATURE) if cursor else (None, 0)
+    if cursor is None:
+        position = skip
+    stmt = _products_statement(
+        skip=0 if cursor is not None else skip,
+        limit=limit + 1,
+        category_code=category_code,
+        search=search,
+        after=after
+    )
+    result = await db.execute(stmt)
+    items, next_cursor = _split_page(
+        [_row_to_dict(row) for row in result.all()], limit, LISTING_SORT_KEYS, LISTING_CURSOR_SIGNATURE, position=position
+    )
+    return await _with_images_async(db, items), next_cursor
+
+def _search_statement(query: str, skip: int = 0, limit: int = 20):
+    """검색어 관련도 순 제품 검색 SELECT 문 (관련도가 같으면 기본 목록 순서)"""
+    stmt = _product_select()
+    condition = search_condition(query, columns=LISTING_SEARCH_COLUMNS)
+    if condition is not None:
+        stmt = stmt.where(condition).order_by(relevance_score(query).desc())
+    return stmt.order_by(*order_by_clauses(LISTING_SORT_KEYS)).offset(skip).limit(limit)
+
+async def search_products_async(db: AsyncSession, query: str, skip: int = 0, limit: int = 20) -> List[dict]:
+    """제품을 검색어 관련도 순으로 조회합니다 (비동기 세션용)."""
+    result = await db.execute(_search_statement(query, skip=skip, limit=limit))
+    return await _with_images_async(db, [_row_to_dict(row) for row in result.all()])
 
 def get_product(db: Session, product_id: int) -> Optional[dict]:
     """특정 제품을 조회합니다 (카테고리 정보 포함)."""
-    result = db.query(
-        SafetyProduct.id,
-        SafetyProduct.name,
-        SafetyProduct.model_number,
-        SafetyProduct.category_id,
-        SafetyProduct.description,
-        SafetyProduct.specifications,
-        SafetyProduct.price,
-        SafetyProduct.stock_status,
-        SafetyProduct.is_featured,
-        SafetyProduct.display_order,
-        SafetyProduct.file_name,
-        SafetyProduct.file_path,
-        SafetyProduct.created_at,
-        SafetyProduct.updated_at,
-        SafetyCategory.code.label('category_code'),
-        SafetyCategory.name.label('category_name')
-    ).join(SafetyCategory, SafetyProduct.category_id == SafetyCategory.id).filter(SafetyProduct.id == product_id).first()
-    
-    if result:
-        return {
-            'id': result.id,
-            'name': result.name,
-            'model_number': result.model_number,
-            'category_id': result.category_id,
-            'description': result.description,
-            'specifications': result.specifications,
-            'price': result.price,
-            'stock_status': result.stock_status,
-            'is_featured': result.is_featured,
-            'display_order': result.display_order,
-            'file_name': result.file_name,
-            'file_path': result.file_path,
-            'created_at': result.created_at,
-            'updated_at': result.updated_at,
-            'category_code': result.category_code,
-            'category_name': result.category_name
-        }
-    return None
+    result = db.execute(_product_select().where(SafetyProduct.id == product_id)).first()
+    return _with_images(db, [_row_to_dict(result)])[0] if result else None
+
+async def get_product_async(db: AsyncSession, product_id: int) -> Optional[dict]:
+    """특정 제품을 조회합니다 (비동기 세션용)."""
+    result = (await db.execute(_product_select().where(SafetyProduct.id == product_id))).first()
+    return (await _with_images_async(db, [_row_to_dict(result)]))[0] if result else None
 
 def create_product(db: Session, product: ProductCreate) -> SafetyProduct:
     """새로운 제품을 생성합니다."""
@@ -135,12 +245,13 @@ def create_product(db: Session, product: ProductCreate) -> SafetyProduct:
     
     db_product = SafetyProduct(**product_dict)
     db.add(db_product)
+    image_blob_crud.retain(db, set(image_files.parse_image_paths(db_product.file_path)))
     db.commit()
     db.refresh(db_product)
     return db_product
 
 def update_product(db: Session, product_id: int, product: ProductUpdate) -> Optional[SafetyProduct]:
-    """제품 정보를 수정합니다."""
+    """제품 정보를 수정합니다 (이미지 목록이 바뀌면 더 이상 쓰지 않는 이미지 파일 삭제)."""
     db_product = db.query(SafetyProduct).filter(SafetyProduct.id == product_id).first()
     if db_product:
         update_dict = product.dict(exclude_unset=True)
@@ -148,112 +259,96 @@ def update_product(db: Session, product_id: int, product: ProductUpdate) -> Opti
         if 'is_featured' in update_dict:
             update_dict['is_featured'] = 1 if update_dict['is_featured'] else 0
         
+        old_paths = product_images.product_image_paths(db_product)
         for key, value in update_dict.items():
             setattr(db_product, key, value)
+        removable = []
+        if 'file_path' in update_dict:
+            removable = image_blob_crud.replace(db, old_paths, image_files.parse_image_paths(db_product.file_path))
         db.commit()
         db.refresh(db_product)
+        image_files.remove_image_files(removable)
     return db_product
 
 def delete_product(db: Session, product_id: int) -> Optional[SafetyProduct]:
-    """제품을 삭제합니다 (연관된 이미지 파일도 함께 삭제)."""
-    import os
-    import json
-    from pathlib import Path
-    
+    """제품을 삭제합니다 (다른 제품이 쓰지 않는 이미지 파일도 함께 삭제)."""
     db_product = db.query(SafetyProduct).filter(SafetyProduct.id == product_id).first()
     if db_product:
-        # 연관된 이미지 파일들 삭제
-        if db_product.file_path:
-            try:
-                # JSON 배열로 저장된 경우
-                image_paths = json.loads(db_product.file_path)
-                if isinstance(image_paths, list):
-                    for image_path in image_paths:
-                        if image_path and image_path.startswith('/images/'):
-                            # /images/ 경로를 실제 파일 시스템 경로로 변환
-                            file_path = Path("../frontend/public") / image_path.lstrip('/')
-                            if file_path.exists():
-                                try:
-                                    os.remove(file_path)
-                                    print(f"이미지 파일 삭제됨: {file_path}")
-                                except Exception as e:
-                                    print(f"이미지 파일 삭제 실패: {file_path}, 오류: {e}")
-                else:
-                    # 단일 경로인 경우
-                    image_path = str(image_paths)
-                    if image_path.startswith('/images/'):
-                        file_path = Path("../frontend/public") / image_path.lstrip('/')
-                        if file_path.exists():
-                            try:
-                                os.remove(file_path)
-                                print(f"이미지 파일 삭제됨: {file_path}")
-                            except Exception as e:
-                                print(f"이미지 파일 삭제 실패: {file_path}, 오류: {e}")
-            except (json.JSONDecodeError, TypeError):
-                # JSON 파싱 실패시 단일 경로로 처리
-                if db_product.file_path.startswith('/images/'):
-                    file_path = Path("../frontend/public") / db_product.file_path.lstrip('/')
-                    if file_path.exists():
-                        try:
-                            os.remove(file_path)
-                            print(f"이미지 파일 삭제됨: {file_path}")
-                        except Exception as e:
-                            print(f"이미지 파일 삭제 실패: {file_path}, 오류: {e}")
-        
-        # 데이터베이스에서 제품 삭제
+        image_paths = set(product_images.product_image_paths(db_product))
         db.delete(db_product)
+        removable = image_blob_crud.release(db, image_paths)
         db.commit()
+        # 커밋 후 이미지 파일(과 변형) 삭제 (기본 이미지 제외)
+        image_files.remove_image_files(removable)
     return db_product
 
-def get_search_suggestions(db: Session, query: str, limit: int = 5) -> List[str]:
-    """검색 제안을 반환합니다."""
-    search_term = f"%{query}%"
-    results = db.query(SafetyProduct.name).filter(
-        SafetyProduct.name.ilike(search_term)
-    ).limit(limit).all()
-    
-    return [result.name for result in results]
+def bulk_update_products(db: Session, product_ids: List[int], values: dict) -> List[int]:
+    """
+    여러 제품을 UPDATE ... WHERE id IN (...) RETURNING id 문으로 일괄 수정합니다.
+    id 목록이 길면 BULK_CHUNK_SIZE개씩 나누어 실행하며, 커밋은 호출하는 쪽에서 합니다.
+    수정된 제품 ID 목록을 반환합니다.
+    """
+    product_ids = list(dict.fromkeys(product_ids))
+    updated_ids = []
+    # 대시보드 통계에 영향을 주는 값이 바뀌면 수정 전후 카테고리를 다시 집계
+    affects_stats = any(key in values for key in catalog_stats.TRACKED_ATTRIBUTES)
+    categories = {values['category_id']} if 'category_id' in values else set()
+    for start in range(0, len(product_ids), BULK_CHUNK_SIZE):
+        chunk = product_ids[start:start + BULK_CHUNK_SIZE]
+        if affects_stats:
+            categories.update(db.execute(
+                select(SafetyProduct.category_id).where(SafetyProduct.id.in_(chunk)).distinct()
+            ).scalars())
+        result = db.execute(
+            update(SafetyProduct)
+            .where(SafetyProduct.id.in_(chunk))
+            .values(**values)
+            .returning(SafetyProduct.id)
+            .execution_options(synchronize_session=False)
+        )
+        updated_ids.extend(result.scalars().all())
+    if affects_stats and updated_ids:
+        catalog_stats.refresh_categories(db, categories)
+    return updated_ids
 
+def bulk_delete_products(db: Session, product_ids: List[int]) -> Tuple[List[int], List[str]]:
+    """
+    여러 제품을 DELETE ... WHERE id IN (...) RETURNING 문으로 일괄 삭제합니다 (커밋은 호출하는 쪽에서).
+    (삭제된 제품 ID 목록, 정리할 이미지 경로 목록)을 반환합니다.
+    이미지 참조 수를 줄이고, 남은 제품이 아직 참조하는 이미지는 정리 대상에서 제외합니다.
+    """
+    product_ids = list(dict.fromkeys(product_ids))
+    deleted_ids = []
+    image_paths = []
+    categories = set()
+    for start in range(0, len(product_ids), BULK_CHUNK_SIZE):
+        chunk = product_ids[start:start + BULK_CHUNK_SIZE]
+        product_images.delete_images(db, chunk)
+        result = db.execute(
+            delete(SafetyProduct)
+            .where(SafetyProduct.id.in_(chunk))
+            .returning(SafetyProduct.id, SafetyProduct.category_id, SafetyProduct.file_path)
+            .execution_options(synchronize_session=False)
+        )
+        for product_id, category_id, file_path in result:
+            deleted_ids.append(product_id)
+            categories.add(category_id)
+            image_paths.extend(set(image_files.parse_image_paths(file_path)))
+    catalog_stats.refresh_categories(db, categories)
+    return deleted_ids, image_blob_crud.release(db, image_paths)
 
-def advanced_search_products(
-    db: Session, 
-    params: ProductSearchParams
-) -> Tuple[List[dict], int]:
-    """고급 검색으로 제품을 조회합니다."""
+def _advanced_search_statement(params: ProductSearchParams):
+    """고급 검색 필터가 적용된 SELECT 문을 생성합니다 (정렬/페이징 전)."""
     # 기본 쿼리 구성
-    query = db.query(
-        SafetyProduct.id,
-        SafetyProduct.name,
-        SafetyProduct.model_number,
-        SafetyProduct.category_id,
-        SafetyProduct.description,
-        SafetyProduct.specifications,
-        SafetyProduct.price,
-        SafetyProduct.stock_status,
-        SafetyProduct.is_featured,
-        SafetyProduct.display_order,
-        SafetyProduct.file_name,
-        SafetyProduct.file_path,
-        SafetyProduct.created_at,
-        SafetyProduct.updated_at,
-        SafetyCategory.code.label('category_code'),
-        SafetyCategory.name.label('category_name')
-    ).join(SafetyCategory, SafetyProduct.category_id == SafetyCategory.id)
+    stmt = _product_select()
     
     # 필터 조건 적용
     filters = []
     
     # 텍스트 검색
-    if params.search:
-        search_term = f"%{params.search}%"
-        filters.append(
-            or_(
-                SafetyProduct.name.ilike(search_term),
-                SafetyProduct.description.ilike(search_term),
-                SafetyProduct.model_number.ilike(search_term),
-                SafetyProduct.specifications.ilike(search_term)
-            )
-        )
+    condition = search_condition(params.search) if params.search else None
+    if condition is not None:
+        filters.append(condition)
     
     # 카테고리 ID
     if params.category_id:
@@ -285,43 +380,137 @@ def advanced_search_products(
     
     # 필터 적용
     if filters:
-        query = query.filter(and_(*filters))
+        stmt = stmt.where(and_(*filters))
     
-    # 총 개수 계산 (정렬/페이징 전)
-    total = query.count()
+    return stmt
+
+def _advanced_search_sort_keys(params: ProductSearchParams) -> List[SortKey]:
+    """고급 검색 정렬 키 (동일 값 구분을 위해 id를 같은 방향으로 추가, 관련도 정렬이면 빈 목록)"""
+    if params.sort_by == SortField.relevance:
+        return []
+    descending = params.sort_order == SortOrder.desc
+    return [(getattr(SafetyProduct, params.sort_by.value), descending), (SafetyProduct.id, descending)]
+
+def _advanced_search_signature(params: ProductSearchParams) -> str:
+    return f"{params.sort_by.value}:{params.sort_order.value}"
+
+def _advanced_search_page(stmt, params: ProductSearchParams, with_total: bool = False) -> Tuple[Any, int]:
+    """
+    고급 검색 SELECT 문에 정렬과 페이징을 적용합니다.
+    다음 페이지 존재 여부를 알 수 있도록 limit + 1개를 조회하며, (SELECT 문, 페이지 시작 위치)를 반환합니다.
+    with_total이면 필터 조건에 맞는 (커서 이후) 행 수를 total_count 컬럼으로 함께 조회합니다.
+    """
+    keys = _advanced_search_sort_keys(params)
+    if with_total:
+        stmt = stmt.add_columns(func.count().over().label('total_count'))
+    if params.sort_by == SortField.relevance:
+        # 관련도는 계산 값이라 커서를 만들 수 없으므로 OFFSET 페이징만 지원 (항상 관련도 높은 순)
+        if params.cursor:
+            raise ValueError("관련도 정렬은 커서 페이지네이션을 지원하지 않습니다")
+        position = 0 if params.cursor is not None else params.skip
+        stmt = stmt.order_by(relevance_score(params.search).desc(), SafetyProduct.id)
+        return stmt.offset(position).limit(params.limit + 1), position
+    stmt = stmt.order_by(*order_by_clauses(keys))
+    if params.cursor is not None:
+        position = 0
+        if params.cursor:
+            after, position = decode_cursor(keys, params.cursor, _advanced_search_signature(params))
+            stmt = stmt.where(keyset_condition(keys, after))
+        return stmt.limit(params.limit + 1), position
+    return stmt.offset(params.skip).limit(params.limit + 1), params.skip
+
+def _window_total(rows, params: ProductSearchParams, position: int) -> Optional[int]:
+    """
+    count(*) over() 결과로 전체 개수를 계산합니다.
+    OFFSET 방식은 창 함수가 OFFSET 적용 전 행 수를 세므로 그대로 사용하고,
+    커서 방식은 커서 이후 행 수만 세므로 앞서 반환한 항목 수(position)를 더합니다.
+    OFFSET이 결과 범위를 넘어 빈 페이지가 되면 알 수 없으므로 None을 반환합니다.
+    """
+    if params.cursor is not None:
+        return position + rows[0].total_count if rows else position
+    if rows:
+        return rows[0].total_count
+    return 0 if position == 0 else None
+
+def _estimate_statement(db, stmt):
+    """count_mode=estimated이고 실행 계획 추정을 지원하는 DB이면 EXPLAIN 문을 반환합니다."""
+    if not supports_estimate(db.get_bind().dialect.name):
+        return None
+    return Explain(stmt)
+
+def _usable_estimate(plan) -> Optional[int]:
+    estimate = plan_rows(plan)
+    if estimate is None or estimate < settings.SEARCH_COUNT_ESTIMATE_THRESHOLD:
+        return None
+    return estimate
+
+def _advanced_search_result(rows, params: ProductSearchParams, position: int) -> Tuple[List[dict], Optional[str]]:
+    items = [_row_to_dict(row) for row in rows]
+    if params.sort_by == SortField.relevance:
+        return items[:params.limit], None
+    return _split_page(
+        items, params.limit, _advanced_search_sort_keys(params), _advanced_search_signature(params), position=position
+    )
+
+def _count_statement(stmt):
+    """필터가 적용된 SELECT 문의 전체 개수 조회문을 생성합니다."""
+    return select(func.count()).select_from(stmt.subquery())
+
+def advanced_search_products(
+    db: Session, 
+    params: ProductSearchParams
+) -> AdvancedSearchResult:
+    """
+    고급 검색으로 제품을 조회합니다.
+    
+    전체 개수는 params.count_mode에 따라 계산합니다.
+    - window: 페이지 조회와 같은 쿼리에서 count(*) over()로 계산 (기본값)
+    - estimated: 실행 계획의 예상 행 수가 기준 이상이면 추정치 사용, 아니면 window
+    - exact: 별도 COUNT(*) 쿼리
+    """
+    stmt = _advanced_search_statement(params)
+    
+    if params.count_mode == CountMode.estimated:
+        explain = _estimate_statement(db, stmt)
+        estimate = _usable_estimate(db.execute(explain).scalar()) if explain is not None else None
+        if estimate is not None:
+            page, position = _advanced_search_page(stmt, params)
+            products, next_cursor = _advanced_search_result(db.execute(page).all(), params, position)
+            return AdvancedSearchResult(_with_images(db, products), estimate, next_cursor, True)
     
-    # 정렬 적용
-    sort_column = getattr(SafetyProduct, params.sort_by.value)
-    if params.sort_order == SortOrder.desc:
-        query = query.order_by(sort_column.desc())
-    else:
-        query = query.order_by(sort_column.asc())
+    with_total = params.count_mode != CountMode.exact
+    page, position = _advanced_search_page(stmt, params, with_total=with_total)
+    rows = db.execute(page).all()
+    total = _window_total(rows, params, position) if with_total else None
+    if total is None:
+        # 총 개수 계산 (정렬/페이징 전)
+        total = db.execute(_count_statement(stmt)).scalar_one()
+    
+    products, next_cursor = _advanced_search_result(rows, params, position)
+    return AdvancedSearchResult(_with_images(db, products), total, next_cursor, False)
+
+async def advanced_search_products_async(
+    db: AsyncSession,
+    params: ProductSearchParams
+) -> AdvancedSearchResult:
+    """고급 검색으로 제품을 조회합니다 (비동기 세션용)."""
+    stmt = _advanced_search_statement(params)
     
-    # 페이징 적용
-    results = query.offset(params.skip).limit(params.limit).all()
+    if params.count_mode == CountMode.estimated:
+        explain = _estimate_statement(db, stmt)
+        estimate = _usable_estimate((await db.execute(explain)).scalar()) if explain is not None else None
+        if estimate is not None:
+            page, position = _advanced_search_page(stmt, params)
+            products, next_cursor = _advanced_search_result((await db.execute(page)).all(), params, position)
+            return AdvancedSearchResult(await _with_images_async(db, products), estimate, next_cursor, True)
     
-    # 결과를 dict 형태로 변환
-    products = []
-    for row in results:
-        product = {
-            'id': row.id,
-            'name': row.name,
-            'model_number': row.model_number,
-            'category_id': row.category_id,
-            'description': row.description,
-            'specifications': row.specifications,
-            'price': row.price,
-            'stock_status': row.stock_status,
-            'is_featured': row.is_featured,
-            'display_order': row.display_order,
-            'file_name': row.file_name,
-            'file_path': row.file_path,
-            'created_at': row.created_at,
-            'updated_at': row.updated_at,
-            'category_code': row.category_code,
-            'category_name': row.category_name
-        }
-        products.append(product)
+    with_total = params.count_mode != CountMode.exact
+    page, position = _advanced_search_page(stmt, params, with_total=with_total)
+    rows = (await db.execute(page)).all()
+    total = _window_total(rows, params, position) if with_total else None
+    if total is None:
+        # 총 개수 계산 (정렬/페이징 전)
+        total = (await db.execute(_count_statement(stmt))).scalar_one()
     
-    return products, total
- 
\ No newline at end of file
+    products, next_cursor = _advanced_search_result(rows, params, position)
+    return AdvancedSearchResult(await _with_images_async(db, products), total, next_cursor, False)
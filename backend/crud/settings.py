@@ -2,9 +2,10 @@
 Site Settings CRUD Operations
 """
 from sqlalchemy.orm import Session
-from models.settings import SiteSettings
+from models.settings import SiteSettings, DEFAULT_SITE_SETTINGS
 from schemas.settings import SiteSettingsCreate, SiteSettingsUpdate
 from typing import Optional
+from utils import settings_cache
 
 
 def get_settings(db: Session) -> Optional[SiteSettings]:
@@ -21,14 +22,11 @@ def get_or_create_settings(db: Session) -> SiteSettings:
     """
     settings = get_settings(db)
     if not settings:
-        settings = SiteSettings(
-            company_name="보람안전",
-            company_slogan="안전한 작업환경을 위한 최고의 파트너",
-            business_hours="평일 09:00 - 18:00"
-        )
+        settings = SiteSettings(**DEFAULT_SITE_SETTINGS)
         db.add(settings)
         db.commit()
         db.refresh(settings)
+        settings_cache.refresh(settings)
     return settings
 
 
@@ -45,6 +43,7 @@ def create_settings(db: Session, settings_data: SiteSettingsCreate) -> SiteSetti
     db.add(settings)
     db.commit()
     db.refresh(settings)
+    settings_cache.refresh(settings)
     return settings
 
 
@@ -61,6 +60,7 @@ def update_settings(db: Session, settings_data: SiteSettingsUpdate) -> SiteSetti
     
     db.commit()
     db.refresh(settings)
+    settings_cache.refresh(settings)
     return settings
 
 
@@ -71,9 +71,8 @@ def reset_settings(db: Session) -> SiteSettings:
     settings = get_or_create_settings(db)
     
     # 기본값으로 리셋
-    settings.company_name = "보람안전"
-    settings.company_slogan = "안전한 작업환경을 위한 최고의 파트너"
-    settings.business_hours = "평일 09:00 - 18:00"
+    for key, value in DEFAULT_SITE_SETTINGS.items():
+        setattr(settings, key, value)
     
     # 선택 필드 초기화
     settings.company_name_en = None
@@ -103,4 +102,5 @@ def reset_settings(db: Session) -> SiteSettings:
     
     db.commit()
     db.refresh(settings)
+    settings_cache.refresh(settings)
     return settings
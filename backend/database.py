@@ -1,25 +1,73 @@
-import os
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 
 # Load environment variables
 load_dotenv()
 
-# Database connection settings
-DB_USER = os.getenv("DB_USER", "postgres")
-DB_PASSWORD = os.getenv("DB_PASSWORD", "ava1142")
-DB_HOST = os.getenv("DB_HOST", "localhost")
-DB_NAME = os.getenv("DB_NAME", "boram_safety")
-DB_PORT = os.getenv("DB_PORT", "5432")
+from core.config import settings
+from core.db_pool import PoolMetrics, instrument_pool_class
 
 # PostgreSQL connection URL
-SQLALCHEMY_DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+SQLALCHEMY_DATABASE_URL = settings.database_url
+# 비동기 드라이버(asyncpg)용 URL
+ASYNC_SQLALCHEMY_DATABASE_URL = settings.async_database_url
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# 커넥션 풀 지표 (Admin API에서 조회)
+sync_pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+
+def _statement_timeout_args(url: str) -> dict:
+    """드라이버별 statement_timeout 연결 인자를 반환합니다."""
+    timeout_ms = settings.DB_STATEMENT_TIMEOUT_MS
+    parsed_url = make_url(url)
+    if not timeout_ms or parsed_url.get_backend_name() != "postgresql":
+        return {}
+    if parsed_url.get_driver_name() == "asyncpg":
+        return {"server_settings": {"statement_timeout": str(timeout_ms)}}
+    return {"options": f"-c statement_timeout={timeout_ms}"}
+
+
+def _pool_options(url: str, pool_class: type, metrics: PoolMetrics) -> dict:
+    """Settings 기반 커넥션 풀 옵션을 생성합니다."""
+    return {
+        "poolclass": instrument_pool_class(pool_class, metrics),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": _statement_timeout_args(url),
+    }
+
+
+def create_db_engine(url: str = SQLALCHEMY_DATABASE_URL, metrics: PoolMetrics = sync_pool_metrics):
+    """커넥션 풀 설정이 적용된 동기 엔진을 생성합니다."""
+    return create_engine(url, **_pool_options(url, QueuePool, metrics))
+
+
+def create_async_db_engine(url: str = ASYNC_SQLALCHEMY_DATABASE_URL, metrics: PoolMetrics = async_pool_metrics):
+    """커넥션 풀 설정이 적용된 비동기 엔진을 생성합니다."""
+    return create_async_engine(url, **_pool_options(url, AsyncAdaptedQueuePool, metrics))
+
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 비동기 엔진/세션 (Public 조회 API용 - 이벤트 루프를 막지 않음)
+async_engine = create_async_db_engine()
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 Base = declarative_base()
 
 # Dependency
@@ -28,4 +76,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+# Async dependency
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
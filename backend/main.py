@@ -1,6 +1,8 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+import asyncio
 import os
 import time
 
@@ -9,19 +11,98 @@ from admin.router import router as admin_router
 from core.config import settings
 from core.logger import get_logger, log_api_request
 from core.exceptions import setup_exception_handlers
+from core.http_cache import ConditionalGetMiddleware
+from database import SessionLocal, engine, async_engine
+from models.catalog import CatalogState
+from models.safety import ProductImage
+from core.jobs import runner as job_runner, sweep_periodically as sweep_jobs_periodically
+from core.audit_writer import writer as audit_writer
+from crud import image_blob as image_blob_crud
+from crud import job as job_crud
+from crud import settings as settings_crud
+from utils import catalog_stats, catalog_version
+from utils.image_resize import ResizingStaticFiles
 
 # 로거 초기화
 logger = get_logger(__name__)
 
+def init_site_settings():
+    """사이트 설정 기본 행 생성 및 캐시 적재 (공개 GET 요청에서 INSERT 하지 않도록)"""
+    db = SessionLocal()
+    try:
+        settings_crud.get_or_create_settings(db)
+    except Exception as e:
+        logger.warning(f"사이트 설정 초기화 실패: {e}")
+    finally:
+        db.close()
+
+def init_tables():
+    """
+    추가된 테이블 생성 (카탈로그 버전, 백그라운드 작업, 이미지 참조 수, 제품 이미지, 대시보드 통계
+    - 기존 DB 업그레이드용, 이미 있으면 건너뜀)
+    기존 제품의 이미지 행은 scripts/migration/migrate_product_images.py로 채웁니다.
+    """
+    for table in (CatalogState.__table__, ProductImage.__table__):
+        try:
+            table.create(bind=engine, checkfirst=True)
+        except Exception as e:
+            logger.warning(f"{table.name} 테이블 생성 실패: {e}")
+    try:
+        job_crud.ensure_table(engine)
+    except Exception as e:
+        logger.warning(f"jobs 테이블 생성 실패: {e}")
+    try:
+        image_blob_crud.ensure_table(engine)
+    except Exception as e:
+        logger.warning(f"image_blobs 테이블 생성 실패: {e}")
+    try:
+        catalog_stats.ensure_table(engine)
+    except Exception as e:
+        logger.warning(f"category_stats 테이블 생성 실패: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """애플리케이션 시작/종료 처리"""
+    await run_in_threadpool(init_tables)
+    await run_in_threadpool(init_site_settings)
+    # 대시보드 통계 재계산 (시작 시 한 번, 이후 STATS_RECONCILE_INTERVAL마다)
+    stats_task = asyncio.create_task(catalog_stats.reconcile_periodically(SessionLocal))
+    # 참조 없는 업로드 이미지 정리 (시작 시 한 번, 이후 IMAGE_GC_INTERVAL마다)
+    image_gc_task = asyncio.create_task(image_blob_crud.collect_periodically(SessionLocal))
+    # 중단된 백그라운드 작업 실패 처리, 보존 기간이 지난 작업/파일 삭제 (시작 시 한 번, 이후 JOB_SWEEP_INTERVAL마다)
+    job_sweep_task = asyncio.create_task(sweep_jobs_periodically(SessionLocal))
+    yield
+    stats_task.cancel()
+    image_gc_task.cancel()
+    job_sweep_task.cancel()
+    # 실행 중인 백그라운드 작업 종료 대기
+    await run_in_threadpool(job_runner.shutdown)
+    # 대기 중인 감사 로그 기록
+    await run_in_threadpool(audit_writer.shutdown)
+    # 비동기 커넥션 풀 정리
+    await async_engine.dispose()
+
 app = FastAPI(
     title="보람안전 API",
     description="보람안전물산(주) 공식 API 서버 - 안전용품 전문 쇼핑몰",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # 전역 예외 핸들러 설정
 setup_exception_handlers(app)
 
+# 공개 카탈로그 GET 응답 HTTP 캐시 (카탈로그 버전 기반 ETag / Last-Modified, 변경 없으면 304)
+app.add_middleware(
+    ConditionalGetMiddleware,
+    rules={
+        "/api/products": f"public, max-age={settings.HTTP_CACHE_PRODUCTS_MAX_AGE}, must-revalidate",
+        "/api/categories": f"public, max-age={settings.HTTP_CACHE_CATEGORIES_MAX_AGE}, must-revalidate",
+        "/api/search/suggestions": f"public, max-age={settings.HTTP_CACHE_SUGGESTIONS_MAX_AGE}, must-revalidate",
+    },
+    version_provider=catalog_version.request_catalog_version,
+)
+
 # 로깅 미들웨어
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -38,6 +119,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # 제품 목록 커서 페이지네이션
 )
 
 # 정적 파일 서빙 - backend/static/images 사용
@@ -46,8 +128,9 @@ images_path = os.path.join(BASE_DIR, "static/images")
 print(f"Images path: {os.path.abspath(images_path)}")  # 디버깅용
 
 # 이미지 디렉토리가 존재하는 경우에만 마운트
+# ?w=&h=&fmt= 쿼리가 있으면 리사이즈해 디스크 캐시에서 서빙 (utils/image_resize.py)
 if os.path.exists(images_path):
-    app.mount("/images", StaticFiles(directory=images_path), name="images")
+    app.mount("/images", ResizingStaticFiles(directory=images_path), name="images")
 else:
     logger.warning(f"Images directory not found: {images_path}")
 
@@ -1,3 +1,7 @@
 from database import Base
 from models.audit import AuditLog, AuditAction, AuditEntityType
-from models.draft import DraftProduct 
\ No newline at end of file
+from models.draft import DraftProduct
+from models.catalog import CatalogState
+from models.job import Job
+from models.image_blob import ImageBlob
+from models.stats import CategoryStats, MaintenanceLease
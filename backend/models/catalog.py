@@ -0,0 +1,21 @@
+"""
+Catalog State Model
+제품/카테고리 데이터의 변경 버전을 저장하는 단일 행 테이블
+공개 API의 HTTP 캐시 검증자(ETag / Last-Modified) 생성에 사용됩니다.
+"""
+from sqlalchemy import Column, Integer, BigInteger, DateTime
+from sqlalchemy.sql import func
+from database import Base
+
+
+CATALOG_STATE_ID = 1
+
+
+class CatalogState(Base):
+    """카탈로그 변경 버전 테이블 (제품/카테고리 변경 트랜잭션마다 version 증가)"""
+    __tablename__ = "catalog_state"
+    __table_args__ = {'extend_existing': True}
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,23 @@
+"""
+Image Blob Model
+내용 주소(SHA-256) 기반 이미지 저장소의 파일별 참조 수
+같은 내용의 이미지는 '/images/{sha256}{확장자}' 파일 하나로 저장하고,
+이를 참조하는 제품 수(ref_count)가 0이고 업로드 임대(leased_until)가 끝난 파일은
+정리 작업(crud.image_blob.collect_garbage)이 삭제합니다.
+"""
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from database import Base
+
+
+class ImageBlob(Base):
+    """이미지 파일(내용 해시)별 제품 참조 수"""
+    __tablename__ = "image_blobs"
+    __table_args__ = {'extend_existing': True}
+
+    sha256 = Column(String(64), primary_key=True)
+    path = Column(String(500), nullable=False, unique=True)  # 웹 경로 (/images/...)
+    size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    leased_until = Column(DateTime(timezone=True))  # 업로드 후 이 시각까지는 참조가 없어도 삭제하지 않음
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,52 @@
+"""
+Background Job 모델
+엑셀 가져오기/내보내기 등 오래 걸리는 작업의 상태와 진행률을 저장합니다.
+"""
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Enum as SQLEnum
+from sqlalchemy.sql import func
+from database import Base
+import enum
+
+
+class JobStatus(str, enum.Enum):
+    """작업 상태"""
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+class JobKind(str, enum.Enum):
+    """작업 종류"""
+    PRODUCT_IMPORT = "PRODUCT_IMPORT"
+    PRODUCT_EXPORT = "PRODUCT_EXPORT"
+
+
+class Job(Base):
+    """백그라운드 작업 테이블"""
+    __tablename__ = "jobs"
+    __table_args__ = {'extend_existing': True}
+
+    id = Column(String(32), primary_key=True)  # uuid4 hex (추측하기 어려운 ID)
+    kind = Column(SQLEnum(JobKind), nullable=False, index=True)
+    status = Column(SQLEnum(JobStatus), nullable=False, default=JobStatus.QUEUED, index=True)
+    params = Column(JSON, nullable=True)  # 작업 입력값 (카테고리, 모드 등)
+
+    # 진행률
+    processed_rows = Column(Integer, default=0)
+    error_count = Column(Integer, default=0)
+    errors = Column(JSON, nullable=True)  # 행 단위 오류 (최대 JOB_MAX_ERRORS건)
+
+    # 결과
+    result = Column(JSON, nullable=True)
+    message = Column(Text, nullable=True)
+    file_path = Column(String(500), nullable=True)  # 결과 파일 (서버 로컬 경로)
+    file_name = Column(String(255), nullable=True)  # 다운로드 파일명
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # 실행 중인 워커가 주기적으로 갱신 (core.jobs)
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, kind={self.kind}, status={self.status})>"
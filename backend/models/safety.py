@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Index, JSON, DDL, event
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
 
@@ -32,13 +33,62 @@ class SafetyProduct(Base):  # SafetyItemsImages를 SafetyProduct로 확장
     specifications = Column(Text)  # 제품 사양 (JSON 형태)
     stock_status = Column(String(50), default="in_stock")  # 재고 상태
     
-    # 이미지 정보
+    # 이미지 정보 - file_path는 이미지 경로 JSON 배열 (API 호환용, 이미지 조회는 product_images 사용)
     file_name = Column(String(255), nullable=False)
-    file_path = Column(String(500), nullable=False)
+    file_path = Column(Text, nullable=False)
     
     # 메타 정보
     display_order = Column(Integer, default=0)  # 표시 순서
     is_featured = Column(Integer, default=0)  # 추천 제품 여부 (0: 일반, 1: 추천)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now()) 
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now()) 
+    
+    # file_path가 바뀌면 flush 시 utils.product_images가 다시 채움
+    images = relationship("ProductImage", order_by="ProductImage.position",
+                          cascade="all, delete-orphan", passive_deletes=True)
+
+
+class ProductImage(Base):
+    """제품 이미지 (file_path JSON 배열을 정규화한 행, 순서는 position)"""
+    __tablename__ = "product_images"
+    __table_args__ = (
+        Index("ix_product_images_product_position", "product_id", "position"),
+        Index("ix_product_images_path", "path"),
+        {'extend_existing': True},
+    )
+
+    id = Column(Integer, primary_key=True)
+    product_id = Column(Integer, ForeignKey("safety_products.id", ondelete="CASCADE"), nullable=False)
+    position = Column(Integer, nullable=False, default=0)  # 0이 대표 이미지
+    path = Column(String(500), nullable=False)  # 웹 경로 (/images/...)
+    width = Column(Integer)
+    height = Column(Integer)
+    bytes = Column(Integer)
+    variants = Column(JSON)  # 크기별 변형 URL (utils.image_variants.variants_for)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+# 커서(keyset) 페이지네이션용 복합 인덱스 - 정렬 키 순서와 일치해야 범위 탐색으로 처리됨
+# 기존 DB에는 scripts/setup/create_indexes.py 로 추가합니다.
+PRODUCT_PAGINATION_INDEXES = [
+    # 기본 목록: category_id, is_featured DESC, name, id
+    Index("ix_safety_products_listing",
+          SafetyProduct.category_id, SafetyProduct.is_featured.desc(), SafetyProduct.name, SafetyProduct.id),
+    # 고급 검색 정렬 필드별 (정렬 값, id)
+    Index("ix_safety_products_name_id", SafetyProduct.name, SafetyProduct.id),
+    Index("ix_safety_products_price_id", SafetyProduct.price, SafetyProduct.id),
+    Index("ix_safety_products_created_at_id", SafetyProduct.created_at, SafetyProduct.id),
+    Index("ix_safety_products_updated_at_id", SafetyProduct.updated_at, SafetyProduct.id),
+    Index("ix_safety_products_display_order_id", SafetyProduct.display_order, SafetyProduct.id),
+]
+
+# 텍스트 검색용 pg_trgm GIN 인덱스 (PostgreSQL 전용) - '%단어%' ILIKE 검색을 인덱스로 처리 (utils.product_search)
+PG_TRGM_EXTENSION = DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+event.listen(SafetyProduct.__table__, "before_create", PG_TRGM_EXTENSION.execute_if(dialect="postgresql"))
+
+PRODUCT_SEARCH_INDEXES = [
+    Index(f"ix_safety_products_{column.key}_trgm", column,
+          postgresql_using="gin", postgresql_ops={column.key: "gin_trgm_ops"}).ddl_if(dialect="postgresql")
+    for column in (SafetyProduct.name, SafetyProduct.model_number, SafetyProduct.description, SafetyProduct.specifications)
+]
@@ -7,6 +7,14 @@ from sqlalchemy.sql import func
 from database import Base
 
 
+# 설정 행이 없을 때 사용하는 기본값 (생성/초기화 시 공통 사용)
+DEFAULT_SITE_SETTINGS = {
+    "company_name": "보람안전",
+    "company_slogan": "안전한 작업환경을 위한 최고의 파트너",
+    "business_hours": "평일 09:00 - 18:00",
+}
+
+
 class SiteSettings(Base):
     """사이트 설정 테이블"""
     __tablename__ = "site_settings"
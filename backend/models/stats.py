@@ -0,0 +1,31 @@
+"""
+Category Stats Model
+관리자 대시보드 / 카테고리 목록 배지용 카테고리별 제품 집계 (제품 변경 시 증분 갱신, 주기적으로 전체 재계산)
+전체 합계는 카테고리 행을 더해서 구합니다 (utils.catalog_stats).
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from database import Base
+
+
+class CategoryStats(Base):
+    """카테고리별 제품 수 / 추천 / 재고 있음 / 품절 / 이미지 없음 집계"""
+    __tablename__ = "category_stats"
+    __table_args__ = {'extend_existing': True}
+
+    category_id = Column(Integer, ForeignKey("safety_categories.id", ondelete="CASCADE"), primary_key=True)
+    product_count = Column(Integer, nullable=False, default=0)
+    featured_count = Column(Integer, nullable=False, default=0)
+    in_stock_count = Column(Integer, nullable=False, default=0)
+    out_of_stock_count = Column(Integer, nullable=False, default=0)
+    missing_image_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class MaintenanceLease(Base):
+    """여러 워커 중 한 곳에서만 실행할 주기 작업의 실행 임대 (작업 이름 -> 만료 시각)"""
+    __tablename__ = "maintenance_leases"
+    __table_args__ = {'extend_existing': True}
+
+    name = Column(String(50), primary_key=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
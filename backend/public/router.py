@@ -1,15 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import TypeAdapter
 from typing import List, Optional
 import math
 
-from database import get_db
+from database import get_async_db
 from crud import product as product_crud
-from crud import category as category_crud
-from crud import settings as settings_crud
 from schemas.product import ProductResponse, ProductSearchParams, ProductSearchResponse
 from schemas.category import Category
 from schemas.settings import SiteSettingsPublic
+from core.http_cache import etag_matches
+from utils import catalog_stats, catalog_version, category_cache, settings_cache, suggestion_index, response_cache
 
 # ✅ Public Router - GET만 허용
 router = APIRouter(
@@ -23,47 +24,111 @@ def public_health_check():
 
 
 @router.get("/settings", response_model=SiteSettingsPublic)
-async def get_public_settings(db: Session = Depends(get_db)):
+async def get_public_settings(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+):
     """
     공개용 사이트 설정 조회
     
     - 회사명, 연락처 등 공개 정보만 반환합니다
     - 민감한 정보는 제외됩니다
+    - 메모리 스냅샷에서 응답하며, ETag가 같으면 304를 반환합니다
     """
-    settings = settings_crud.get_or_create_settings(db)
-    return settings
+    snapshot = await settings_cache.get_snapshot(db)
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+
+_category_list = TypeAdapter(List[Category])
+_product_list = TypeAdapter(List[ProductResponse])
+
+
+def _cache_key(*parts) -> str:
+    return ":".join("" if part is None else str(part) for part in parts)
+
+
+async def _catalog_version(request: Request) -> int:
+    """이 요청의 카탈로그 버전 (ETag와 같은 값 - 워커별 캐시를 이 버전 기준으로 사용)"""
+    version, _ = await catalog_version.request_catalog_version(request)
+    return version
 
 
 @router.get("/categories", response_model=List[Category])
 async def get_categories(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    version: int = Depends(_catalog_version)
 ):
-    """카테고리 목록 조회 (읽기 전용)"""
-    return category_crud.get_categories(db, skip=skip, limit=limit)
+    """카테고리 목록 조회 (읽기 전용, 공유 응답 캐시)"""
+    async def build():
+        categories = await category_cache.get_categories(db, skip=skip, limit=limit, version=version)
+        categories = await catalog_stats.with_counts(db, categories)
+        return _category_list.dump_json(_category_list.validate_python(categories)), {}
+    return await response_cache.json_response(
+        _cache_key("categories", version, skip, limit), [response_cache.TAG_CATEGORIES], build
+    )
+
+async def _category_response(key: str, db: AsyncSession, lookup) -> Response:
+    async def build():
+        category = await lookup(db)
+        if not category:
+            raise HTTPException(status_code=404, detail="Category not found")
+        category = (await catalog_stats.with_counts(db, [category]))[0]
+        return Category.model_validate(category).model_dump_json().encode("utf-8"), {}
+    return await response_cache.json_response(key, [response_cache.TAG_CATEGORIES], build)
 
 @router.get("/categories/{category_id}", response_model=Category)
 async def get_category_by_id(
     category_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    version: int = Depends(_catalog_version)
 ):
     """카테고리 ID로 조회 (읽기 전용)"""
-    category = category_crud.get_category(db, category_id)
-    if not category:
-        raise HTTPException(status_code=404, detail="Category not found")
-    return category
+    return await _category_response(
+        _cache_key("category", version, category_id), db,
+        lambda db: category_cache.get_category(db, category_id, version=version)
+    )
 
 @router.get("/categories/slug/{slug}", response_model=Category)
 async def get_category_by_slug(
     slug: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    version: int = Depends(_catalog_version)
 ):
     """카테고리 slug로 조회 (읽기 전용)"""
-    category = category_crud.get_category_by_slug(db, slug)
-    if not category:
-        raise HTTPException(status_code=404, detail="Category not found")
-    return category
+    return await _category_response(
+        _cache_key("category-slug", version, slug), db,
+        lambda db: category_cache.get_category_by_slug(db, slug, version=version)
+    )
+
+async def _product_page(
+    db: AsyncSession,
+    version: int,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    category_code: Optional[str] = None,
+    search: Optional[str] = None
+) -> Response:
+    """
+    제품 목록 한 페이지를 조회하고 다음 페이지 커서를 X-Next-Cursor 헤더로 전달합니다.
+    직렬화된 응답은 공유 응답 캐시에 저장됩니다.
+    """
+    async def build():
+        try:
+            products, next_cursor = await product_crud.get_products_page_async(
+                db, skip=skip, limit=limit, category_code=category_code, search=search, cursor=cursor
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        return _product_list.dump_json(_product_list.validate_python(products)), headers
+    key = _cache_key("products", version, skip if cursor is None else "", limit, category_code, search, cursor)
+    return await response_cache.json_response(key, [response_cache.TAG_PRODUCTS], build)
 
 @router.get("/products", response_model=List[ProductResponse])
 async def get_products(
@@ -71,57 +136,69 @@ async def get_products(
     limit: int = 20,
     category_code: Optional[str] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (X-Next-Cursor 헤더 값, 지정 시 skip 무시)"),
+    db: AsyncSession = Depends(get_async_db),
+    version: int = Depends(_catalog_version)
 ):
     """제품 목록 조회 (읽기 전용)"""
-    return product_crud.get_products(db, skip=skip, limit=limit, category_code=category_code, search=search)
+    return await _product_page(db, version, skip, limit, cursor, category_code=category_code, search=search)
 
 @router.get("/products/by-category/{category_code}", response_model=List[ProductResponse])
 async def get_products_by_category(
     category_code: str,
     skip: int = 0,
     limit: int = 20,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (X-Next-Cursor 헤더 값, 지정 시 skip 무시)"),
+    db: AsyncSession = Depends(get_async_db),
+    version: int = Depends(_catalog_version)
 ):
     """카테고리별 제품 조회 (읽기 전용)"""
-    return product_crud.get_products(db, skip=skip, limit=limit, category_code=category_code)
+    return await _product_page(db, version, skip, limit, cursor, category_code=category_code)
 
 @router.get("/products/search")
 async def search_products(
     q: str = Query(..., description="검색어"),
     skip: int = 0,
     limit: int = 20,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """제품 검색 (읽기 전용)"""
-    return product_crud.get_products(db, skip=skip, limit=limit, search=q)
+    """제품 검색 (읽기 전용, 관련도 순)"""
+    return await product_crud.search_products_async(db, query=q, skip=skip, limit=limit)
 
 @router.get("/products/{product_id}", response_model=ProductResponse)
 async def get_product_detail(
     product_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    version: int = Depends(_catalog_version)
 ):
-    """제품 상세 조회 (읽기 전용)"""
-    product = product_crud.get_product(db, product_id)
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
-    return product
+    """제품 상세 조회 (읽기 전용, 공유 응답 캐시)"""
+    async def build():
+        product = await product_crud.get_product_async(db, product_id)
+        if not product:
+            raise HTTPException(status_code=404, detail="Product not found")
+        return ProductResponse.model_validate(product).model_dump_json().encode("utf-8"), {}
+    return await response_cache.json_response(
+        _cache_key("product", version, product_id),
+        [response_cache.product_tag(product_id), response_cache.TAG_PRODUCT_DETAILS],
+        build
+    )
 
 @router.get("/search/suggestions")
 async def get_search_suggestions(
     q: str = Query(..., description="검색어"),
     limit: int = 5,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    version: int = Depends(_catalog_version)
 ):
-    """검색 제안 (읽기 전용)"""
-    suggestions = product_crud.get_search_suggestions(db, query=q, limit=limit)
+    """검색 제안 (읽기 전용, 메모리 인덱스에서 제품명/모델번호/카테고리명 접두어 검색)"""
+    suggestions = await suggestion_index.suggest(db, query=q, limit=limit, version=version)
     return {"suggestions": suggestions}
 
 
 @router.post("/products/advanced-search", response_model=ProductSearchResponse)
 async def advanced_search_products(
     params: ProductSearchParams,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     고급 검색으로 제품을 조회합니다.
@@ -133,9 +210,11 @@ async def advanced_search_products(
     - **stock_status**: 재고 상태 ("재고있음", "품절", "입고예정" 등)
     - **is_featured**: 추천 제품 여부
     - **created_after / created_before**: 등록 날짜 범위
-    - **sort_by**: 정렬 필드 (name, price, created_at, updated_at, display_order)
+    - **sort_by**: 정렬 필드 (name, price, created_at, updated_at, display_order, relevance)
     - **sort_order**: 정렬 순서 (asc, desc)
     - **skip / limit**: 페이징
+    - **count_mode**: 전체 개수 계산 방식 (window: 한 번의 쿼리로 계산(기본), estimated: 결과가 많으면 추정치, exact: 별도 COUNT)
+    - **cursor**: 이전 응답의 next_cursor (지정 시 skip 대신 커서 기반 페이징, 빈 문자열은 첫 페이지)
     
     예시:
     ```json
@@ -152,7 +231,10 @@ async def advanced_search_products(
     }
     ```
     """
-    products, total = product_crud.advanced_search_products(db, params)
+    try:
+        products, total, next_cursor, total_is_estimate = await product_crud.advanced_search_products_async(db, params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     # 페이지 정보 계산
     page = (params.skip // params.limit) + 1
@@ -163,6 +245,8 @@ async def advanced_search_products(
         items=products,
         page=page,
         page_size=params.limit,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor,
+        total_is_estimate=total_is_estimate
     )
  
\ No newline at end of file
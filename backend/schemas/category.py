@@ -23,6 +23,10 @@ class Category(CategoryBase):
     id: int
     image: Optional[str] = None
     image_count: Optional[int] = None
+    # 카테고리 배지용 집계 (category_stats, 공개 카테고리 API에서 채움)
+    product_count: Optional[int] = None
+    featured_count: Optional[int] = None
+    in_stock_count: Optional[int] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
     
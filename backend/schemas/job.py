@@ -0,0 +1,48 @@
+"""
+Background Job 스키마
+"""
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from enum import Enum
+
+
+class JobStatus(str, Enum):
+    """작업 상태"""
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+class JobKind(str, Enum):
+    """작업 종류"""
+    PRODUCT_IMPORT = "PRODUCT_IMPORT"
+    PRODUCT_EXPORT = "PRODUCT_EXPORT"
+
+
+class JobResponse(BaseModel):
+    """작업 상태 응답 스키마"""
+    id: str
+    kind: JobKind
+    status: JobStatus
+    params: Optional[Dict[str, Any]] = None
+    processed_rows: int = 0
+    error_count: int = 0
+    errors: Optional[List[Dict[str, Any]]] = None
+    result: Optional[Dict[str, Any]] = None
+    message: Optional[str] = None
+    download_url: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class JobSubmitted(BaseModel):
+    """작업 등록 응답 스키마"""
+    job_id: str
+    status: JobStatus
+    status_url: str
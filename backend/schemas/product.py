@@ -1,8 +1,9 @@
-from pydantic import BaseModel, field_validator
-from typing import Optional, List
+from pydantic import BaseModel, computed_field, field_validator
+from typing import Dict, Optional, List
 from datetime import datetime
 from enum import Enum
 
+
 class SortOrder(str, Enum):
     """정렬 순서"""
     asc = "asc"
@@ -15,6 +16,13 @@ class SortField(str, Enum):
     created_at = "created_at"
     updated_at = "updated_at"
     display_order = "display_order"
+    relevance = "relevance"  # 검색어 관련도 (항상 높은 순, 커서 페이지네이션 미지원)
+
+class CountMode(str, Enum):
+    """검색 결과 전체 개수 계산 방식"""
+    exact = "exact"  # 별도 COUNT(*) 쿼리
+    window = "window"  # 페이지 조회에 count(*) over() 포함 (한 번의 쿼리)
+    estimated = "estimated"  # 결과가 많으면 실행 계획의 예상 행 수 사용 (PostgreSQL)
 
 class ProductSearchParams(BaseModel):
     """고급 검색 파라미터"""
@@ -41,9 +49,13 @@ class ProductSearchParams(BaseModel):
     sort_by: SortField = SortField.name
     sort_order: SortOrder = SortOrder.asc
     
-    # 페이징
+    # 페이징 (cursor가 있으면 skip 대신 커서 기반으로 조회, 빈 문자열은 첫 페이지)
     skip: int = 0
     limit: int = 100
+    cursor: Optional[str] = None
+    
+    # 전체 개수 계산 방식
+    count_mode: CountMode = CountMode.window
 
 class ProductSearchResponse(BaseModel):
     """검색 결과 응답"""
@@ -52,6 +64,8 @@ class ProductSearchResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = None  # 다음 페이지가 없으면 None
+    total_is_estimate: bool = False  # total이 실행 계획 기반 추정치인지 여부
 
 class ProductBase(BaseModel):
     name: str
@@ -81,6 +95,18 @@ class ProductUpdate(BaseModel):
     file_name: Optional[str] = None
     file_path: Optional[str] = None
 
+class ProductImageResponse(BaseModel):
+    """제품 이미지 (product_images 행)"""
+    position: int
+    path: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    bytes: Optional[int] = None
+    variants: Optional[Dict[str, str]] = None
+    
+    class Config:
+        from_attributes = True
+
 class ProductResponse(ProductBase):
     id: int
     file_name: Optional[str] = None
@@ -89,6 +115,7 @@ class ProductResponse(ProductBase):
     category_name: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
+    images: Optional[List[ProductImageResponse]] = None  # 목록/상세 조회 시 함께 조회 (검색 결과는 None)
     
     @field_validator('is_featured', mode='before')
     @classmethod
@@ -98,5 +125,11 @@ class ProductResponse(ProductBase):
             return v
         return bool(v)
     
+    @computed_field
+    @property
+    def image_variants(self) -> List[Dict[str, str]]:
+        """이미지별 크기 변형 URL (original/thumb/card/detail) - 저장된 images[].variants 중 변형이 있는 이미지만"""
+        return [image.variants for image in self.images or [] if image.variants]
+    
     class Config:
         from_attributes = True 
\ No newline at end of file
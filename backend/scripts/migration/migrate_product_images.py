@@ -0,0 +1,62 @@
+"""
+product_images 테이블 마이그레이션 스크립트
+- product_images 테이블 생성 (이미 있으면 건너뜀)
+- safety_products.file_path를 TEXT로 변경 (PostgreSQL, 500자 제한 해제)
+- file_path JSON 배열을 이미지 행으로 변환 (이미지 행이 없는 제품만, --rebuild면 전체 다시 생성)
+
+사용법:
+    python scripts/migration/migrate_product_images.py [--rebuild]
+"""
+import argparse
+
+from sqlalchemy import delete, exists, select, text
+
+from database import SessionLocal, engine
+from models.safety import ProductImage, SafetyProduct
+from utils.product_images import insert_images, wait_for_metadata
+
+BATCH_SIZE = 1000
+
+
+def migrate(rebuild: bool = False) -> int:
+    ProductImage.__table__.create(bind=engine, checkfirst=True)
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE safety_products ALTER COLUMN file_path TYPE TEXT"))
+
+    db = SessionLocal()
+    try:
+        if rebuild:
+            db.execute(delete(ProductImage))
+            db.commit()
+
+        total = 0
+        last_id = 0
+        while True:
+            # id 순 keyset 배치 - 이미지 행이 없는 제품만
+            rows = db.execute(
+                select(SafetyProduct.id, SafetyProduct.file_path)
+                .where(SafetyProduct.id > last_id, ~exists().where(ProductImage.product_id == SafetyProduct.id))
+                .order_by(SafetyProduct.id)
+                .limit(BATCH_SIZE)
+            ).all()
+            if not rows:
+                # 커밋마다 예약된 이미지 크기/해상도 채우기가 끝날 때까지 대기
+                wait_for_metadata()
+                return total
+            total += insert_images(db, rows)
+            db.commit()
+            last_id = rows[-1].id
+            print(f"  - products up to #{last_id}: {total} image rows")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="file_path JSON -> product_images 마이그레이션")
+    parser.add_argument("--rebuild", action="store_true", help="기존 이미지 행을 지우고 전체 다시 생성")
+    options = parser.parse_args()
+
+    print("🚀 product_images 마이그레이션 시작...")
+    count = migrate(rebuild=options.rebuild)
+    print(f"✅ product_images 마이그레이션 완료: {count}개 이미지 행 생성")
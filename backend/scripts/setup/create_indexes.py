@@ -0,0 +1,20 @@
+"""
+제품 목록/검색용 인덱스 생성 스크립트
+- 페이지네이션 정렬 키 복합 인덱스
+- 텍스트 검색용 pg_trgm GIN 인덱스 (PostgreSQL 전용, pg_trgm 확장 설치 포함)
+이미 존재하는 인덱스는 건너뜁니다.
+"""
+from database import engine
+from models.safety import PRODUCT_PAGINATION_INDEXES, PRODUCT_SEARCH_INDEXES, PG_TRGM_EXTENSION
+
+if __name__ == "__main__":
+    if engine.dialect.name == "postgresql":
+        print("Enabling pg_trgm extension...")
+        with engine.begin() as conn:
+            conn.execute(PG_TRGM_EXTENSION)
+
+    print("Creating indexes on safety_products...")
+    for index in PRODUCT_PAGINATION_INDEXES + PRODUCT_SEARCH_INDEXES:
+        index.create(bind=engine, checkfirst=True)
+        print(f"  - {index.name}")
+    print("✅ indexes created successfully!")
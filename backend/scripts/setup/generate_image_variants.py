@@ -0,0 +1,47 @@
+"""
+이미지 변형(thumb/card/detail) 일괄 생성 스크립트
+업로드 디렉토리와 backend/static/images 아래 기존 이미지의 변형을 만듭니다.
+이미 변형이 있는 이미지는 건너뜁니다 (--force로 다시 생성).
+
+사용법:
+    python scripts/setup/generate_image_variants.py [--force] [디렉토리 ...]
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Tuple
+
+from utils.image_variants import SOURCE_EXTENSIONS, generate_variants, image_roots, is_variant
+
+
+def _generate(args: Tuple[Path, bool]) -> Tuple[Path, str]:
+    path, force = args
+    try:
+        generate_variants(path, overwrite=force)
+    except Exception as e:
+        return path, str(e)
+    return path, ""
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="이미지 변형 일괄 생성")
+    parser.add_argument("roots", nargs="*", type=Path, help="대상 디렉토리 (기본: 업로드 디렉토리, static/images)")
+    parser.add_argument("--force", action="store_true", help="이미 있는 변형도 다시 생성")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    options = parser.parse_args()
+
+    sources = sorted(
+        path
+        for root in (options.roots or image_roots()) if root.is_dir()
+        for path in root.rglob("*")
+        if path.is_file() and path.suffix.lower() in SOURCE_EXTENSIONS and not is_variant(path)
+    )
+    print(f"Generating variants for {len(sources)} images...")
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=options.workers) as executor:
+        for path, error in executor.map(_generate, [(path, options.force) for path in sources], chunksize=8):
+            if error:
+                failed += 1
+                print(f"  ! {path}: {error}")
+    print(f"✅ variants generated: {len(sources) - failed} ok, {failed} failed")
@@ -7,31 +7,48 @@ import sys
 import pytest
 from typing import Generator
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 from fastapi.testclient import TestClient
 
 # 상위 디렉토리를 sys.path에 추가
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database import Base, get_db
+from database import Base, get_db, get_async_db
+from core.audit_writer import writer as audit_writer
 from main import app
 from models.safety import SafetyCategory, SafetyProduct
+from utils import category_cache, settings_cache, suggestion_index, catalog_version, response_cache
 
-# 테스트용 인메모리 SQLite 데이터베이스 설정
-SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///:memory:"
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """테스트마다 DB가 새로 만들어지므로 인메모리 캐시도 비움"""
+    category_cache.invalidate()
+    settings_cache.invalidate()
+    suggestion_index.invalidate()
+    catalog_version.invalidate()
+    response_cache.clear()
+    yield
+    category_cache.invalidate()
+    settings_cache.invalidate()
+    suggestion_index.invalidate()
+    catalog_version.invalidate()
+    response_cache.clear()
 
 @pytest.fixture(scope="function")
-def test_db() -> Generator[Session, None, None]:
+def test_db(tmp_path) -> Generator[Session, None, None]:
     """
     테스트용 데이터베이스 세션 생성
     각 테스트마다 새로운 데이터베이스 생성 및 삭제
+    
+    동기 세션(Admin API)과 비동기 세션(Public API)이 같은 데이터를 보도록
+    임시 디렉토리의 SQLite 파일 데이터베이스를 사용합니다.
     """
-    # 인메모리 SQLite 엔진 생성
+    # 파일 기반 SQLite 엔진 생성
     engine = create_engine(
-        SQLALCHEMY_TEST_DATABASE_URL,
+        f"sqlite:///{tmp_path / 'test.db'}",
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
     )
     
     # 테이블 생성
@@ -45,8 +62,10 @@ def test_db() -> Generator[Session, None, None]:
         yield session
     finally:
         session.close()
-        # 테이블 삭제
+        # 대기 중인 감사 로그를 이 DB에 기록한 뒤 테이블 삭제
+        audit_writer.flush()
         Base.metadata.drop_all(bind=engine)
+        engine.dispose()
 
 @pytest.fixture(scope="function")
 def client(test_db: Session) -> Generator[TestClient, None, None]:
@@ -60,7 +79,18 @@ def client(test_db: Session) -> Generator[TestClient, None, None]:
         finally:
             pass
     
+    # 같은 SQLite 파일을 aiosqlite 드라이버로 연결
+    # (TestClient는 요청마다 이벤트 루프가 달라질 수 있으므로 커넥션을 풀링하지 않음)
+    async_url = test_db.get_bind().url.set(drivername="sqlite+aiosqlite")
+    async_engine = create_async_engine(async_url, poolclass=NullPool)
+    TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+    
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+    
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     
     # TestClient에 app을 직접 전달
     test_client = TestClient(app)
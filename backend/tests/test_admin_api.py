@@ -129,6 +129,410 @@ def test_bulk_create_products(client: TestClient, test_db: Session, sample_categ
     data = response.json()
     assert len(data) >= 5
 
+def test_bulk_update_products(client: TestClient, test_db: Session, sample_product: SafetyProduct):
+    """제품 일괄 수정 테스트 (존재하지 않는 ID는 제외, 감사 로그 기록)"""
+    from core.audit_writer import writer as audit_writer
+    from models.audit import AuditAction, AuditLog
+
+    payload = {
+        "product_ids": [sample_product.id, sample_product.id, 99999],
+        "updates": {"price": 12345, "is_featured": True, "name": "무시됨"}
+    }
+    response = client.put("/api/admin/products/bulk", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["updated_count"] == 1
+    assert data["updated_ids"] == [sample_product.id]
+    # 감사 로그는 백그라운드 기록기가 모아서 INSERT
+    audit_writer.flush()
+
+    test_db.expire_all()
+    product = test_db.get(SafetyProduct, sample_product.id)
+    assert product.price == 12345
+    assert product.is_featured == 1
+    assert product.name == "테스트 안전모"
+    assert test_db.query(AuditLog).filter(AuditLog.action == AuditAction.BULK_UPDATE).count() == 1
+
+    response = client.put("/api/admin/products/bulk", json={"product_ids": [sample_product.id], "updates": {"category_id": 99999}})
+    assert response.status_code == 400
+
+def test_audit_writer_retries_failed_rows(tmp_path, monkeypatch):
+    """감사 로그 기록 실패 테스트 (일괄 INSERT 실패 시 한 건씩 기록, 실패한 행은 재시도 후 포기)"""
+    from datetime import datetime, timezone
+    from sqlalchemy import create_engine, func, select
+    from core import audit_writer as audit_writer_module
+    from models.audit import AuditAction, AuditEntityType, AuditLog
+
+    monkeypatch.setattr(audit_writer_module, "RETRY_BASE_DELAY", 0)
+    engine = create_engine(f"sqlite:///{tmp_path / 'audit.db'}")
+    writer = audit_writer_module.AuditWriter(flush_interval=3600)
+
+    def row(entity_id, action=AuditAction.UPDATE):
+        return {"entity_type": AuditEntityType.PRODUCT, "entity_id": entity_id, "action": action,
+                "created_at": datetime.now(timezone.utc)}
+
+    def count():
+        with engine.connect() as connection:
+            return connection.execute(select(func.count()).select_from(AuditLog)).scalar()
+
+    # 테이블이 없으면 재시도 대기
+    writer.enqueue(engine, row(1))
+    assert writer.flush() == 0
+    AuditLog.__table__.create(engine)
+    # 잘못된 행(action 없음)이 섞여도 나머지는 기록
+    writer.enqueue(engine, row(2))
+    writer.enqueue(engine, row(3, action=None))
+    assert writer.flush() == 2 and count() == 2
+    for _ in range(audit_writer_module.MAX_ATTEMPTS):
+        writer.flush()
+    assert writer._due_retries(force=True) == [] and count() == 2
+    writer.shutdown()
+    engine.dispose()
+
+def test_bulk_delete_products(client: TestClient, test_db: Session, sample_category: SafetyCategory, tmp_path, monkeypatch):
+    """제품 일괄 삭제 테스트 (공유/기본 이미지는 남기고 나머지 파일 정리)"""
+    import json
+    from core.config import settings
+
+    upload_dir = tmp_path / "images"
+    upload_dir.mkdir()
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(upload_dir))
+    for name in ("a.jpg", "b.jpg", "shared.jpg", "default.jpg"):
+        (upload_dir / name).write_bytes(b"img")
+
+    def make(name, paths):
+        product = SafetyProduct(category_id=sample_category.id, name=name, file_name="x.jpg", file_path=json.dumps(paths))
+        test_db.add(product)
+        return product
+
+    first = make("삭제 1", ["/images/a.jpg", "/images/shared.jpg"])
+    second = make("삭제 2", ["/images/b.jpg", "/images/default.jpg"])
+    kept = make("유지", ["/images/shared.jpg"])
+    test_db.commit()
+    deleted_ids = [first.id, second.id]
+
+    response = client.request("DELETE", "/api/admin/products/bulk", json=deleted_ids + [99999])
+    assert response.status_code == 200
+    data = response.json()
+    assert data["deleted_count"] == 2
+    assert sorted(data["deleted_ids"]) == deleted_ids
+
+    test_db.expire_all()
+    assert test_db.query(SafetyProduct).filter(SafetyProduct.id.in_(deleted_ids)).count() == 0
+    assert test_db.get(SafetyProduct, kept.id) is not None
+    assert sorted(p.name for p in upload_dir.iterdir()) == ["default.jpg", "shared.jpg"]
+
+def test_import_products_from_excel(client: TestClient, test_db: Session, sample_category: SafetyCategory):
+    """엑셀 일괄 등록 테스트 (행 단위 오류 보고, 한 번에 INSERT)"""
+    import openpyxl
+    from io import BytesIO
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["제품명*", "모델번호*", "카테고리코드*", "설명", "규격", "가격", "재고상태", "추천제품", "표시순서"])
+    ws.append(["가져오기 1", "IMP-001", sample_category.code, "설명", None, 1000, "in_stock", "TRUE", 2])
+    ws.append(["가져오기 2", None, sample_category.code])
+    ws.append(["가져오기 3", "IMP-003", "unknown"])
+    ws.append(["가져오기 4", "IMP-004", sample_category.code, None, None, "비쌈"])
+    ws.append(["가져오기 5", "IMP-005", sample_category.code])
+    excel_file = BytesIO()
+    wb.save(excel_file)
+
+    response = client.post(
+        "/api/admin/products/import",
+        files={"file": ("products.xlsx", excel_file.getvalue(), "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success_count"] == 2
+    assert [error["row"] for error in data["details"]["errors"]] == [3, 4, 5]
+    assert [item["row"] for item in data["details"]["success"]] == [2, 6]
+
+    product = test_db.get(SafetyProduct, data["details"]["success"][0]["id"])
+    assert (product.name, product.price, product.is_featured, product.display_order) == ("가져오기 1", 1000, 1, 2)
+    assert product.file_path == '["/images/default.jpg"]'
+    assert [image.path for image in product.images] == ["/images/default.jpg"]
+
+
+def test_import_products_rejects_oversized_file(client: TestClient, monkeypatch):
+    """엑셀 일괄 등록 크기 제한 테스트 (EXCEL_MAX_UPLOAD_MB)"""
+    from core.config import settings
+
+    monkeypatch.setattr(settings, "EXCEL_MAX_UPLOAD_MB", 0)
+    response = client.post("/api/admin/products/import", files={"file": ("products.xlsx", b"x" * 10)})
+    assert response.status_code == 400
+
+def test_image_uploads_stream_to_disk(client: TestClient, sample_category: SafetyCategory, tmp_path, monkeypatch):
+    """이미지 업로드 테스트 (청크 저장, 형식/크기 제한, 실패 시 파일 정리)"""
+    import json
+    from core.config import settings
+
+    upload_dir = tmp_path / "images"
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(upload_dir))
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE", 1)
+    monkeypatch.setattr(settings, "IMAGE_VARIANTS_ENABLED", False)
+
+    response = client.post("/api/admin/upload-image", files={"file": ("photo.JPG", b"\xff\xd8" * 1000)})
+    assert response.status_code == 200
+    saved = upload_dir / response.json()["filename"]
+    assert response.json()["url"].endswith(".jpg") and saved.stat().st_size == 2000
+
+    assert client.post("/api/admin/upload-image", files={"file": ("doc.pdf", b"x")}).status_code == 400
+    too_large = b"x" * (1024 * 1024 + 1)
+    assert client.post("/api/admin/upload-image", files={"file": ("big.png", too_large)}).status_code == 400
+
+    # 폼 업로드 중 하나가 실패하면 먼저 저장한 파일도 지움
+    response = client.post(
+        "/api/admin/products/form",
+        data={"name": "폼 제품", "model_number": "FORM-1", "category_id": str(sample_category.id)},
+        files=[("images", ("a.png", b"png")), ("images", ("big.png", too_large))]
+    )
+    assert response.status_code == 400
+    assert sorted(p.name for p in upload_dir.iterdir()) == [saved.name]
+
+    response = client.post(
+        "/api/admin/products/form",
+        data={"name": "폼 제품", "model_number": "FORM-1", "category_id": str(sample_category.id)},
+        files=[("images", ("a.png", b"png")), ("images", ("b.webp", b"webp"))]
+    )
+    assert response.status_code == 200
+    paths = json.loads(response.json()["file_path"])
+    assert len(paths) == 2 and all((upload_dir / path.split("/")[-1]).exists() for path in paths)
+
+def test_bulk_upload_images_concurrently(client: TestClient, sample_category: SafetyCategory, tmp_path, monkeypatch):
+    """이미지 일괄 업로드 테스트 (동시 처리, 결과 순서 유지, 크기별 변형)"""
+    import json
+    from io import BytesIO
+    from PIL import Image
+    from core.config import settings
+
+    upload_dir = tmp_path / "images"
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(upload_dir))
+    monkeypatch.setattr(settings, "BULK_UPLOAD_CONCURRENCY", 2)
+
+    def png(width, height, color):
+        output = BytesIO()
+        Image.new("RGB", (width, height), color).save(output, format="PNG")
+        return output.getvalue()
+
+    colors = ["red", "green", "blue", "black"]
+    files = [("files", (f"photo{i}.png", png(800, 400, color))) for i, color in enumerate(colors)]
+    files += [("files", ("notes.txt", b"text")), ("files", ("broken.jpg", b"not an image"))]
+    response = client.post("/api/admin/images/bulk", files=files)
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["success_count"], data["error_count"]) == (4, 2)
+    assert [item["original_filename"] for item in data["results"]["success"]] == [f"photo{i}.png" for i in range(4)]
+    assert [error["filename"] for error in data["results"]["errors"]] == ["notes.txt", "broken.jpg"]
+
+    variants = data["results"]["success"][0]["variants"]
+    assert variants["thumb"] == data["results"]["success"][0]["thumbnail_url"]
+    sizes = {}
+    for name, url in variants.items():
+        with Image.open(upload_dir / url.split("/")[-1]) as image:
+            sizes[name] = (image.format, image.size)
+    assert sizes == {"thumb": ("WEBP", (200, 100)), "card": ("WEBP", (480, 240)), "detail": ("WEBP", (800, 400))}
+    # 실패한 파일은 남기지 않음 (원본 4개 + 변형 12개)
+    assert len(list(upload_dir.iterdir())) == 16
+
+    # 제품 응답에 변형 URL 포함
+    url = data["results"]["success"][0]["url"]
+    response = client.post("/api/admin/products", json={
+        "name": "변형 제품", "model_number": "VAR-1", "category_id": sample_category.id,
+        "file_name": url.split("/")[-1], "file_path": json.dumps([url])
+    })
+    assert response.status_code == 200
+    assert response.json()["image_variants"] == [{"original": url, **variants}]
+
+    # 변형이 꺼져 있어도 thumbnails=true면 썸네일 생성
+    monkeypatch.setattr(settings, "IMAGE_VARIANTS_ENABLED", False)
+    files = [("files", ("plain.png", png(300, 300, "white")))]
+    item = client.post("/api/admin/images/bulk", files=files).json()["results"]["success"][0]
+    assert "thumbnail_url" not in item
+    item = client.post("/api/admin/images/bulk", files=files, data={"thumbnails": "true"}).json()["results"]["success"][0]
+    assert (upload_dir / item["thumbnail_url"].split("/")[-1]).exists()
+
+def test_image_uploads_deduplicated(client: TestClient, test_db: Session, sample_category: SafetyCategory, tmp_path, monkeypatch):
+    """내용 주소 이미지 저장소 테스트 (같은 내용은 한 번만 저장, 참조와 업로드 임대가 모두 끝난 뒤 정리 작업이 삭제)"""
+    import hashlib
+    import json
+    from io import BytesIO
+    from PIL import Image
+    from core.config import settings
+    from crud import image_blob as image_blob_crud
+    from models.image_blob import ImageBlob
+
+    upload_dir = tmp_path / "images"
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(upload_dir))
+    output = BytesIO()
+    Image.new("RGB", (100, 100), "red").save(output, format="PNG")
+    content = output.getvalue()
+
+    urls = [client.post("/api/admin/upload-image", files={"file": (f"{name}.png", content)}).json()["url"]
+            for name in ("supplier", "copy")]
+    response = client.post("/api/admin/images/bulk", files=[("files", ("again.png", content))])
+    urls.append(response.json()["results"]["success"][0]["url"])
+    assert len(set(urls)) == 1 and urls[0].split("/")[-1].split(".")[0] == hashlib.sha256(content).hexdigest()
+    assert len(list(upload_dir.iterdir())) == 4  # 원본 1개 + 변형 3개
+
+    def blob():
+        test_db.expire_all()
+        return test_db.query(ImageBlob).filter(ImageBlob.path == urls[0]).first()
+
+    response = client.post(
+        "/api/admin/products/form",
+        data={"name": "공급사 사진", "model_number": "DUP-1", "category_id": str(sample_category.id)},
+        files=[("images", ("photo.png", content))]
+    )
+    product_id = response.json()["id"]
+    assert json.loads(response.json()["file_path"]) == [urls[0]]
+    copy_id = client.post(f"/api/admin/products/{product_id}/duplicate").json()["id"]
+    assert blob().ref_count == 2
+
+    # 복사본이 같은 파일을 참조하므로 원본 제품을 삭제해도 파일은 남음
+    assert client.delete(f"/api/admin/products/{product_id}").status_code == 200
+    assert blob().ref_count == 1 and len(list(upload_dir.iterdir())) == 4
+
+    assert client.delete(f"/api/admin/products/{copy_id}").status_code == 200
+    assert blob().ref_count == 0 and len(list(upload_dir.iterdir())) == 4
+
+    # 업로드 임대 중에는 참조가 없어도 정리하지 않음
+    assert image_blob_crud.collect_unreferenced(test_db) == 0
+    monkeypatch.setattr(settings, "IMAGE_UPLOAD_LEASE", 0)
+    assert client.post("/api/admin/upload-image", files={"file": ("again.png", content)}).json()["url"] == urls[0]
+    assert image_blob_crud.collect_unreferenced(test_db) == 1
+    assert blob() is None and list(upload_dir.iterdir()) == []
+
+def test_product_images_rows(client: TestClient, test_db: Session, sample_category: SafetyCategory, tmp_path, monkeypatch):
+    """product_images 테이블 동기화 테스트 (생성/수정/삭제, 목록·상세 응답, 대시보드 통계)"""
+    import json
+    from PIL import Image
+    from core.config import settings
+    from models.safety import ProductImage
+    from utils import product_images
+
+    upload_dir = tmp_path / "images"
+    upload_dir.mkdir()
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(upload_dir))
+    Image.new("RGB", (640, 480), "red").save(upload_dir / "front.png")
+
+    paths = ["/images/front.png", "/images/missing.png", "/static/images/legacy/front.jpg"]
+    response = client.post("/api/admin/products", json={
+        "name": "이미지 제품", "model_number": "IMG-1", "category_id": sample_category.id,
+        "file_name": "front.png", "file_path": json.dumps(paths)
+    })
+    product_id = response.json()["id"]
+    # 메타데이터는 커밋 후 백그라운드에서 채움
+    product_images.wait_for_metadata()
+    images = client.get(f"/api/products/{product_id}").json()["images"]
+    assert [(image["position"], image["path"], image["width"], image["height"]) for image in images] == [
+        (0, "/images/front.png", 640, 480), (1, "/images/missing.png", None, None),
+        (2, "/static/images/legacy/front.jpg", None, None)
+    ]
+    assert images[0]["bytes"] == (upload_dir / "front.png").stat().st_size
+    listed = next(item for item in client.get("/api/products").json() if item["id"] == product_id)
+    assert [image["path"] for image in listed["images"]] == paths
+    searched = next(item for item in client.get("/api/products/search", params={"q": "이미지 제품"}).json()
+                    if item["id"] == product_id)
+    assert [image["path"] for image in searched["images"]] == paths
+    advanced = client.post("/api/products/advanced-search", json={"search": "이미지 제품"}).json()["items"]
+    assert [image["path"] for image in next(item for item in advanced if item["id"] == product_id)["images"]] == paths
+    assert client.get("/api/admin/dashboard").json()["summary"]["missing_images"] == 0
+
+    response = client.put(f"/api/admin/products/{product_id}", json={"file_path": json.dumps(["/images/default.jpg"])})
+    assert response.status_code == 200
+    assert [image["path"] for image in response.json()["images"]] == ["/images/default.jpg"]
+    assert client.get("/api/admin/dashboard").json()["summary"]["missing_images"] == 1
+
+    assert client.delete(f"/api/admin/products/{product_id}").status_code == 200
+    assert test_db.query(ProductImage).filter(ProductImage.product_id == product_id).count() == 0
+
+def test_dashboard_stats_counters(client: TestClient, test_db: Session, sample_category: SafetyCategory, sample_product: SafetyProduct):
+    """대시보드 통계 카운터 테스트 (ORM/벌크/가져오기 경로의 증분 갱신이 전체 재계산과 일치)"""
+    import json
+    import openpyxl
+    from io import BytesIO
+    from utils import catalog_stats
+
+    other = SafetyCategory(name="보안경", code="safety_glasses", slug="safety_glasses", display_order=2)
+    test_db.add(other)
+    test_db.commit()
+
+    def dashboard():
+        data = client.get("/api/admin/dashboard").json()
+        return data["summary"], data["category_stats"]
+
+    def reconciled():
+        catalog_stats.refresh_categories(test_db)
+        test_db.commit()
+        return dashboard()
+
+    ids = [
+        client.post("/api/admin/products", json={
+            "name": f"통계 {i}", "model_number": f"ST-{i}", "category_id": sample_category.id, "is_featured": i == 0,
+            "stock_status": "out_of_stock" if i < 2 else "in_stock",
+            "file_name": "a.png", "file_path": json.dumps(["/images/a.png" if i < 1 else "/images/default.jpg"])
+        }).json()["id"]
+        for i in range(3)
+    ]
+    summary, categories = dashboard()
+    assert (summary["total_products"], summary["featured_products"], summary["out_of_stock"]) == (4, 2, 2)
+    assert summary["missing_images"] == 2 and summary["total_categories"] == 2
+    assert [(category["code"], category["count"]) for category in categories] == [(sample_category.code, 4), ("safety_glasses", 0)]
+    assert reconciled() == (summary, categories)
+
+    # 업로드 디렉토리 밖 경로(dummy_data의 /static/images/...)도 이미지로 셈
+    static_id = client.post("/api/admin/products", json={
+        "name": "정적 이미지", "model_number": "ST-S", "category_id": other.id,
+        "file_name": "s.jpg", "file_path": json.dumps(["/static/images/safety_glasses/s.jpg"])
+    }).json()["id"]
+    assert dashboard()[0]["missing_images"] == 2
+    assert reconciled()[0]["missing_images"] == 2
+    assert client.delete(f"/api/admin/products/{static_id}").status_code == 200
+
+    client.put(f"/api/admin/products/{ids[0]}", json={"category_id": other.id, "file_path": json.dumps(["/images/default.jpg"])})
+    client.put("/api/admin/products/bulk", json={"product_ids": ids[1:], "updates": {"stock_status": "in_stock", "is_featured": True}})
+    client.request("DELETE", "/api/admin/products/bulk", json=[ids[2]])
+    client.delete(f"/api/admin/products/{sample_product.id}")
+
+    wb = openpyxl.Workbook()
+    wb.active.append(["제품명*", "모델번호*", "카테고리코드*"])
+    wb.active.append(["가져오기", "IMP-1", "safety_glasses"])
+    excel_file = BytesIO()
+    wb.save(excel_file)
+    client.post("/api/admin/products/import", files={"file": ("products.xlsx", excel_file.getvalue())})
+
+    summary, categories = dashboard()
+    assert (summary["total_products"], summary["featured_products"], summary["out_of_stock"], summary["missing_images"]) == (3, 2, 1, 3)
+    assert [(category["code"], category["count"]) for category in categories] == [("safety_glasses", 2), (sample_category.code, 1)]
+    assert reconciled() == (summary, categories)
+
+def test_stats_reconcile_runs_once_per_lease(client: TestClient, test_db: Session, sample_product: SafetyProduct):
+    """전체 재계산은 임대를 잡은 한 곳에서만 실행 (임대 중인 다른 워커는 건너뜀)"""
+    from datetime import datetime, timezone
+    from sqlalchemy import update
+    from sqlalchemy.orm import sessionmaker
+    from models.stats import CategoryStats, MaintenanceLease
+    from utils import catalog_stats
+
+    session_factory = sessionmaker(bind=test_db.get_bind())
+
+    def corrupt():
+        test_db.execute(update(CategoryStats).values(product_count=99))
+        test_db.commit()
+
+    corrupt()
+    assert catalog_stats.reconcile(session_factory) == 1
+    corrupt()
+    assert catalog_stats.reconcile(session_factory) == 0
+    assert test_db.query(CategoryStats.product_count).scalar() == 99
+
+    # 임대가 끝나면 다시 실행
+    test_db.execute(update(MaintenanceLease).values(expires_at=datetime(2000, 1, 1, tzinfo=timezone.utc)))
+    test_db.commit()
+    assert catalog_stats.reconcile(session_factory) == 1
+    assert test_db.query(CategoryStats.product_count).scalar() == 1
+
 def test_update_product_stock_status(client: TestClient, sample_product: SafetyProduct):
     """재고 상태 변경 테스트"""
     update_data = {"stock_status": "out_of_stock"}
@@ -152,3 +556,231 @@ def test_toggle_featured_product(client: TestClient, sample_product: SafetyProdu
     assert response.status_code == 200
     data = response.json()
     assert data["is_featured"] is True
+
+def test_database_pool_status(client: TestClient):
+    """커넥션 풀 상태 조회 테스트"""
+    response = client.get("/api/admin/db/pool")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["config"]["pool_size"] >= 1
+    for key in ("sync", "async"):
+        assert data[key]["size"] == data["config"]["pool_size"]
+        assert data[key]["checkedout"] == 0
+        assert "wait_time_max_ms" in data[key]
+
+def test_category_cache_invalidated_on_write(client: TestClient, sample_category: SafetyCategory):
+    """카테고리 수정 시 공개 API 캐시 무효화 테스트"""
+    assert client.get("/api/categories/slug/safety_helmet").json()["name"] == "안전모"
+    
+    response = client.put(f"/api/admin/categories/{sample_category.id}", json={"name": "프리미엄 안전모"})
+    assert response.status_code == 200
+    assert client.get("/api/categories/slug/safety_helmet").json()["name"] == "프리미엄 안전모"
+    
+    client.delete(f"/api/admin/categories/{sample_category.id}")
+    assert client.get("/api/categories").json() == []
+
+def test_catalog_etag_changes_on_write(client: TestClient, test_db: Session, sample_product: SafetyProduct):
+    """공개 카탈로그 GET: 변경이 없으면 304, 관리자 수정 후에는 새 ETag"""
+    response = client.get("/api/products")
+    etag = response.headers["ETag"]
+    assert "max-age" in response.headers["Cache-Control"]
+    assert client.get("/api/products", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(
+        "/api/categories", headers={"If-Modified-Since": response.headers["Last-Modified"]}
+    ).status_code == 304
+    
+    response = client.put(f"/api/admin/products/{sample_product.id}", json={"price": 30000})
+    assert response.status_code == 200
+    response = client.get(f"/api/products/{sample_product.id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["price"] == 30000
+    assert response.headers["ETag"] != etag
+    
+    # 벌크 UPDATE도 버전 증가
+    etag = response.headers["ETag"]
+    test_db.query(SafetyProduct).update({SafetyProduct.price: 1})
+    test_db.commit()
+    assert client.get("/api/products", headers={"If-None-Match": etag}).status_code == 200
+
+@pytest.fixture(params=["memory", "redis"])
+def cache_backend(request):
+    """공유 응답 캐시 백엔드 (redis는 fakeredis로 대체)"""
+    from core.cache_backend import MemoryCacheBackend, RedisCacheBackend
+    from utils import response_cache
+    if request.param == "redis":
+        fakeredis = pytest.importorskip("fakeredis")
+        backend = RedisCacheBackend(fakeredis.FakeRedis(), prefix="test")
+    else:
+        backend = MemoryCacheBackend()
+    previous = response_cache.set_backend(backend)
+    yield backend
+    response_cache.set_backend(previous)
+
+def test_response_cache_tag_invalidation(client: TestClient, test_db: Session, sample_product: SafetyProduct, cache_backend):
+    """공유 응답 캐시: 캐시된 응답 재사용, 관리자 수정 시 태그 무효화"""
+    from sqlalchemy import text
+    assert client.get(f"/api/products/{sample_product.id}").json()["price"] == 25000
+    assert len(client.get("/api/products").json()) == 1
+    
+    # 세션 이벤트를 거치지 않는 직접 변경은 캐시에 반영되지 않음 (캐시에서 응답)
+    test_db.execute(text("UPDATE safety_products SET price = 1"))
+    test_db.commit()
+    assert client.get(f"/api/products/{sample_product.id}").json()["price"] == 25000
+    
+    # 관리자 API 수정 → 해당 제품 상세와 제품 목록 태그 무효화
+    response = client.put(f"/api/admin/products/{sample_product.id}", json={"price": 30000})
+    assert response.status_code == 200
+    assert client.get(f"/api/products/{sample_product.id}").json()["price"] == 30000
+    assert client.get("/api/products").json()[0]["price"] == 30000
+    
+    # 설정 변경 → settings 태그 무효화
+    client.get("/api/settings")
+    response = client.put("/api/admin/settings", json={"company_name": "보람안전물산"})
+    assert client.get("/api/settings").json()["company_name"] == "보람안전물산"
+
+
+def test_response_cache_invalidation_retries(monkeypatch):
+    """네트워크 백엔드 무효화는 전용 스레드에서 실행하고, 실패하면 다시 시도"""
+    from core.cache_backend import MemoryCacheBackend
+    from utils import response_cache
+
+    class FlakyBackend(MemoryCacheBackend):
+        blocking = True
+        failures = 2
+
+        def incr(self, key):
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("redis down")
+            return super().incr(key)
+
+    monkeypatch.setattr(response_cache, "_INVALIDATE_RETRY_DELAY", 0.01)
+    backend = FlakyBackend()
+    previous = response_cache.set_backend(backend)
+    try:
+        response_cache.invalidate_tags([response_cache.TAG_PRODUCTS])
+        response_cache.wait_for_invalidations()
+        # 첫 실패로 이 워커의 캐시 조회는 쉬는 중이어도 무효화는 계속 시도
+        response_cache.invalidate_tags([response_cache.TAG_PRODUCTS])
+        response_cache.wait_for_invalidations()
+        assert backend.failures == 0
+        assert backend.mget(["tag:" + response_cache.TAG_PRODUCTS]) == [b"2"]
+    finally:
+        response_cache.set_backend(previous)
+
+def test_export_products_streaming_formats(client: TestClient, sample_product: SafetyProduct):
+    """제품 내보내기 형식별 스트리밍 테스트 (xlsx / csv / ndjson)"""
+    import csv
+    import json
+    import openpyxl
+    from io import BytesIO, StringIO
+
+    response = client.get("/api/admin/excel/export")
+    assert response.status_code == 200
+    worksheet = openpyxl.load_workbook(BytesIO(response.content)).active
+    rows = list(worksheet.iter_rows(values_only=True))
+    assert rows[0][:4] == ("ID", "카테고리코드", "카테고리명", "제품명")
+    assert rows[1][3] == sample_product.name
+    assert worksheet.column_dimensions["D"].width == len(sample_product.name) + 2
+
+    response = client.get("/api/admin/excel/export", params={"format": "csv"})
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(StringIO(response.content.decode("utf-8-sig"))))
+    assert rows[0][0] == "ID" and rows[1][3] == sample_product.name
+
+    response = client.get("/api/admin/excel/export", params={"format": "ndjson", "category_code": "unknown"})
+    assert response.content == b""
+    response = client.get("/api/admin/excel/export", params={"format": "ndjson"})
+    item = json.loads(response.content.splitlines()[0])
+    assert (item["제품명"], item["추천제품"]) == (sample_product.name, "예")
+
+    assert client.get("/api/admin/excel/export", params={"format": "pdf"}).status_code == 422
+
+
+def _wait_for_job(client: TestClient, job_id: str, timeout: float = 10) -> dict:
+    import time
+
+    deadline = time.monotonic() + timeout
+    while True:
+        data = client.get(f"/api/admin/jobs/{job_id}").json()
+        if data["status"] in ("SUCCEEDED", "FAILED") or time.monotonic() > deadline:
+            return data
+        time.sleep(0.05)
+
+
+def test_excel_background_jobs(client: TestClient, test_db: Session, sample_product: SafetyProduct, tmp_path, monkeypatch):
+    """엑셀 가져오기/내보내기 백그라운드 작업 테스트"""
+    import openpyxl
+    from io import BytesIO
+    from core.config import settings
+
+    monkeypatch.setattr(settings, "JOB_DIR", str(tmp_path / "jobs"))
+
+    # 내보내기: 작업 ID 반환 후 완료되면 파일 다운로드
+    response = client.get("/api/admin/excel/export", params={"background": "true"})
+    assert response.status_code == 202
+    job = _wait_for_job(client, response.json()["job_id"])
+    assert job["status"] == "SUCCEEDED"
+    download = client.get(job["download_url"])
+    assert download.status_code == 200
+    rows = list(openpyxl.load_workbook(BytesIO(download.content)).active.iter_rows(values_only=True))
+    assert rows[1][3] == sample_product.name
+
+    # 가져오기: 처리 행 수와 행 단위 오류 기록
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["카테고리코드", "제품명", "가격"])
+    ws.append(["safety_helmet", "백그라운드 제품", 1000])
+    ws.append(["unknown", "잘못된 제품", 1000])
+    excel_file = BytesIO()
+    wb.save(excel_file)
+
+    response = client.post(
+        "/api/admin/excel/import",
+        files={"file": ("products.xlsx", excel_file.getvalue())},
+        data={"background": "true"}
+    )
+    assert response.status_code == 202
+    job = _wait_for_job(client, response.json()["job_id"])
+    assert job["status"] == "SUCCEEDED"
+    assert (job["processed_rows"], job["error_count"]) == (2, 1)
+    assert job["errors"][0]["row"] == 3
+    assert job["result"]["success_count"] == 1
+    assert client.get(f"/api/admin/jobs/{job['id']}/download").status_code == 409
+    assert client.get("/api/admin/jobs/unknown").status_code == 404
+
+def test_sweep_jobs(client: TestClient, test_db: Session, tmp_path, monkeypatch):
+    """중단된 작업은 FAILED, 보존 기간이 지난 작업 행과 작업 파일은 삭제"""
+    import os
+    from datetime import datetime, timedelta, timezone
+    from sqlalchemy.orm import sessionmaker
+    from core.config import settings
+    from core.jobs import job_dir, sweep_jobs
+    from models.job import Job, JobKind, JobStatus
+
+    monkeypatch.setattr(settings, "JOB_DIR", str(tmp_path / "jobs"))
+    now = datetime.now(timezone.utc)
+    old = now - timedelta(seconds=settings.JOB_RETENTION + 60)
+    export_file = job_dir() / "expired.xlsx"
+    export_file.write_bytes(b"x")
+    stray_file = job_dir() / "upload_stray.xlsx"
+    stray_file.write_bytes(b"x")
+    os.utime(stray_file, (old.timestamp(), old.timestamp()))
+    recent_file = job_dir() / "upload_recent.xlsx"
+    recent_file.write_bytes(b"x")
+    test_db.add_all([
+        Job(id="orphan", kind=JobKind.PRODUCT_IMPORT, status=JobStatus.RUNNING,
+            heartbeat_at=now - timedelta(seconds=settings.JOB_STALE_AFTER + 60)),
+        Job(id="alive", kind=JobKind.PRODUCT_IMPORT, status=JobStatus.RUNNING, heartbeat_at=now),
+        Job(id="expired", kind=JobKind.PRODUCT_EXPORT, status=JobStatus.SUCCEEDED, finished_at=old,
+            file_path=str(export_file), file_name="expired.xlsx"),
+        Job(id="recent", kind=JobKind.PRODUCT_EXPORT, status=JobStatus.SUCCEEDED, finished_at=now),
+    ])
+    test_db.commit()
+
+    assert sweep_jobs(sessionmaker(bind=test_db.get_bind())) == (1, 1)
+    test_db.expire_all()
+    statuses = {job.id: job.status for job in test_db.query(Job)}
+    assert statuses == {"orphan": JobStatus.FAILED, "alive": JobStatus.RUNNING, "recent": JobStatus.SUCCEEDED}
+    assert not export_file.exists() and not stray_file.exists() and recent_file.exists()
+
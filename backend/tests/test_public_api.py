@@ -4,6 +4,7 @@ GET 엔드포인트 테스트 (카테고리, 제품 조회)
 """
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from models.safety import SafetyCategory, SafetyProduct
 
@@ -115,6 +116,29 @@ def test_search_products(client: TestClient, sample_product: SafetyProduct):
     assert isinstance(data, list)
     assert len(data) >= 1
 
+def test_search_multi_term_relevance(client: TestClient, test_db: Session, sample_category: SafetyCategory, sample_product: SafetyProduct):
+    """여러 단어 검색은 모든 단어를 포함한 제품만, 제품명 일치가 설명 일치보다 먼저"""
+    for name, description in (("방진 마스크", "안전모와 함께 착용"), ("안전모 턱끈", "50%_할인 부품")):
+        test_db.add(SafetyProduct(
+            category_id=sample_category.id, name=name, model_number=f"REL-{len(name)}",
+            description=description, file_name="rel.jpg", file_path="/images/rel.jpg"
+        ))
+    test_db.commit()
+    
+    names = [item["name"] for item in client.get("/api/products/search", params={"q": "안전모"}).json()]
+    assert names[-1] == "방진 마스크"
+    assert set(names[:2]) == {"테스트 안전모", "안전모 턱끈"}
+    
+    assert [item["name"] for item in client.get("/api/products/search", params={"q": "안전모 테스트"}).json()] == ["테스트 안전모"]
+    # LIKE 와일드카드는 문자 그대로 검색
+    assert [item["name"] for item in client.get("/api/products", params={"search": "50%_"}).json()] == ["안전모 턱끈"]
+    assert client.get("/api/products", params={"search": "5%"}).json() == []
+    
+    data = client.post("/api/products/advanced-search", json={"search": "안전모", "sort_by": "relevance", "limit": 2}).json()
+    assert data["total"] == 3
+    assert data["next_cursor"] is None
+    assert client.post("/api/products/advanced-search", json={"search": "안전모", "sort_by": "relevance", "cursor": "abc"}).status_code == 400
+
 def test_pagination(client: TestClient, test_db: Session, sample_category: SafetyCategory):
     """페이지네이션 테스트"""
     # 10개의 제품 생성
@@ -143,3 +167,264 @@ def test_pagination(client: TestClient, test_db: Session, sample_category: Safet
     assert response.status_code == 200
     data = response.json()
     assert len(data) == 5
+
+def test_cursor_pagination(client: TestClient, test_db: Session, sample_category: SafetyCategory):
+    """커서 페이지네이션: 동일한 정렬 값/NULL이 있어도 중복·누락 없이 순회"""
+    for i in range(7):
+        test_db.add(SafetyProduct(
+            category_id=sample_category.id,
+            name="동일 제품명" if i < 4 else f"제품 {i}",
+            model_number=f"CUR-{i:03d}",
+            price=None if i % 3 == 0 else 1000 * (i % 2),
+            is_featured=i % 2,
+            file_name=f"cur_{i}.jpg",
+            file_path=f"/images/cur_{i}.jpg",
+            stock_status="in_stock"
+        ))
+    test_db.commit()
+    
+    expected = [item["id"] for item in client.get("/api/products?limit=100").json()]
+    seen, cursor = [], ""
+    while cursor is not None:
+        response = client.get("/api/products", params={"limit": 3, "cursor": cursor})
+        assert response.status_code == 200
+        seen += [item["id"] for item in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+    assert seen == expected
+    
+    for sort_order in ("asc", "desc"):
+        body = {"sort_by": "price", "sort_order": sort_order, "limit": 2, "cursor": ""}
+        seen = []
+        while True:
+            data = client.post("/api/products/advanced-search", json=body).json()
+            assert data["total"] == 7
+            seen += [item["id"] for item in data["items"]]
+            if not data["next_cursor"]:
+                break
+            body["cursor"] = data["next_cursor"]
+        assert sorted(seen) == sorted(expected)
+        assert len(seen) == len(set(seen))
+    
+    # 정렬 조건이 다른 커서 / 손상된 커서
+    assert client.post("/api/products/advanced-search", json={"sort_by": "name", "cursor": body["cursor"]}).status_code == 400
+    assert client.get("/api/products", params={"cursor": "not-a-cursor"}).status_code == 400
+
+def test_advanced_search_count_modes(client: TestClient, test_db: Session, sample_category: SafetyCategory):
+    """전체 개수 계산 방식(window/exact/estimated)과 관계없이 같은 total을 반환"""
+    for i in range(5):
+        test_db.add(SafetyProduct(
+            category_id=sample_category.id,
+            name=f"카운트 제품 {i}",
+            model_number=f"CNT-{i:03d}",
+            price=1000 * i,
+            file_name=f"cnt_{i}.jpg",
+            file_path=f"/images/cnt_{i}.jpg",
+            stock_status="in_stock"
+        ))
+    test_db.commit()
+    
+    for count_mode in ("window", "exact", "estimated"):
+        for skip, expected_items in ((0, 2), (4, 1), (10, 0)):
+            data = client.post("/api/products/advanced-search", json={
+                "search": "카운트", "count_mode": count_mode, "skip": skip, "limit": 2
+            }).json()
+            assert data["total"] == 5
+            assert len(data["items"]) == expected_items
+            assert data["total_is_estimate"] is False
+    
+    # 커서 페이지에서도 전체 개수 유지
+    data = client.post("/api/products/advanced-search", json={"search": "카운트", "limit": 2, "cursor": ""}).json()
+    data = client.post("/api/products/advanced-search", json={"search": "카운트", "limit": 2, "cursor": data["next_cursor"]}).json()
+    assert data["total"] == 5
+    assert data["total_pages"] == 3
+
+def test_advanced_search(client: TestClient, sample_product: SafetyProduct):
+    """고급 검색 (비동기 세션)"""
+    response = client.post("/api/products/advanced-search", json={"search": "안전모", "limit": 10})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1
+    assert data["items"][0]["category_code"] == "safety_helmet"
+    assert data["total_pages"] == 1
+
+def test_search_suggestions(client: TestClient, sample_product: SafetyProduct):
+    """검색 제안"""
+    response = client.get("/api/search/suggestions?q=안전")
+    assert response.status_code == 200
+    # 카테고리명(단어 시작 위치 일치)이 제품명 중간 단어 일치보다 먼저
+    assert response.json()["suggestions"] == ["안전모", "테스트 안전모"]
+
+def test_search_suggestions_prefix_index(client: TestClient, test_db: Session, sample_category: SafetyCategory, sample_product: SafetyProduct):
+    """자동완성: 입력 중인 한글/초성/모델번호 접두어, 커밋된 변경 즉시 반영"""
+    def suggest(q):
+        return client.get("/api/search/suggestions", params={"q": q, "limit": 10}).json()["suggestions"]
+    
+    assert "테스트 안전모" in suggest("테스")
+    assert "테스트 안전모" in suggest("안ㅈ")  # 입력 중인 음절
+    assert "테스트 안전모" in suggest("ㅌㅅㅌ")  # 초성
+    assert suggest("test-0") == ["TEST-001"]
+    
+    product = SafetyProduct(
+        category_id=sample_category.id, name="방한 장갑", model_number="GLV-01",
+        file_name="glv.jpg", file_path="/images/glv.jpg"
+    )
+    test_db.add(product)
+    test_db.commit()
+    assert suggest("방화") == []
+    assert suggest("방하") == ["방한 장갑"]
+    
+    test_db.delete(product)
+    test_db.commit()
+    assert suggest("방하") == []
+
+def test_categories_served_from_cache(client: TestClient, test_db: Session, sample_category: SafetyCategory):
+    """카테고리 목록은 메모리 캐시에서 반환"""
+    assert len(client.get("/api/categories").json()) == 1
+    
+    # 세션 이벤트를 거치지 않는 직접 변경은 카탈로그 버전이 바뀌지 않으므로 캐시에서 응답
+    test_db.execute(text(
+        "INSERT INTO safety_categories (name, code, slug, display_order) "
+        "VALUES ('보안경', 'safety_glasses', 'safety_glasses', 2)"
+    ))
+    test_db.commit()
+    assert len(client.get("/api/categories").json()) == 1
+    assert client.get("/api/categories/slug/safety_glasses").status_code == 404
+
+def test_suggestion_index_syncs_bulk_changes(client: TestClient, test_db: Session, sample_category: SafetyCategory, sample_product: SafetyProduct):
+    """자동완성: 개별 행을 알 수 없는 벌크 INSERT/DELETE도 전체 재구성 없이 따라잡기로 반영"""
+    from sqlalchemy import delete, insert
+    from utils.suggestion_index import _index
+
+    def suggest(q):
+        return client.get("/api/search/suggestions", params={"q": q, "limit": 10}).json()["suggestions"]
+
+    assert suggest("테스트") == ["테스트 안전모"]
+    built_at = _index._built_at
+    test_db.execute(insert(SafetyProduct).values(
+        category_id=sample_category.id, name="방한 장갑", model_number="GLV-01",
+        file_name="glv.jpg", file_path="/images/glv.jpg"
+    ))
+    test_db.execute(delete(SafetyProduct).where(SafetyProduct.id == sample_product.id))
+    test_db.commit()
+    assert suggest("방하") == ["방한 장갑"]
+    assert suggest("테스트") == []
+    assert _index._built_at == built_at
+
+def test_suggestion_changes_discarded_on_rollback(test_db: Session, sample_product: SafetyProduct):
+    """자동완성 인덱스 변경 추적 (전체 롤백은 변경을 버리고, SAVEPOINT만 롤백되면 커밋 후 따라잡기)"""
+    from utils.suggestion_index import _PENDING_KEY
+
+    sample_product.name = "롤백될 이름"
+    test_db.flush()
+    test_db.rollback()
+    assert _PENDING_KEY not in test_db.info
+
+    savepoint = test_db.begin_nested()
+    sample_product.name = "SAVEPOINT 이름"
+    test_db.flush()
+    savepoint.rollback()
+    assert test_db.info[_PENDING_KEY] == {"sync": True}
+    test_db.rollback()
+
+def test_local_caches_follow_catalog_version(client: TestClient, test_db: Session, sample_product: SafetyProduct):
+    """다른 워커의 변경 (버전 증가) 후에는 워커별 캐시도 새 ETag와 같은 데이터로 응답"""
+    from utils import catalog_version
+
+    response = client.get("/api/search/suggestions", params={"q": "테스트"})
+    assert response.json()["suggestions"] == ["테스트 안전모"]
+    etag = response.headers["ETag"]
+    assert client.get("/api/categories").json()[0]["name"] == "안전모"
+
+    # 다른 워커가 커밋한 것처럼 데이터와 버전만 바꾸고 (ORM 수정처럼 updated_at 갱신), 이 워커의 버전 캐시 만료
+    test_db.execute(text("UPDATE safety_products SET name = '방진 마스크', updated_at = CURRENT_TIMESTAMP"))
+    test_db.execute(text("UPDATE safety_categories SET name = '보호구'"))
+    test_db.execute(text("UPDATE catalog_state SET version = version + 1"))
+    test_db.commit()
+    catalog_version.invalidate()
+
+    response = client.get("/api/search/suggestions", params={"q": "방진"}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["suggestions"] == ["방진 마스크"]
+    assert client.get("/api/categories").json()[0]["name"] == "보호구"
+
+def test_category_counts(client: TestClient, test_db: Session, sample_product: SafetyProduct):
+    """카테고리 목록에 제품 수 집계 포함 - 제품 변경 커밋 후 캐시 무효화 (image_count 컬럼 값은 그대로)"""
+    def counts():
+        category = client.get("/api/categories").json()[0]
+        return category["product_count"], category["featured_count"], category["in_stock_count"], category["image_count"]
+
+    assert counts() == (1, 1, 1, 5)
+
+    sample_product.stock_status = "out_of_stock"
+    test_db.commit()
+    assert counts() == (1, 1, 0, 5)
+
+    test_db.delete(sample_product)
+    test_db.commit()
+    assert counts() == (0, 0, 0, 5)
+
+def test_get_settings_defaults_without_insert(client: TestClient, test_db: Session):
+    """설정 행이 없으면 기본값을 반환하고 INSERT 하지 않음"""
+    from models.settings import SiteSettings
+    
+    response = client.get("/api/settings")
+    assert response.status_code == 200
+    assert response.json()["company_name"] == "보람안전"
+    assert test_db.query(SiteSettings).count() == 0
+
+def test_get_settings_etag(client: TestClient, test_db: Session):
+    """설정 ETag / 304 및 변경 시 스냅샷 갱신"""
+    from crud import settings as settings_crud
+    from schemas.settings import SiteSettingsUpdate
+    
+    response = client.get("/api/settings")
+    etag = response.headers["etag"]
+    response = client.get("/api/settings", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    
+    settings_crud.update_settings(test_db, SiteSettingsUpdate(company_name="보람안전물산"))
+    response = client.get("/api/settings", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["company_name"] == "보람안전물산"
+    assert response.headers["etag"] != etag
+
+def test_image_resize_cache(client: TestClient, tmp_path, monkeypatch):
+    """이미지 즉석 리사이즈 (?w=&h=&fmt=), 디스크 캐시 및 크기 상한 정리"""
+    from io import BytesIO
+    from PIL import Image
+    from core.config import settings
+    from main import app
+    from utils.image_resize import ResizeCache
+    
+    upload_dir = tmp_path / "images"
+    upload_dir.mkdir()
+    Image.new("RGB", (800, 400), "red").save(upload_dir / "photo.png")
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(upload_dir))
+    mount = next(route for route in app.routes if getattr(route, "name", None) == "images")
+    cache = ResizeCache(str(tmp_path / "cache"), 10 * 1024 * 1024)
+    monkeypatch.setattr(mount.app, "_cache", cache)
+    
+    response = client.get("/images/photo.png?w=200&fmt=webp")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/webp"
+    assert "max-age" in response.headers["cache-control"]
+    with Image.open(BytesIO(response.content)) as image:
+        assert image.size == (200, 100)
+    
+    # 두 번째 요청은 캐시 파일을 그대로 서빙 (ETag 재검증 포함)
+    assert client.get("/images/photo.png?w=200&fmt=webp").content == response.content
+    etag = response.headers["etag"]
+    assert client.get("/images/photo.png?w=200&fmt=webp", headers={"If-None-Match": etag}).status_code == 304
+    with Image.open(BytesIO(client.get("/images/photo.png?h=50").content)) as image:
+        assert (image.format, image.size) == ("PNG", (100, 50))
+    assert len(cache._files()) == 2
+    
+    assert client.get("/images/photo.png?w=0").status_code == 400
+    assert client.get("/images/photo.png?w=100&fmt=gif").status_code == 400
+    assert client.get("/images/missing.png?w=100").status_code == 404
+    
+    # 상한을 넘으면 오래 사용하지 않은 파일부터 삭제 (방금 만든 파일은 유지)
+    cache.max_bytes = 1
+    assert client.get("/images/photo.png?w=300").status_code == 200
+    assert [entry.suffix for entry in cache._files()] == [".png"] and len(cache._files()) == 1
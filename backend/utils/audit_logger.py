@@ -1,6 +1,7 @@
 """
 Audit Log 헬퍼 함수
 제품/카테고리 변경 시 자동으로 Audit Log를 기록하는 유틸리티
+기록은 core.audit_writer 큐에 넣고 바로 반환합니다 (백그라운드에서 모아서 INSERT, 관리자 라우트에서 await).
 """
 from sqlalchemy.orm import Session
 from typing import Optional, Any
@@ -10,14 +11,14 @@ from crud import audit as audit_crud
 from models.audit import AuditAction, AuditEntityType
 
 
-def log_product_create(
+async def log_product_create(
     db: Session,
     product_id: int,
     product_data: dict,
     request: Optional[Request] = None
 ):
     """제품 생성 로그"""
-    audit_crud.create_audit_log(
+    await audit_crud.enqueue_audit_log(
         db=db,
         entity_type=AuditEntityType.PRODUCT,
         entity_id=product_id,
@@ -29,7 +30,7 @@ def log_product_create(
     )
 
 
-def log_product_update(
+async def log_product_update(
     db: Session,
     product_id: int,
     old_data: dict,
@@ -39,7 +40,7 @@ def log_product_update(
     """제품 수정 로그"""
     changes_summary = audit_crud.generate_changes_summary(old_data, new_data)
     
-    audit_crud.create_audit_log(
+    await audit_crud.enqueue_audit_log(
         db=db,
         entity_type=AuditEntityType.PRODUCT,
         entity_id=product_id,
@@ -52,14 +53,14 @@ def log_product_update(
     )
 
 
-def log_product_delete(
+async def log_product_delete(
     db: Session,
     product_id: int,
     product_data: dict,
     request: Optional[Request] = None
 ):
     """제품 삭제 로그"""
-    audit_crud.create_audit_log(
+    await audit_crud.enqueue_audit_log(
         db=db,
         entity_type=AuditEntityType.PRODUCT,
         entity_id=product_id,
@@ -71,7 +72,7 @@ def log_product_delete(
     )
 
 
-def log_bulk_update(
+async def log_bulk_update(
     db: Session,
     entity_type: AuditEntityType,
     count: int,
@@ -79,7 +80,7 @@ def log_bulk_update(
     request: Optional[Request] = None
 ):
     """대량 수정 로그"""
-    audit_crud.create_audit_log(
+    await audit_crud.enqueue_audit_log(
         db=db,
         entity_type=entity_type,
         entity_id=None,
@@ -90,7 +91,7 @@ def log_bulk_update(
     )
 
 
-def log_bulk_delete(
+async def log_bulk_delete(
     db: Session,
     entity_type: AuditEntityType,
     count: int,
@@ -98,7 +99,7 @@ def log_bulk_delete(
     request: Optional[Request] = None
 ):
     """대량 삭제 로그"""
-    audit_crud.create_audit_log(
+    await audit_crud.enqueue_audit_log(
         db=db,
         entity_type=entity_type,
         entity_id=None,
@@ -109,14 +110,14 @@ def log_bulk_delete(
     )
 
 
-def log_category_create(
+async def log_category_create(
     db: Session,
     category_id: int,
     category_data: dict,
     request: Optional[Request] = None
 ):
     """카테고리 생성 로그"""
-    audit_crud.create_audit_log(
+    await audit_crud.enqueue_audit_log(
         db=db,
         entity_type=AuditEntityType.CATEGORY,
         entity_id=category_id,
@@ -128,7 +129,7 @@ def log_category_create(
     )
 
 
-def log_category_update(
+async def log_category_update(
     db: Session,
     category_id: int,
     old_data: dict,
@@ -138,7 +139,7 @@ def log_category_update(
     """카테고리 수정 로그"""
     changes_summary = audit_crud.generate_changes_summary(old_data, new_data)
     
-    audit_crud.create_audit_log(
+    await audit_crud.enqueue_audit_log(
         db=db,
         entity_type=AuditEntityType.CATEGORY,
         entity_id=category_id,
@@ -151,14 +152,14 @@ def log_category_update(
     )
 
 
-def log_category_delete(
+async def log_category_delete(
     db: Session,
     category_id: int,
     category_data: dict,
     request: Optional[Request] = None
 ):
     """카테고리 삭제 로그"""
-    audit_crud.create_audit_log(
+    await audit_crud.enqueue_audit_log(
         db=db,
         entity_type=AuditEntityType.CATEGORY,
         entity_id=category_id,
@@ -0,0 +1,296 @@
+"""
+대시보드 통계 (category_stats)
+관리자 대시보드와 공개 카테고리 목록(배지)이 매번 제품 테이블을 집계하지 않도록 카테고리별 카운터를 유지합니다.
+
+- ORM 변경(add/수정/delete)은 flush 직후 변경 이력으로 카운터 증감분을 계산해 같은 트랜잭션에서 반영합니다.
+- 벌크 UPDATE/DELETE와 엑셀 가져오기는 영향받은 카테고리만 refresh_categories로 다시 집계합니다.
+- 그 밖의 경로(직접 SQL, 스크립트 등)로 생긴 차이는 STATS_RECONCILE_INTERVAL마다 전체 재계산으로 맞춥니다.
+  재계산은 maintenance_leases 임대를 잡은 워커 한 곳에서만 실행합니다 (나머지 워커는 건너뜀).
+- 공개 카테고리 API는 응답을 만들 때 카운터를 함께 읽습니다 (with_counts). 재계산으로 카운터만 바뀌어도
+  카탈로그 버전을 올리므로 모든 워커의 카테고리 응답 캐시가 새 값으로 바뀝니다.
+"""
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, exists, func, insert, inspect, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+from core.logger import get_logger
+from models.safety import SafetyCategory, SafetyProduct
+from models.stats import CategoryStats, MaintenanceLease
+from utils import catalog_version, image_files
+
+logger = get_logger(__name__)
+
+COUNTER_COLUMNS = ("product_count", "featured_count", "in_stock_count", "out_of_stock_count", "missing_image_count")
+IN_STOCK = "in_stock"
+OUT_OF_STOCK = "out_of_stock"
+# 카운터에 영향을 주는 제품 컬럼
+TRACKED_ATTRIBUTES = ("category_id", "is_featured", "stock_status", "file_path")
+
+Counters = Tuple[int, int, int, int, int]
+# 공개 카테고리 응답에 포함하는 카운터
+PUBLIC_COLUMNS = ("product_count", "featured_count", "in_stock_count")
+# 재집계 시 한 번에 읽는 제품 행 수
+STATS_BATCH_SIZE = 1000
+# 전체 재계산 실행 임대 이름 / 최소 임대 시간 (초, 시작 시 한 번만 재계산할 때 동시에 뜬 워커끼리 중복 방지)
+RECONCILE_LEASE = "category_stats_reconcile"
+RECONCILE_LEASE_MIN = 60
+
+
+def _has_image(file_path: Optional[str]) -> bool:
+    """
+    기본 이미지(DEFAULT_IMAGE_NAMES)가 아닌 경로가 하나라도 있는지 - 증감 계산과 재집계가 같은 기준을 씀.
+    비어 있거나 기본 이미지뿐일 때만 이미지 없음으로 보며, /images/ 밖 경로(/static/images/...)도 이미지로 셉니다.
+    """
+    return any(not image_files.is_default_image(path) for path in image_files.parse_stored_paths(file_path))
+
+
+def _contribution(is_featured: Any, stock_status: Optional[str], file_path: Optional[str]) -> Counters:
+    """제품 하나가 카운터에 더하는 값"""
+    return (
+        1,
+        1 if is_featured else 0,
+        1 if stock_status == IN_STOCK else 0,
+        1 if stock_status == OUT_OF_STOCK else 0,
+        0 if _has_image(file_path) else 1,
+    )
+
+
+def _aggregate(connection, category_ids: Optional[List[int]] = None) -> Dict[int, List[int]]:
+    """
+    카테고리별 카운터 재집계. flush 증감분과 기준이 어긋나지 않도록 SQL 집계 대신
+    제품 행을 나눠 읽으며 _contribution을 더합니다.
+    """
+    stmt = select(SafetyProduct.category_id, *[getattr(SafetyProduct, key) for key in TRACKED_ATTRIBUTES[1:]])
+    if category_ids is not None:
+        stmt = stmt.where(SafetyProduct.category_id.in_(category_ids))
+    counts: Dict[int, List[int]] = defaultdict(lambda: [0] * len(COUNTER_COLUMNS))
+    for category_id, *values in connection.execute(stmt.execution_options(yield_per=STATS_BATCH_SIZE)):
+        for index, value in enumerate(_contribution(*values)):
+            counts[category_id][index] += value
+    return counts
+
+
+def ensure_table(bind) -> None:
+    """
+    category_stats / maintenance_leases 테이블 생성 (main.py init_tables).
+    재계산으로 다시 채울 수 있는 집계이므로 이전 버전 테이블에 컬럼이 모자라면 다시 만듭니다.
+    """
+    MaintenanceLease.__table__.create(bind=bind, checkfirst=True)
+    table = CategoryStats.__table__
+    inspector = inspect(bind)
+    if inspector.has_table(table.name):
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        if {column.name for column in table.columns} <= existing:
+            return
+        logger.info("category_stats 컬럼 변경 - 테이블을 다시 만듭니다 (시작 시 재계산으로 채움)")
+        table.drop(bind=bind)
+    table.create(bind=bind)
+
+
+def _write(connection, category_id: int, values: Dict[str, int], increment: bool = False):
+    """카테고리 행 갱신 (increment면 증감, 행이 없으면 생성)"""
+    assignments = {
+        column: getattr(CategoryStats, column) + value if increment else value
+        for column, value in values.items()
+    }
+    result = connection.execute(
+        update(CategoryStats).where(CategoryStats.category_id == category_id).values(updated_at=func.now(), **assignments)
+    )
+    if result.rowcount == 0:
+        if increment:
+            # 아직 행이 없는 카테고리 - 증감분 대신 전체 집계로 생성
+            return refresh_categories(connection, [category_id])
+        connection.execute(insert(CategoryStats).values(category_id=category_id, **values))
+
+
+def refresh_categories(connection, category_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    카테고리들의 카운터를 제품 테이블에서 다시 집계합니다 (None이면 전체).
+    Session 또는 Connection을 받아 호출한 쪽 트랜잭션 안에서 실행합니다 (커밋은 호출하는 쪽에서).
+    """
+    if category_ids is None:
+        ids = list(connection.execute(select(SafetyCategory.id).order_by(SafetyCategory.id)).scalars())
+    else:
+        ids = sorted({category_id for category_id in category_ids if category_id is not None})
+    if not ids:
+        return 0
+
+    counts = _aggregate(connection, None if category_ids is None else ids)
+    current = {
+        row[0]: tuple(row[1:])
+        for row in connection.execute(
+            select(CategoryStats.category_id, *[getattr(CategoryStats, column) for column in COUNTER_COLUMNS])
+            .where(CategoryStats.category_id.in_(ids))
+        )
+    }
+    changed = 0
+    for category_id in ids:
+        values = tuple(counts.get(category_id, (0,) * len(COUNTER_COLUMNS)))
+        if current.get(category_id) == values:
+            continue
+        _write(connection, category_id, dict(zip(COUNTER_COLUMNS, values)))
+        changed += 1
+    if changed and isinstance(connection, Session):
+        catalog_version.mark_changed(connection)
+    return changed
+
+
+def _claim_reconcile(db: Session) -> bool:
+    """
+    전체 재계산 임대를 잡습니다 (만료되었거나 아직 없을 때만, 커밋까지 처리).
+    다음 주기에 같은 워커가 다시 잡을 수 있도록 주기보다 조금 짧게 잡습니다.
+    """
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(seconds=max(settings.STATS_RECONCILE_INTERVAL * 0.9, RECONCILE_LEASE_MIN))
+    claimed = db.execute(
+        update(MaintenanceLease)
+        .where(MaintenanceLease.name == RECONCILE_LEASE, MaintenanceLease.expires_at <= now)
+        .values(expires_at=expires_at)
+    ).rowcount > 0
+    if not claimed and not db.execute(select(exists().where(MaintenanceLease.name == RECONCILE_LEASE))).scalar():
+        try:
+            with db.begin_nested():
+                db.execute(insert(MaintenanceLease).values(name=RECONCILE_LEASE, expires_at=expires_at))
+            claimed = True
+        except IntegrityError:
+            # 다른 워커가 먼저 생성
+            claimed = False
+    db.commit()
+    return claimed
+
+
+def reconcile(session_factory) -> int:
+    """전체 재계산 (주기 작업 / 시작 시) - 임대를 잡은 워커 한 곳에서만 실행"""
+    db = session_factory()
+    try:
+        if not _claim_reconcile(db):
+            return 0
+        count = refresh_categories(db)
+        db.commit()
+        return count
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"대시보드 통계 재계산 실패: {e}")
+        return 0
+    finally:
+        db.close()
+
+
+async def reconcile_periodically(session_factory):
+    """STATS_RECONCILE_INTERVAL마다 전체 재계산 (main.py lifespan에서 실행, 0이면 시작 시 한 번만)"""
+    await run_in_threadpool(reconcile, session_factory)
+    while settings.STATS_RECONCILE_INTERVAL > 0:
+        await asyncio.sleep(settings.STATS_RECONCILE_INTERVAL)
+        await run_in_threadpool(reconcile, session_factory)
+
+
+async def with_counts(db: AsyncSession, categories: List[dict]) -> List[dict]:
+    """공개 카테고리 응답용 카운터를 붙인 사본 반환 (category_stats 한 번 조회, 캐시된 카테고리 dict는 수정하지 않음)"""
+    if not categories:
+        return []
+    result = await db.execute(
+        select(CategoryStats.category_id, *[getattr(CategoryStats, column) for column in PUBLIC_COLUMNS])
+        .where(CategoryStats.category_id.in_([category["id"] for category in categories]))
+    )
+    counts = {row[0]: row[1:] for row in result.all()}
+    merged = []
+    for category in categories:
+        merged.append({**category, **dict(zip(PUBLIC_COLUMNS, counts.get(category["id"], (0,) * len(PUBLIC_COLUMNS))))})
+    return merged
+
+
+def get_dashboard_stats(db: Session) -> Dict[str, Any]:
+    """대시보드 요약 / 카테고리별 통계 (카테고리 + 카운터 한 번 조회)"""
+    rows = db.execute(
+        select(
+            SafetyCategory.name,
+            SafetyCategory.code,
+            *[func.coalesce(getattr(CategoryStats, column), 0).label(column) for column in COUNTER_COLUMNS]
+        ).outerjoin(CategoryStats, CategoryStats.category_id == SafetyCategory.id)
+        .order_by(func.coalesce(CategoryStats.product_count, 0).desc(), SafetyCategory.id)
+    ).all()
+    return {
+        "summary": {
+            "total_products": sum(row.product_count for row in rows),
+            "total_categories": len(rows),
+            "featured_products": sum(row.featured_count for row in rows),
+            "in_stock": sum(row.in_stock_count for row in rows),
+            "out_of_stock": sum(row.out_of_stock_count for row in rows),
+            "missing_images": sum(row.missing_image_count for row in rows),
+        },
+        "category_stats": [{"name": row.name, "code": row.code, "count": row.product_count} for row in rows],
+    }
+
+
+# ---------------------------------------------------------------------------
+# ORM 변경 감지 (flush 직후 변경 이력으로 증감분 계산)
+# ---------------------------------------------------------------------------
+def _old_values(obj: SafetyProduct) -> Optional[Tuple[Any, ...]]:
+    """flush 전 값 (알 수 없으면 None)"""
+    state = inspect(obj)
+    values = []
+    for key in TRACKED_ATTRIBUTES:
+        history = state.attrs[key].history
+        if history.deleted:
+            values.append(history.deleted[0])
+        elif history.unchanged:
+            values.append(history.unchanged[0])
+        else:
+            return None
+    return tuple(values)
+
+
+def _new_values(obj: SafetyProduct) -> Tuple[Any, ...]:
+    return tuple(getattr(obj, key) for key in TRACKED_ATTRIBUTES)
+
+
+@event.listens_for(Session, "after_flush")
+def _count_on_flush(session: Session, flush_context):
+    deltas: Dict[int, List[int]] = defaultdict(lambda: [0] * len(COUNTER_COLUMNS))
+    stale = set()
+
+    def add(values: Tuple[Any, ...], sign: int):
+        category_id, *rest = values
+        for index, value in enumerate(_contribution(*rest)):
+            deltas[category_id][index] += sign * value
+
+    for obj in session.new:
+        if isinstance(obj, SafetyProduct):
+            add(_new_values(obj), 1)
+    for obj in session.deleted:
+        if isinstance(obj, SafetyProduct):
+            old = _old_values(obj)
+            if old is None:
+                stale.add(obj.category_id)
+            else:
+                add(old, -1)
+    for obj in session.dirty:
+        if not isinstance(obj, SafetyProduct) or not session.is_modified(obj, include_collections=False):
+            continue
+        old = _old_values(obj)
+        if old is None:
+            # 읽지 않은 상태에서 바뀐 값이 있으면 영향받은 카테고리를 다시 집계
+            stale.add(obj.category_id)
+            stale.update(inspect(obj).attrs.category_id.history.deleted)
+        else:
+            add(old, -1)
+            add(_new_values(obj), 1)
+
+    if not deltas and not stale:
+        return
+    connection = session.connection()
+    # 행 잠금 순서를 카테고리 id 순으로 고정 (여러 카테고리를 바꾸는 트랜잭션끼리 교착 방지)
+    for category_id in sorted(category_id for category_id in set(deltas) | stale if category_id is not None):
+        if category_id in stale:
+            refresh_categories(connection, [category_id])
+        elif any(deltas[category_id]):
+            _write(connection, category_id, dict(zip(COUNTER_COLUMNS, deltas[category_id])), increment=True)
+
@@ -0,0 +1,172 @@
+"""
+카탈로그 버전
+제품/카테고리를 변경하는 트랜잭션마다 catalog_state.version을 같은 트랜잭션 안에서 1 증가시킵니다.
+공개 API는 이 버전으로 ETag / Last-Modified를 만들어 변경이 없으면 304로 응답합니다 (main.py).
+
+- ORM 변경(add/수정/delete)은 flush 시점에, 벌크 UPDATE/DELETE/INSERT는 실행 직전에 변경으로 표시하고,
+  실제 증가는 커밋 직전(before_commit)에 한 번만 합니다. 관리자 API, 엑셀 업로드, 스크립트 등 경로와
+  관계없이 누락되지 않으며, 버전 행 잠금은 커밋하는 동안만 잡으므로 변경 트랜잭션끼리 오래 기다리지 않습니다.
+- 조회한 버전은 CATALOG_VERSION_TTL 동안 메모리에 두고, 이 워커에서 커밋하면 새 버전으로 바로 바꿉니다.
+- 요청마다 처음 조회한 버전을 request.state에 두므로, 미들웨어의 ETag와 라우트의 워커별 캐시
+  (카테고리, 자동완성, 응답 캐시 키)가 같은 버전을 기준으로 합니다.
+"""
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from fastapi import Request
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from core.cache import TTLCache
+from core.config import settings
+from database import get_async_db
+from models.catalog import CatalogState, CATALOG_STATE_ID
+from models.safety import SafetyCategory, SafetyProduct
+
+_VERSION_KEY = "catalog_version"
+_cache = TTLCache(ttl=settings.CATALOG_VERSION_TTL, maxsize=1)
+
+_TRACKED_CLASSES = (SafetyProduct, SafetyCategory)
+_TRACKED_TABLES = {SafetyProduct.__tablename__, SafetyCategory.__tablename__}
+# 현재 트랜잭션에 변경이 있는지 / 커밋한 새 버전
+_CHANGED_KEY = "catalog_version_changed"
+_COMMITTED_KEY = "catalog_version_committed"
+# request.state 속성 이름
+_STATE_KEY = "catalog_version"
+
+CatalogVersion = Tuple[int, Optional[datetime]]
+
+
+async def get_version(db: AsyncSession) -> CatalogVersion:
+    """현재 카탈로그 (버전, 마지막 변경 시각)을 반환합니다."""
+    cached = _cache.get(_VERSION_KEY)
+    if cached is not None:
+        return cached
+
+    generation = _cache.generation
+    row = (await db.execute(
+        select(CatalogState.version, CatalogState.updated_at).where(CatalogState.id == CATALOG_STATE_ID)
+    )).first()
+    version = (0, None) if row is None else (row.version, _as_utc(row.updated_at))
+    _cache.set(_VERSION_KEY, version, generation=generation)
+    return version
+
+
+async def request_catalog_version(request: Request) -> CatalogVersion:
+    """
+    요청 기준 버전 조회 (HTTP 캐시 미들웨어의 version_provider, 공개 라우트 의존성)
+    요청에서 처음 조회한 값을 request.state에 두고 같은 요청 안에서는 항상 같은 값을 반환합니다.
+    라우트와 같은 DB를 보도록 get_async_db 의존성(테스트 override 포함)으로 세션을 엽니다.
+    """
+    version = getattr(request.state, _STATE_KEY, None)
+    if version is not None:
+        return version
+
+    version = _cache.get(_VERSION_KEY)
+    if version is None:
+        provider = request.app.dependency_overrides.get(get_async_db, get_async_db)
+        sessions = provider()
+        db = await sessions.__anext__()
+        try:
+            version = await get_version(db)
+        finally:
+            await sessions.aclose()
+    setattr(request.state, _STATE_KEY, version)
+    return version
+
+
+def committed_version(session: Session) -> Optional[int]:
+    """after_commit 리스너용 - 방금 커밋한 트랜잭션이 올린 버전 (변경이 없었으면 None)"""
+    committed = session.info.get(_COMMITTED_KEY)
+    return committed[0] if committed else None
+
+
+def invalidate():
+    """버전 캐시 무효화"""
+    _cache.clear()
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite는 타임존 없이 UTC(CURRENT_TIMESTAMP)로 저장
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def mark_changed(session: Session):
+    """공개 카탈로그 응답에 영향을 주는 변경 표시 (커밋 시 버전 증가) - 제품/카테고리 외 테이블용"""
+    session.info[_CHANGED_KEY] = True
+
+
+def _bump(session: Session):
+    """버전을 1 증가시키고 새 (버전, 변경 시각)을 세션에 기록합니다."""
+    connection = session.connection()
+    result = connection.execute(
+        update(CatalogState)
+        .where(CatalogState.id == CATALOG_STATE_ID)
+        .values(version=CatalogState.version + 1, updated_at=func.now())
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(CatalogState).values(id=CATALOG_STATE_ID, version=1, updated_at=func.now()))
+    row = connection.execute(
+        select(CatalogState.version, CatalogState.updated_at).where(CatalogState.id == CATALOG_STATE_ID)
+    ).first()
+    session.info[_COMMITTED_KEY] = (row.version, _as_utc(row.updated_at))
+
+
+# ---------------------------------------------------------------------------
+# 변경 감지
+# ---------------------------------------------------------------------------
+@event.listens_for(Session, "after_flush")
+def _bump_on_flush(session: Session, flush_context):
+    for obj in session.new | session.deleted:
+        if isinstance(obj, _TRACKED_CLASSES):
+            return mark_changed(session)
+    for obj in session.dirty:
+        if isinstance(obj, _TRACKED_CLASSES) and session.is_modified(obj, include_collections=False):
+            return mark_changed(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bump_on_bulk(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if getattr(table, "name", None) in _TRACKED_TABLES:
+        mark_changed(orm_execute_state.session)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_before_commit(session: Session):
+    # SAVEPOINT 커밋은 건너뜀 (최상위 커밋에서 한 번만 증가)
+    if session.in_nested_transaction():
+        return
+    # 커밋 중 마지막 flush는 이 이벤트 다음에 일어나므로 남은 변경을 먼저 반영해 변경 여부를 확정
+    session.flush()
+    if session.info.pop(_CHANGED_KEY, False):
+        _bump(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _set_cache_on_commit(session: Session):
+    committed = session.info.get(_COMMITTED_KEY)
+    if committed is not None:
+        _cache.clear()
+        _cache.set(_VERSION_KEY, committed)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _reset_committed(session: Session, transaction):
+    # 다른 after_commit 리스너가 committed_version()을 읽은 뒤 최상위 트랜잭션이 끝나면 정리
+    if transaction.parent is None:
+        session.info.pop(_COMMITTED_KEY, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session):
+    # SAVEPOINT 롤백은 표시를 남김 (남은 변경이 있을 수 있으므로 커밋 시 증가)
+    if not session.in_nested_transaction():
+        session.info.pop(_CHANGED_KEY, None)
+        session.info.pop(_COMMITTED_KEY, None)
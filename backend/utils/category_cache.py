@@ -0,0 +1,76 @@
+"""
+카테고리 캐시
+safety_categories 테이블은 거의 바뀌지 않으므로 전체 목록을 메모리에 올려두고
+id / code / slug 조회를 DB 왕복 없이 처리합니다.
+카테고리 생성/수정/삭제 시 crud.category에서 invalidate()를 호출하고,
+다른 워커의 변경은 스냅샷을 만든 카탈로그 버전(utils.catalog_version)보다 요청 버전이 높으면 다시 읽어 반영합니다.
+제품 수 등 자주 바뀌는 카운터는 담지 않습니다 (utils.catalog_stats.with_counts).
+"""
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.cache import TTLCache
+from core.config import settings
+from models.safety import SafetyCategory
+
+_SNAPSHOT_KEY = "categories"
+_cache = TTLCache(ttl=settings.CATEGORY_CACHE_TTL, maxsize=1)
+
+
+class CategorySnapshot:
+    """display_order 순으로 정렬된 카테고리 목록과 조회용 인덱스"""
+
+    def __init__(self, categories: List[dict], version: int = 0):
+        self.items = categories
+        self.version = version
+        self.by_id: Dict[int, dict] = {category["id"]: category for category in categories}
+        self.by_code: Dict[str, dict] = {category["code"]: category for category in categories}
+        self.by_slug: Dict[str, dict] = {category["slug"]: category for category in categories}
+
+
+def _category_to_dict(category: SafetyCategory) -> dict:
+    return {column.name: getattr(category, column.name) for column in SafetyCategory.__table__.columns}
+
+
+async def get_snapshot(db: AsyncSession, version: int = 0) -> CategorySnapshot:
+    """캐시된 카테고리 스냅샷을 반환합니다 (없거나 요청 카탈로그 버전보다 오래되었으면 DB에서 읽어 채움)."""
+    snapshot = _cache.get(_SNAPSHOT_KEY)
+    if snapshot is not None and snapshot.version >= version:
+        return snapshot
+
+    generation = _cache.generation
+    result = await db.execute(
+        select(SafetyCategory).order_by(SafetyCategory.display_order, SafetyCategory.id)
+    )
+    snapshot = CategorySnapshot([_category_to_dict(category) for category in result.scalars().all()], version)
+    # 조회 도중 무효화되었다면 저장하지 않음 (다음 요청에서 다시 읽음)
+    _cache.set(_SNAPSHOT_KEY, snapshot, generation=generation)
+    return snapshot
+
+
+async def get_categories(db: AsyncSession, skip: int = 0, limit: int = 100, version: int = 0) -> List[dict]:
+    """카테고리 목록 조회"""
+    snapshot = await get_snapshot(db, version)
+    return snapshot.items[skip:skip + limit]
+
+
+async def get_category(db: AsyncSession, category_id: int, version: int = 0) -> Optional[dict]:
+    """카테고리 ID로 조회"""
+    return (await get_snapshot(db, version)).by_id.get(category_id)
+
+
+async def get_category_by_code(db: AsyncSession, category_code: str, version: int = 0) -> Optional[dict]:
+    """카테고리 코드로 조회"""
+    return (await get_snapshot(db, version)).by_code.get(category_code)
+
+
+async def get_category_by_slug(db: AsyncSession, slug: str, version: int = 0) -> Optional[dict]:
+    """카테고리 slug로 조회"""
+    return (await get_snapshot(db, version)).by_slug.get(slug)
+
+
+def invalidate():
+    """카테고리 캐시 무효화"""
+    _cache.clear()
@@ -2,13 +2,25 @@
 Excel 파일 처리 유틸리티
 제품 데이터 일괄 업로드/다운로드 기능
 """
+import csv
+import json
+import os
+import tempfile
+import openpyxl
 import pandas as pd
-from typing import List, Dict, Any, Optional
-from io import BytesIO
+from itertools import chain, islice
+from openpyxl.utils import get_column_letter
+from typing import BinaryIO, Callable, List, Dict, Any, Iterator, Optional, Tuple
+from io import BytesIO, StringIO
 from datetime import datetime
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
-from models.safety import SafetyProduct, SafetyCategory
+from models.safety import SafetyProduct, SafetyCategory, ProductImage
 from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+from core.config import settings
+from utils.product_import import ProductImporter
+from utils import catalog_stats
 
 class ExcelHandler:
     """Excel 파일 처리 클래스"""
@@ -27,6 +39,38 @@ class ExcelHandler:
         '추천제품'
     ]
     
+    # 내보내기 컬럼
+    EXPORT_COLUMNS = [
+        'ID', '카테고리코드', '카테고리명', '제품명', '모델번호', '가격', '설명',
+        '사양', '재고상태', '이미지경로', '표시순서', '추천제품', '등록일', '수정일'
+    ]
+    
+    # 내보내기 형식: (media type, 확장자)
+    EXPORT_FORMATS = {
+        'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', '.xlsx'),
+        'csv': ('text/csv; charset=utf-8', '.csv'),
+        'ndjson': ('application/x-ndjson', '.ndjson')
+    }
+    
+    EXPORT_BATCH_SIZE = 1000  # DB에서 한 번에 가져오는 행 수
+    EXPORT_WIDTH_SAMPLE = 200  # 열 너비 계산에 사용하는 앞쪽 행 수
+    STREAM_CHUNK_SIZE = 64 * 1024
+    SPOOL_MAX_SIZE = 8 * 1024 * 1024  # xlsx 응답을 메모리에 두는 최대 크기 (초과 시 임시 파일)
+    
+    # 가져오기 시 헤더명 -> utils.product_import 필드명
+    IMPORT_FIELDS = {
+        '카테고리코드': 'category_code',
+        '제품명': 'name',
+        '모델번호': 'model_number',
+        '가격': 'price',
+        '설명': 'description',
+        '사양': 'specifications',
+        '재고상태': 'stock_status',
+        '이미지경로': 'image_path',
+        '표시순서': 'display_order',
+        '추천제품': 'is_featured'
+    }
+    
     @staticmethod
     def create_template() -> BytesIO:
         """
@@ -86,8 +130,18 @@ class ExcelHandler:
         Returns:
             BytesIO: Excel 파일 바이너리
         """
-        # 제품 조회
-        query = db.query(
+        output = BytesIO()
+        ExcelHandler.write_products(db, category_code, 'xlsx', output)
+        output.seek(0)
+        return output
+    
+    @staticmethod
+    def iter_export_rows(db: Session, category_code: Optional[str] = None) -> Iterator[list]:
+        """
+        내보내기 행을 EXPORT_BATCH_SIZE개씩 가져오며 하나씩 반환합니다 (yield_per).
+        PostgreSQL에서는 서버 측 커서로 읽으므로 전체 결과를 메모리에 올리지 않습니다.
+        """
+        stmt = select(
             SafetyProduct.id,
             SafetyCategory.code.label('category_code'),
             SafetyCategory.name.label('category_name'),
@@ -102,56 +156,134 @@ class ExcelHandler:
             SafetyProduct.is_featured,
             SafetyProduct.created_at,
             SafetyProduct.updated_at
-        ).join(SafetyCategory, SafetyProduct.category_id == SafetyCategory.id)
+        ).join(SafetyCategory, SafetyProduct.category_id == SafetyCategory.id).order_by(SafetyProduct.id)
         
         if category_code:
-            query = query.filter(SafetyCategory.code == category_code)
+            stmt = stmt.where(SafetyCategory.code == category_code)
         
-        products = query.all()
+        for p in db.execute(stmt.execution_options(yield_per=ExcelHandler.EXPORT_BATCH_SIZE)):
+            yield [
+                p.id,
+                p.category_code,
+                p.category_name,
+                p.name,
+                p.model_number or '',
+                p.price or 0,
+                p.description or '',
+                p.specifications or '',
+                p.stock_status or 'in_stock',
+                p.file_path or '',
+                p.display_order,
+                '예' if p.is_featured else '아니오',
+                p.created_at.strftime('%Y-%m-%d %H:%M:%S') if p.created_at else '',
+                p.updated_at.strftime('%Y-%m-%d %H:%M:%S') if p.updated_at else ''
+            ]
+    
+    @staticmethod
+    def _write_xlsx(db: Session, category_code: Optional[str], target: BinaryIO):
+        """
+        write-only 워크북으로 행을 가져오는 대로 기록합니다.
+        write-only 시트는 행을 쓰기 전에 열 너비를 정해야 하므로 앞쪽 EXPORT_WIDTH_SAMPLE행으로 계산합니다.
+        """
+        rows = ExcelHandler.iter_export_rows(db, category_code)
+        sample = list(islice(rows, ExcelHandler.EXPORT_WIDTH_SAMPLE))
         
-        # DataFrame 생성
-        data = []
-        for p in products:
-            data.append({
-                'ID': p.id,
-                '카테고리코드': p.category_code,
-                '카테고리명': p.category_name,
-                '제품명': p.name,
-                '모델번호': p.model_number or '',
-                '가격': p.price or 0,
-                '설명': p.description or '',
-                '사양': p.specifications or '',
-                '재고상태': p.stock_status or 'in_stock',
-                '이미지경로': p.file_path or '',
-                '표시순서': p.display_order,
-                '추천제품': '예' if p.is_featured else '아니오',
-                '등록일': p.created_at.strftime('%Y-%m-%d %H:%M:%S') if p.created_at else '',
-                '수정일': p.updated_at.strftime('%Y-%m-%d %H:%M:%S') if p.updated_at else ''
-            })
+        wb = openpyxl.Workbook(write_only=True)
+        worksheet = wb.create_sheet('제품목록')
+        for idx, header in enumerate(ExcelHandler.EXPORT_COLUMNS):
+            max_length = max([len(header)] + [len(str(row[idx])) for row in sample if row[idx] is not None])
+            worksheet.column_dimensions[get_column_letter(idx + 1)].width = min(max_length + 2, 50)
         
-        df = pd.DataFrame(data)
+        worksheet.append(ExcelHandler.EXPORT_COLUMNS)
+        for row in chain(sample, rows):
+            worksheet.append(row)
+        wb.save(target)
+    
+    @staticmethod
+    def _iter_text(db: Session, category_code: Optional[str], file_format: str) -> Iterator[bytes]:
+        """CSV / NDJSON을 STREAM_CHUNK_SIZE 단위 bytes로 만듭니다."""
+        buffer = StringIO()
+        if file_format == 'csv':
+            writer = csv.writer(buffer)
+            buffer.write('\ufeff')  # Excel에서 한글이 깨지지 않도록 UTF-8 BOM
+            writer.writerow(ExcelHandler.EXPORT_COLUMNS)
+        for row in ExcelHandler.iter_export_rows(db, category_code):
+            if file_format == 'csv':
+                writer.writerow(row)
+            else:
+                buffer.write(json.dumps(dict(zip(ExcelHandler.EXPORT_COLUMNS, row)), ensure_ascii=False))
+                buffer.write('\n')
+            if buffer.tell() >= ExcelHandler.STREAM_CHUNK_SIZE:
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode('utf-8')
+    
+    @staticmethod
+    def write_products(db: Session, category_code: Optional[str], file_format: str, target: BinaryIO):
+        """
+        제품 데이터를 파일로 내보내기 (xlsx / csv / ndjson)
         
-        # Excel 파일로 변환
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='제품목록')
-            
-            # 컬럼 너비 자동 조정
-            worksheet = writer.sheets['제품목록']
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
+        Args:
+            db: 데이터베이스 세션
+            category_code: 카테고리 코드 (선택사항)
+            file_format: EXPORT_FORMATS 키
+            target: 기록할 바이너리 파일 객체
+        """
+        if file_format == 'xlsx':
+            ExcelHandler._write_xlsx(db, category_code, target)
+            return
+        for chunk in ExcelHandler._iter_text(db, category_code, file_format):
+            target.write(chunk)
+    
+    @staticmethod
+    def stream_products(
+        session_factory: Callable[[], Session],
+        category_code: Optional[str],
+        file_format: str
+    ) -> Iterator[bytes]:
+        """
+        StreamingResponse용 내보내기 스트림
         
-        output.seek(0)
-        return output
+        응답 전송 중에도 DB를 읽으므로 요청 세션이 아닌 전용 세션을 열고 끝나면 닫습니다.
+        xlsx는 ZIP 형식이라 임시 파일(SpooledTemporaryFile)에 완성한 뒤 청크로 보내고,
+        csv / ndjson은 행을 가져오는 대로 바로 보냅니다.
+        """
+        db = session_factory()
+        try:
+            if file_format != 'xlsx':
+                yield from ExcelHandler._iter_text(db, category_code, file_format)
+                return
+            with tempfile.SpooledTemporaryFile(max_size=ExcelHandler.SPOOL_MAX_SIZE) as spool:
+                ExcelHandler._write_xlsx(db, category_code, spool)
+                db.close()
+                spool.seek(0)
+                for chunk in iter(lambda: spool.read(ExcelHandler.STREAM_CHUNK_SIZE), b''):
+                    yield chunk
+        finally:
+            db.close()
+    
+    @staticmethod
+    def iter_rows(source: BinaryIO, min_row: int = 1) -> Iterator[Tuple[int, tuple]]:
+        """
+        첫 번째 시트의 행을 (Excel 행 번호, 값 튜플)로 하나씩 읽습니다.
+        openpyxl read_only 모드로 읽으므로 파일 크기와 관계없이 메모리 사용량이 일정합니다.
+        
+        Args:
+            source: 업로드 파일 객체 (UploadFile.file - 큰 파일은 임시 파일로 스풀됨)
+            min_row: 시작 행 번호
+        """
+        source.seek(0)
+        wb = openpyxl.load_workbook(source, read_only=True, data_only=True)
+        try:
+            ws = wb.active
+            for row_number, row in enumerate(ws.iter_rows(min_row=min_row, values_only=True), start=min_row):
+                # 빈 행 건너뛰기
+                if any(cell is not None and cell != '' for cell in row):
+                    yield row_number, row
+        finally:
+            wb.close()
     
     @staticmethod
     async def import_products(
@@ -167,17 +299,41 @@ class ExcelHandler:
             db: 데이터베이스 세션
             mode: 'append' (추가) 또는 'replace' (전체 교체)
         
+        Returns:
+            Dict: 처리 결과 (성공/실패 개수, 에러 목록)
+        """
+        # 파일 파싱과 DB 작업은 동기 처리이므로 이벤트 루프를 막지 않도록 스레드풀에서 실행
+        return await run_in_threadpool(ExcelHandler.import_from_source, file.file, db, mode)
+    
+    @staticmethod
+    def import_from_source(
+        source: BinaryIO,
+        db: Session,
+        mode: str,
+        on_progress: Optional[Callable[[ProductImporter], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        열린 Excel 파일에서 제품 데이터 가져오기 (동기 - 스레드풀/백그라운드 작업에서 호출)
+        
+        Args:
+            source: Excel 파일 (바이너리)
+            db: 데이터베이스 세션 (커밋까지 처리)
+            mode: 'append' (추가) 또는 'replace' (전체 교체)
+            on_progress: 청크를 INSERT 할 때마다 호출
+        
         Returns:
             Dict: 처리 결과 (성공/실패 개수, 에러 목록)
         """
         try:
-            # Excel 파일 읽기
-            content = await file.read()
-            df = pd.read_excel(BytesIO(content))
+            rows = ExcelHandler.iter_rows(source)
+            
+            # 헤더 행 (첫 번째 행)
+            _, header = next(rows, (1, ()))
+            columns = [str(cell).strip() if cell is not None else '' for cell in header]
             
             # 필수 컬럼 확인
             required_columns = ['카테고리코드', '제품명']
-            missing_columns = [col for col in required_columns if col not in df.columns]
+            missing_columns = [col for col in required_columns if col not in columns]
             if missing_columns:
                 return {
                     'success': False,
@@ -187,81 +343,31 @@ class ExcelHandler:
                     'error_count': 0
                 }
             
-            # 카테고리 맵 생성 (코드 -> ID)
-            categories = db.query(SafetyCategory).all()
-            category_map = {cat.code: cat.id for cat in categories}
-            
-            # 'replace' 모드인 경우 기존 제품 전체 삭제
+            # 'replace' 모드인 경우 기존 제품 전체 삭제 (가져오기와 같은 트랜잭션)
             if mode == 'replace':
-                db.query(SafetyProduct).delete()
-                db.commit()
+                db.execute(delete(ProductImage))
+                db.execute(delete(SafetyProduct))
             
-            results = {
-                'total': len(df),
-                'success_count': 0,
-                'error_count': 0,
-                'errors': []
-            }
-            
-            # 각 행 처리
-            for idx, row in df.iterrows():
-                try:
-                    # 카테고리 확인
-                    category_code = str(row.get('카테고리코드', '')).strip()
-                    if not category_code or category_code not in category_map:
-                        results['errors'].append({
-                            'row': idx + 2,  # Excel 행 번호 (헤더 포함)
-                            'error': f'유효하지 않은 카테고리 코드: {category_code}'
-                        })
-                        results['error_count'] += 1
-                        continue
-                    
-                    # 제품명 확인
-                    product_name = str(row.get('제품명', '')).strip()
-                    if not product_name:
-                        results['errors'].append({
-                            'row': idx + 2,
-                            'error': '제품명이 비어있습니다'
-                        })
-                        results['error_count'] += 1
-                        continue
-                    
-                    # 추천제품 변환
-                    is_featured = row.get('추천제품', '아니오')
-                    if isinstance(is_featured, str):
-                        is_featured = is_featured.strip() == '예'
-                    else:
-                        is_featured = bool(is_featured)
-                    
-                    # 제품 데이터 생성
-                    product_data = {
-                        'category_id': category_map[category_code],
-                        'name': product_name,
-                        'model_number': str(row.get('모델번호', '')).strip() or None,
-                        'price': float(row.get('가격', 0)) if pd.notna(row.get('가격')) else None,
-                        'description': str(row.get('설명', '')).strip() or None,
-                        'specifications': str(row.get('사양', '')).strip() or None,
-                        'stock_status': str(row.get('재고상태', 'in_stock')).strip(),
-                        'file_path': str(row.get('이미지경로', '')).strip() or None,
-                        'display_order': int(row.get('표시순서', 0)) if pd.notna(row.get('표시순서')) else 0,
-                        'is_featured': is_featured
-                    }
-                    
-                    # 제품 생성
-                    product = SafetyProduct(**product_data)
-                    db.add(product)
-                    results['success_count'] += 1
-                    
-                except Exception as e:
-                    results['errors'].append({
-                        'row': idx + 2,
-                        'error': str(e)
-                    })
-                    results['error_count'] += 1
+            # 헤더명 -> 가져오기 필드로 변환 후 행 단위 검증, 청크 단위 INSERT
+            fields = [ExcelHandler.IMPORT_FIELDS.get(column) for column in columns]
+            importer = ProductImporter(db, required=('category_code', 'name'), on_progress=on_progress)
+            for row_number, row in rows:
+                importer.add(row_number, {field: value for field, value in zip(fields, row) if field})
+            importer.finish()
+            if mode == 'replace':
+                # 기존 제품을 모두 지웠으므로 전체 카테고리 통계 다시 집계
+                catalog_stats.refresh_categories(db)
             
             # 커밋
             db.commit()
             
+            results = {
+                'total': importer.total,
+                'success_count': len(importer.created),
+                'error_count': len(importer.errors),
+                'errors': importer.errors
+            }
+            
             results['success'] = True
             results['message'] = f'총 {results["total"]}개 중 {results["success_count"]}개 성공, {results["error_count"]}개 실패'
             
@@ -277,6 +383,16 @@ class ExcelHandler:
                 'error_count': 0
             }
     
+    @staticmethod
+    def upload_size(file: UploadFile) -> int:
+        """업로드 파일 크기 (바이트) - 내용을 메모리로 읽지 않고 확인"""
+        if file.size is not None:
+            return file.size
+        file.file.seek(0, os.SEEK_END)
+        size = file.file.tell()
+        file.file.seek(0)
+        return size
+    
     @staticmethod
     def validate_excel_file(file: UploadFile) -> tuple[bool, str]:
         """
@@ -293,9 +409,9 @@ class ExcelHandler:
         if not any(file.filename.endswith(ext) for ext in allowed_extensions):
             return False, '엑셀 파일만 업로드 가능합니다 (.xlsx, .xls)'
         
-        # 파일 크기 확인 (10MB 제한)
-        max_size = 10 * 1024 * 1024  # 10MB
-        if file.size and file.size > max_size:
-            return False, f'파일 크기가 너무 큽니다 (최대 10MB)'
+        # 파일 크기 확인 (EXCEL_MAX_UPLOAD_MB 제한, 가져오기는 스트리밍으로 처리)
+        max_size = settings.EXCEL_MAX_UPLOAD_MB * 1024 * 1024
+        if ExcelHandler.upload_size(file) > max_size:
+            return False, f'파일 크기가 너무 큽니다 (최대 {settings.EXCEL_MAX_UPLOAD_MB}MB)'
         
         return True, 'OK'
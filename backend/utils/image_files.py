@@ -0,0 +1,86 @@
+"""
+제품 이미지 파일 정리
+제품의 file_path 값(JSON 배열 또는 단일 경로)에서 이미지 경로를 꺼내고,
+삭제된 제품의 이미지 파일을 스레드풀에서 한 번에 정리합니다.
+
+파일 삭제는 DB 커밋 이후 백그라운드 작업으로 실행하므로 요청을 붙잡지 않으며,
+실패한 파일은 건별로 로그에 남깁니다 (DB 삭제는 이미 확정된 상태).
+"""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from core.config import settings
+from core.logger import get_logger
+from utils import image_variants
+
+logger = get_logger(__name__)
+
+IMAGE_URL_PREFIX = "/images/"
+# 여러 제품이 함께 쓰는 기본 이미지는 삭제하지 않음
+DEFAULT_IMAGE_PATH = "/images/default.jpg"
+DEFAULT_IMAGE_NAMES = {"default.jpg"}
+CLEANUP_WORKERS = 4
+
+
+def parse_stored_paths(file_path: Optional[str]) -> List[str]:
+    """file_path 컬럼 값의 모든 경로 (/static/images/... 등 업로드 디렉토리 밖 경로 포함, 빈 값 제외)"""
+    if not file_path:
+        return []
+    try:
+        paths = json.loads(file_path)
+    except (json.JSONDecodeError, TypeError):
+        paths = file_path
+    if not isinstance(paths, list):
+        paths = [str(paths)]
+    return [path.strip() for path in paths if isinstance(path, str) and path.strip()]
+
+
+def parse_image_paths(file_path: Optional[str]) -> List[str]:
+    """file_path 컬럼 값을 업로드 이미지 URL 경로(/images/...) 목록으로 변환합니다 (파일 정리/참조 수용)."""
+    return [path for path in parse_stored_paths(file_path) if path.startswith(IMAGE_URL_PREFIX)]
+
+
+def is_default_image(path: str) -> bool:
+    return os.path.basename(path) in DEFAULT_IMAGE_NAMES
+
+
+def _local_path(path: str) -> Path:
+    # /images/... -> UPLOAD_DIR/...
+    return settings.get_upload_path() / path[len(IMAGE_URL_PREFIX):]
+
+
+def _remove(path: str) -> Tuple[str, Optional[str]]:
+    local_path = _local_path(path)
+    try:
+        local_path.unlink()
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        return path, str(e)
+    try:
+        image_variants.remove_variants(local_path)
+    except OSError as e:
+        return path, f"변형 파일 삭제 실패: {e}"
+    return path, None
+
+
+def remove_image_files(paths: Iterable[str]) -> Tuple[int, List[Tuple[str, str]]]:
+    """
+    이미지 파일과 변형 파일들을 삭제합니다 (기본 이미지 제외).
+    (삭제 시도한 파일 수, [(경로, 오류)]) 를 반환합니다.
+    """
+    targets = sorted({path for path in paths if path.startswith(IMAGE_URL_PREFIX) and not is_default_image(path)})
+    if not targets:
+        return 0, []
+
+    with ThreadPoolExecutor(max_workers=min(CLEANUP_WORKERS, len(targets))) as executor:
+        results = list(executor.map(_remove, targets))
+
+    failures = [(path, error) for path, error in results if error is not None]
+    for path, error in failures:
+        logger.error(f"이미지 파일 삭제 실패: {path}, 오류: {error}")
+    logger.info(f"이미지 파일 정리 완료: {len(targets) - len(failures)}개 삭제, {len(failures)}개 실패")
+    return len(targets), failures
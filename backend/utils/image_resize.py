@@ -0,0 +1,197 @@
+"""
+이미지 즉석 리사이즈 (/images/{path}?w=&h=&fmt=)
+미리 만든 변형(utils.image_variants) 외에 프론트엔드가 실제 렌더링 크기로 이미지를 요청할 수 있게 합니다.
+
+- w/h 중 하나 이상이 있으면 비율을 유지해 그 상자 안에 맞게 축소합니다 (원본보다 확대하지 않음).
+- fmt: webp / jpeg / png (생략하면 원본 형식)
+- 첫 요청에서 스레드풀로 Pillow 리사이즈 후 IMAGE_CACHE_DIR에 저장하고, 이후에는 캐시 파일을 바로 서빙합니다.
+- 캐시 키는 (경로, 크기, 형식, 원본 mtime)이므로 원본이 바뀌면 새로 만들어집니다.
+- 캐시 전체 크기가 IMAGE_CACHE_MAX_MB를 넘으면 가장 오래 사용하지 않은 파일부터 지웁니다 (LRU, 파일 atime 기준).
+"""
+import hashlib
+import os
+import stat
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import QueryParams
+from starlette.responses import Response
+from starlette.types import Scope
+
+from core.config import settings
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# fmt 파라미터 -> (Pillow 형식, 확장자)
+RESIZE_FORMATS = {
+    "webp": ("WEBP", ".webp"),
+    "jpeg": ("JPEG", ".jpg"),
+    "jpg": ("JPEG", ".jpg"),
+    "png": ("PNG", ".png"),
+}
+_SOURCE_FORMATS = {".jpg": "jpeg", ".jpeg": "jpeg", ".png": "png", ".webp": "webp"}
+# 캐시가 상한을 넘으면 이 비율까지 줄임 (매 요청마다 정리하지 않도록)
+CACHE_EVICT_RATIO = 0.9
+
+
+def parse_resize_params(query_string: bytes, source: str) -> Optional[Tuple[Optional[int], Optional[int], str]]:
+    """쿼리에서 (w, h, fmt)를 읽습니다. 리사이즈 요청이 아니면 None, 값이 잘못되면 400."""
+    params = QueryParams(query_string)
+    if not any(params.get(key) for key in ("w", "h", "fmt")):
+        return None
+
+    def dimension(key: str) -> Optional[int]:
+        value = params.get(key)
+        if not value:
+            return None
+        if not value.isdigit() or not 0 < int(value) <= settings.IMAGE_RESIZE_MAX_DIM:
+            raise HTTPException(status_code=400, detail=f"{key}는 1~{settings.IMAGE_RESIZE_MAX_DIM} 사이 정수여야 합니다")
+        return int(value)
+
+    fmt = (params.get("fmt") or _SOURCE_FORMATS.get(Path(source).suffix.lower(), "")).lower()
+    if fmt not in RESIZE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 형식입니다: {fmt or Path(source).suffix}")
+    return dimension("w"), dimension("h"), fmt
+
+
+def resize_image(source: Path, target: Path, width: Optional[int], height: Optional[int], fmt: str):
+    """원본을 (width, height) 상자 안에 맞게 축소해 target에 저장합니다 (CPU 작업, 스레드풀에서 호출)."""
+    from PIL import Image, ImageOps
+
+    image_format, _ = RESIZE_FORMATS[fmt]
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        image.thumbnail((width or image.width, height or image.height), Image.LANCZOS)
+        if image_format == "JPEG" and image.mode != "RGB":
+            background = Image.new("RGB", image.size, "white")
+            rgba = image.convert("RGBA")
+            background.paste(rgba, mask=rgba.getchannel("A"))
+            image = background
+        elif image.mode not in ("RGB", "RGBA", "L", "LA"):
+            image = image.convert("RGBA")
+        # 같은 키를 동시에 만드는 요청이 있어도 깨진 파일을 서빙하지 않도록 임시 파일 후 교체
+        temp = target.with_name(f".{target.name}.{uuid.uuid4().hex}")
+        try:
+            image.save(temp, format=image_format, quality=settings.IMAGE_VARIANT_QUALITY)
+            os.replace(temp, target)
+        finally:
+            temp.unlink(missing_ok=True)
+
+
+class ResizeCache:
+    """리사이즈 결과 디스크 캐시 (크기 상한, LRU 정리)"""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory).resolve()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    def path(self, relative: str, mtime_ns: int, width: Optional[int], height: Optional[int], fmt: str) -> Path:
+        key = hashlib.sha256(f"{relative}|{width}|{height}|{fmt}|{mtime_ns}".encode()).hexdigest()
+        return self.directory / key[:2] / f"{key}{RESIZE_FORMATS[fmt][1]}"
+
+    def hit(self, path: Path) -> Optional[os.stat_result]:
+        """캐시 파일이 있으면 사용 시각(atime)을 갱신하고 stat을 반환합니다 (mtime은 ETag에 쓰이므로 유지)."""
+        try:
+            stat_result = path.stat()
+            os.utime(path, ns=(time.time_ns(), stat_result.st_mtime_ns))
+        except FileNotFoundError:
+            return None
+        return stat_result
+
+    def added(self, path: Path):
+        """새 캐시 파일 크기를 반영하고 상한을 넘으면 오래된 파일부터 정리합니다."""
+        with self._lock:
+            if self._size is None:
+                self._size = sum(entry.stat().st_size for entry in self._files())
+            else:
+                self._size += path.stat().st_size
+            if self._size > self.max_bytes:
+                self._evict(keep=path)
+
+    def _files(self):
+        if not self.directory.exists():
+            return []
+        return [entry for entry in self.directory.glob("*/*") if entry.is_file() and not entry.name.startswith(".")]
+
+    def _evict(self, keep: Path):
+        # 방금 만든 파일(keep)은 이번 응답으로 서빙해야 하므로 남김
+        entries = sorted(((entry.stat(), entry) for entry in self._files() if entry != keep), key=lambda item: item[0].st_atime)
+        size = sum(entry_stat.st_size for entry_stat, _ in entries) + keep.stat().st_size
+        limit = self.max_bytes * CACHE_EVICT_RATIO
+        removed = 0
+        for entry_stat, entry in entries:
+            if size <= limit:
+                break
+            entry.unlink(missing_ok=True)
+            size -= entry_stat.st_size
+            removed += 1
+        self._size = size
+        logger.info(f"이미지 리사이즈 캐시 정리: {removed}개 삭제, {size / 1024 / 1024:.1f}MB 사용 중")
+
+
+class ResizingStaticFiles(StaticFiles):
+    """
+    /images 정적 파일 서빙 + 리사이즈.
+    쿼리가 없으면 기존과 같이 directory의 파일을 그대로 서빙하고,
+    w/h/fmt가 있으면 directory 또는 업로드 디렉토리의 원본을 리사이즈해 캐시에서 서빙합니다.
+    """
+
+    def __init__(self, *args, cache: Optional[ResizeCache] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cache = cache
+
+    @property
+    def cache(self) -> ResizeCache:
+        if self._cache is None:
+            self._cache = ResizeCache(settings.IMAGE_CACHE_DIR, settings.IMAGE_CACHE_MAX_MB * 1024 * 1024)
+        return self._cache
+
+    def lookup_source(self, path: str) -> Tuple[Optional[str], Optional[os.stat_result]]:
+        full_path, stat_result = self.lookup_path(path)
+        if stat_result is not None and stat.S_ISREG(stat_result.st_mode):
+            return full_path, stat_result
+        # 업로드 디렉토리 (Next.js가 원본을 서빙하는 경로)
+        root = os.path.realpath(settings.get_upload_path())
+        full_path = os.path.realpath(os.path.join(root, path))
+        if os.path.commonpath([root, full_path]) != root:
+            return None, None
+        try:
+            stat_result = os.stat(full_path)
+        except OSError:
+            return None, None
+        return (full_path, stat_result) if stat.S_ISREG(stat_result.st_mode) else (None, None)
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        params = parse_resize_params(scope.get("query_string", b""), path)
+        if params is None or scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+
+        source, source_stat = await run_in_threadpool(self.lookup_source, path)
+        if source is None:
+            raise HTTPException(status_code=404)
+
+        width, height, fmt = params
+        target = self.cache.path(path, source_stat.st_mtime_ns, width, height, fmt)
+        target_stat = await run_in_threadpool(self.cache.hit, target)
+        if target_stat is None:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                await run_in_threadpool(resize_image, Path(source), target, width, height, fmt)
+            except OSError as e:
+                logger.warning(f"이미지 리사이즈 실패: {path}, 오류: {e}")
+                raise HTTPException(status_code=415, detail="이미지 파일을 읽을 수 없습니다")
+            await run_in_threadpool(self.cache.added, target)
+            target_stat = target.stat()
+
+        response = self.file_response(target, target_stat, scope)
+        response.headers["Cache-Control"] = f"public, max-age={settings.IMAGE_CACHE_MAX_AGE}"
+        return response
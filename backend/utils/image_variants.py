@@ -0,0 +1,105 @@
+"""
+이미지 변형(variant) 생성
+원본 옆에 크기별 축소본을 '{파일명}_{변형}.{형식}'으로 저장합니다.
+예) /images/abc.png -> /images/abc_thumb.webp, /images/abc_card.webp, /images/abc_detail.webp
+
+- 업로드 시 utils.upload.save_image_upload에서 생성합니다.
+- 기존 이미지는 scripts/setup/generate_image_variants.py로 일괄 생성합니다.
+- 목록 화면은 thumb/card를 사용해 원본 대비 전송량을 줄입니다 (ProductResponse.image_variants).
+  응답은 product_images.variants에 저장된 값을 쓰므로 요청 중에는 파일을 확인하지 않습니다.
+"""
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from core.config import settings
+
+IMAGE_URL_PREFIX = "/images/"
+# (변형 이름, 긴 변 최대 픽셀) - 큰 것부터 생성해 다음 변형은 이전 결과에서 축소
+IMAGE_VARIANTS = (("detail", 1200), ("card", 480), ("thumb", 200))
+VARIANT_NAMES = tuple(name for name, _ in IMAGE_VARIANTS)
+SOURCE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+# 백엔드가 /images로 서빙하는 기본 이미지 디렉토리 (main.py)
+STATIC_IMAGES_DIR = Path(__file__).resolve().parent.parent / "static" / "images"
+
+_FORMAT_EXTENSIONS = {"webp": ".webp", "jpeg": ".jpg"}
+
+
+def _extension() -> str:
+    return _FORMAT_EXTENSIONS.get(settings.IMAGE_VARIANT_FORMAT.lower(), ".webp")
+
+
+def image_roots() -> List[Path]:
+    """/images/ 경로가 가리킬 수 있는 디렉토리 (업로드 디렉토리, 백엔드 static)"""
+    return [settings.get_upload_path(), STATIC_IMAGES_DIR]
+
+
+def is_variant(path: Path) -> bool:
+    """변형 파일 여부 (일괄 생성 시 원본만 처리하기 위함)"""
+    return any(path.stem.endswith(f"_{name}") for name in VARIANT_NAMES)
+
+
+def variant_path(path: Path, name: str) -> Path:
+    return path.with_name(f"{path.stem}_{name}{_extension()}")
+
+
+def variant_url(url: str, name: str) -> str:
+    stem, _ = os.path.splitext(url)
+    return f"{stem}_{name}{_extension()}"
+
+
+def variant_urls(url: str) -> Dict[str, str]:
+    return {name: variant_url(url, name) for name in VARIANT_NAMES}
+
+
+def variant_paths(path: Path) -> List[Path]:
+    """원본에 대해 생성될 수 있는 모든 변형 파일 경로 (형식 설정이 바뀐 경우 포함)"""
+    return [path.with_name(f"{path.stem}_{name}{extension}")
+            for name in VARIANT_NAMES for extension in set(_FORMAT_EXTENSIONS.values())]
+
+
+def generate_variants(path: Path, overwrite: bool = True) -> Dict[str, Path]:
+    """
+    원본 이미지의 변형들을 생성합니다 (CPU 작업이므로 스레드풀/프로세스풀에서 호출).
+    원본보다 크게 확대하지 않으며, 이미지로 읽을 수 없으면 PIL 예외(OSError 계열)가 발생합니다.
+    """
+    from PIL import Image, ImageOps
+
+    image_format = "JPEG" if _extension() == ".jpg" else "WEBP"
+    targets = {name: variant_path(path, name) for name in VARIANT_NAMES}
+    if not overwrite and all(target.exists() for target in targets.values()):
+        return targets
+
+    with Image.open(path) as original:
+        source = ImageOps.exif_transpose(original)
+        if image_format == "JPEG" and source.mode != "RGB":
+            # 투명 배경은 흰색으로
+            background = Image.new("RGB", source.size, "white")
+            rgba = source.convert("RGBA")
+            background.paste(rgba, mask=rgba.getchannel("A"))
+            source = background
+        elif source.mode not in ("RGB", "RGBA"):
+            source = source.convert("RGBA" if "transparency" in source.info or source.mode in ("LA", "PA") else "RGB")
+
+        for name, size in IMAGE_VARIANTS:
+            source = source.copy()
+            source.thumbnail((size, size), Image.LANCZOS)
+            source.save(targets[name], format=image_format, quality=settings.IMAGE_VARIANT_QUALITY)
+    return targets
+
+
+def remove_variants(path: Path):
+    """원본의 변형 파일들 삭제"""
+    for target in variant_paths(path):
+        target.unlink(missing_ok=True)
+
+
+def variants_for(url: Optional[str]) -> Optional[Dict[str, str]]:
+    """생성된 변형이 있으면 {원본, 변형별 URL}을 반환합니다."""
+    if not url or not url.startswith(IMAGE_URL_PREFIX):
+        return None
+    relative = url[len(IMAGE_URL_PREFIX):]
+    for root in image_roots():
+        if variant_path(root / relative, "thumb").exists():
+            return {"original": url, **variant_urls(url)}
+    return None
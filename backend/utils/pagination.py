@@ -0,0 +1,93 @@
+"""
+커서(keyset) 페이지네이션 유틸리티
+마지막으로 반환한 행의 정렬 키 값을 불투명한 토큰으로 인코딩합니다.
+OFFSET과 달리 페이지가 깊어져도 인덱스 범위 탐색 비용이 일정하고,
+조회 중 새 제품이 추가되어도 항목이 중복/누락되지 않습니다.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Sequence, Tuple
+
+from sqlalchemy import and_, or_, false, DateTime
+
+# (정렬 컬럼, 내림차순 여부)
+SortKey = Tuple[Any, bool]
+
+
+def _is_nullable(column) -> bool:
+    return column.property.columns[0].nullable
+
+
+def _is_datetime(column) -> bool:
+    return isinstance(column.property.columns[0].type, DateTime)
+
+
+def order_by_clauses(keys: Sequence[SortKey]) -> list:
+    """
+    정렬 키에 해당하는 ORDER BY 절을 생성합니다.
+    NULL은 가장 큰 값으로 취급합니다 (PostgreSQL 기본 동작과 같아 일반 인덱스를 그대로 사용).
+    """
+    clauses = []
+    for column, descending in keys:
+        clause = column.desc() if descending else column.asc()
+        if _is_nullable(column):
+            clause = clause.nulls_first() if descending else clause.nulls_last()
+        clauses.append(clause)
+    return clauses
+
+
+def keyset_condition(keys: Sequence[SortKey], values: Sequence[Any]):
+    """커서 위치 이후의 행만 선택하는 WHERE 조건을 생성합니다."""
+    conditions = []
+    equal_so_far = []
+    for (column, descending), value in zip(keys, values):
+        if value is None:
+            # NULL은 가장 큰 값: 오름차순이면 뒤에 올 값이 없고, 내림차순이면 NULL이 아닌 값이 뒤에 옴
+            after = column.isnot(None) if descending else false()
+            equal = column.is_(None)
+        else:
+            after = column < value if descending else column > value
+            if not descending and _is_nullable(column):
+                after = or_(after, column.is_(None))
+            equal = column == value
+        conditions.append(and_(*equal_so_far, after))
+        equal_so_far.append(equal)
+    return or_(*conditions)
+
+
+def encode_cursor(keys: Sequence[SortKey], item: dict, signature: str, position: int = 0) -> str:
+    """
+    조회 결과 항목의 정렬 키 값을 커서 토큰으로 인코딩합니다.
+    position은 커서 이전까지 반환한 항목 수로, 전체 개수 계산에 사용됩니다.
+    """
+    values = []
+    for column, _ in keys:
+        value = item[column.key]
+        values.append(value.isoformat() if isinstance(value, datetime) else value)
+    payload = json.dumps({"s": signature, "v": values, "p": position}, ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(keys: Sequence[SortKey], token: str, signature: str) -> Tuple[List[Any], int]:
+    """커서 토큰을 (정렬 키 값 목록, position)으로 디코딩합니다 (유효하지 않으면 ValueError)."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        values = payload["v"]
+        cursor_signature = payload["s"]
+        position = max(int(payload.get("p", 0)), 0)
+    except (ValueError, KeyError, TypeError, AttributeError, binascii.Error):
+        raise ValueError("유효하지 않은 커서입니다")
+    if cursor_signature != signature or not isinstance(values, list) or len(values) != len(keys):
+        raise ValueError("커서가 현재 정렬 조건과 일치하지 않습니다")
+    decoded = []
+    for (column, _), value in zip(keys, values):
+        if value is not None and _is_datetime(column):
+            try:
+                value = datetime.fromisoformat(value)
+            except (ValueError, TypeError):
+                raise ValueError("유효하지 않은 커서입니다")
+        decoded.append(value)
+    return decoded, position
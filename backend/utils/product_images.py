@@ -0,0 +1,211 @@
+"""
+제품 이미지 행 (product_images) 동기화
+SafetyProduct.file_path(JSON 배열)는 API 호환을 위해 그대로 두고, 같은 내용을 product_images 행으로
+유지해 이미지 조회를 인덱스 조인으로 처리합니다.
+
+- ORM으로 제품을 추가하거나 file_path를 바꾸면 flush 직전(before_flush)에 이미지 행을 다시 만듭니다.
+- Core INSERT(엑셀 가져오기)는 insert_images, 벌크 DELETE는 delete_images를 함께 호출합니다.
+- 기존 데이터는 scripts/migration/migrate_product_images.py로 채웁니다.
+
+이미지 행은 file_path의 모든 경로(/static/images/... 포함)를 담습니다. 크기/해상도/변형(메타데이터)은
+트랜잭션 안에서 파일을 열지 않도록 행에는 경로만 먼저 넣고,
+- 업로드 시 스레드풀에서 읽어 둔 값(remember_upload)이 있으면 그 값을 바로 쓰고,
+- 없으면 커밋 후 백그라운드 스레드가 파일을 읽어 같은 경로의 행을 UPDATE 합니다 (fill_metadata).
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, delete, event, insert, inspect, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from core.cache import TTLCache
+from core.config import settings
+from core.logger import get_logger
+from models.safety import ProductImage, SafetyProduct
+from utils import catalog_version, image_files, image_variants
+
+logger = get_logger(__name__)
+
+# 한 문장에 담는 최대 제품 id 수
+IMAGE_CHUNK_SIZE = 500
+
+# 업로드 시 읽어 둔 메타데이터 (경로 -> 값, 임대 기간 동안 보관 - 그 안에 제품에 연결됨)
+_uploaded: TTLCache = TTLCache(ttl=settings.IMAGE_UPLOAD_LEASE, maxsize=4096)
+
+# 커밋 후 메타데이터를 채울 경로 (session.info 키)
+_PENDING_KEY = "product_images_pending"
+
+# 메타데이터 채우기 (파일 I/O) 전용 백그라운드 스레드
+_filler = ThreadPoolExecutor(max_workers=1, thread_name_prefix="product-image-info")
+_fills: Set[Future] = set()
+_fills_lock = threading.Lock()
+
+
+def _image_info(path: str) -> Dict[str, Any]:
+    """이미지 파일 크기/해상도/변형 (파일을 찾을 수 없거나 읽을 수 없으면 None) - 파일 I/O, 트랜잭션 밖에서 호출"""
+    from PIL import Image
+
+    info = {"width": None, "height": None, "bytes": None, "variants": image_variants.variants_for(path)}
+    if not path.startswith(image_files.IMAGE_URL_PREFIX):
+        return info
+    relative = path[len(image_files.IMAGE_URL_PREFIX):]
+    for root in image_variants.image_roots():
+        local_path = root / relative
+        if not local_path.is_file():
+            continue
+        info["bytes"] = local_path.stat().st_size
+        try:
+            # 헤더만 읽으므로 전체 디코딩 비용은 없음
+            with Image.open(local_path) as image:
+                info["width"], info["height"] = image.size
+        except Exception:
+            pass
+        break
+    return info
+
+
+def remember_upload(path: str) -> Dict[str, Any]:
+    """
+    업로드한 이미지의 메타데이터를 읽어 둡니다 (업로드 라우트에서 스레드풀로 호출).
+    이후 이 경로로 만드는 이미지 행은 파일을 다시 읽지 않고 이 값을 씁니다.
+    """
+    info = _image_info(path)
+    _uploaded.set(path, info)
+    return info
+
+
+def image_rows(file_path: Optional[str]) -> Tuple[List[Dict[str, Any]], Set[str]]:
+    """
+    file_path 값 -> (product_images 행 값 목록 (position 순), 메타데이터를 나중에 채울 경로).
+    파일은 읽지 않습니다 - 업로드 시 읽어 둔 값이 없는 /images/ 경로는 메타데이터를 비워 둡니다.
+    """
+    rows = []
+    unknown = set()
+    for position, path in enumerate(image_files.parse_stored_paths(file_path)):
+        info = _uploaded.get(path)
+        if info is None and path.startswith(image_files.IMAGE_URL_PREFIX):
+            unknown.add(path)
+        rows.append({"position": position, "path": path, **(info or {})})
+    return rows, unknown
+
+
+def _defer_fill(session: Session, paths: Set[str]) -> None:
+    if paths:
+        session.info.setdefault(_PENDING_KEY, set()).update(paths)
+
+
+def fill_metadata(bind: Engine, paths: Iterable[str]) -> int:
+    """
+    경로별로 파일을 읽어 해당 경로의 이미지 행 메타데이터를 UPDATE 합니다 (동기, 파일은 트랜잭션 밖에서 읽음).
+    공개 응답 캐시가 새 값을 쓰도록 행이 바뀌면 카탈로그 버전을 올립니다. 바꾼 행 수를 반환합니다.
+    """
+    values = []
+    for path in sorted(set(paths)):
+        info = _image_info(path)
+        # 파일도 변형도 없으면 행의 빈 값 그대로 (UPDATE/버전 증가 없음)
+        if any(value is not None for value in info.values()):
+            values.append({"_path": path, **{f"_{key}": value for key, value in info.items()}})
+    if not values:
+        return 0
+    statement = (
+        update(ProductImage.__table__)
+        .where(ProductImage.__table__.c.path == bindparam("_path"))
+        .values(width=bindparam("_width"), height=bindparam("_height"),
+                bytes=bindparam("_bytes"), variants=bindparam("_variants"))
+    )
+    with Session(bind=bind) as session:
+        updated = session.connection().execute(statement, values).rowcount
+        if updated:
+            catalog_version.mark_changed(session)
+        session.commit()
+    return updated
+
+
+def _fill_in_background(bind: Engine, paths: Set[str]) -> None:
+    def run():
+        try:
+            fill_metadata(bind, paths)
+        except Exception as e:
+            logger.warning(f"이미지 메타데이터 채우기 실패 ({len(paths)}개 경로): {e}")
+
+    future = _filler.submit(run)
+    with _fills_lock:
+        _fills.add(future)
+    future.add_done_callback(_discard_fill)
+
+
+def _discard_fill(future: Future) -> None:
+    with _fills_lock:
+        _fills.discard(future)
+
+
+def wait_for_metadata(timeout: Optional[float] = None) -> None:
+    """예약된 메타데이터 채우기가 끝날 때까지 기다립니다 (스크립트/테스트용)."""
+    with _fills_lock:
+        pending = list(_fills)
+    wait(pending, timeout=timeout)
+
+
+def product_image_paths(product: SafetyProduct) -> List[str]:
+    """제품 이미지 경로 목록 (이미지 행이 아직 없는 기존 데이터는 file_path에서)"""
+    if product.images:
+        # 업로드 이미지(/images/)만 - 파일 정리/참조 수 대상
+        return [image.path for image in product.images if image.path.startswith(image_files.IMAGE_URL_PREFIX)]
+    return image_files.parse_image_paths(product.file_path)
+
+
+def insert_images(db: Session, products: Iterable[Tuple[int, Optional[str]]]) -> int:
+    """
+    (제품 id, file_path) 목록의 이미지 행을 한 번에 INSERT 합니다 (Core INSERT로 만든 제품용).
+    메타데이터가 없는 경로는 커밋 후 백그라운드에서 채웁니다.
+    """
+    rows = []
+    for product_id, file_path in products:
+        product_rows, unknown = image_rows(file_path)
+        rows.extend({"product_id": product_id, **row} for row in product_rows)
+        _defer_fill(db, unknown)
+    if rows:
+        db.execute(insert(ProductImage), rows)
+    return len(rows)
+
+
+def delete_images(db: Session, product_ids: List[int]) -> None:
+    """제품들의 이미지 행 삭제 (벌크 DELETE 전에 호출 - SQLite는 외래 키 CASCADE가 꺼져 있음)"""
+    for start in range(0, len(product_ids), IMAGE_CHUNK_SIZE):
+        chunk = product_ids[start:start + IMAGE_CHUNK_SIZE]
+        db.execute(
+            delete(ProductImage).where(ProductImage.product_id.in_(chunk)).execution_options(synchronize_session=False)
+        )
+
+
+def sync_images(product: SafetyProduct, session: Session) -> None:
+    """제품의 이미지 관계를 file_path 내용으로 다시 채웁니다."""
+    rows, unknown = image_rows(product.file_path)
+    product.images = [ProductImage(**row) for row in rows]
+    _defer_fill(session, unknown)
+
+
+@event.listens_for(Session, "before_flush")
+def _sync_on_flush(session: Session, flush_context, instances):
+    for obj in list(session.new):
+        if isinstance(obj, SafetyProduct):
+            sync_images(obj, session)
+    for obj in list(session.dirty):
+        if isinstance(obj, SafetyProduct) and inspect(obj).attrs.file_path.history.has_changes():
+            sync_images(obj, session)
+
+
+@event.listens_for(Session, "after_commit")
+def _fill_after_commit(session: Session):
+    paths = session.info.pop(_PENDING_KEY, None)
+    if paths:
+        _fill_in_background(session.get_bind(), paths)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session):
+    # SAVEPOINT 롤백은 남김 (행이 없는 경로는 UPDATE 대상이 없을 뿐)
+    if not session.in_nested_transaction():
+        session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,195 @@
+"""
+제품 일괄 가져오기 엔진
+엑셀 업로드 경로(/products/import, /excel/import)가 공통으로 사용합니다.
+
+- 카테고리 코드 -> ID 맵을 한 번만 조회합니다.
+- 행을 검증/변환해 청크 단위로 모은 뒤 INSERT ... VALUES (...), (...) RETURNING id 로 한 번에 넣습니다.
+- 전체를 한 트랜잭션으로 처리하고 커밋은 호출하는 쪽에서 합니다.
+- 이미지 행(product_images)도 청크마다 한 번에 넣습니다.
+- 청크 INSERT가 실패하면(제약 조건 위반 등) 해당 청크만 SAVEPOINT로 한 행씩 다시 넣어
+  실패한 행 번호와 오류를 그대로 보고합니다.
+"""
+import json
+import math
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from core.logger import get_logger
+from models.safety import SafetyCategory, SafetyProduct
+from utils import catalog_stats, image_files, product_images
+
+logger = get_logger(__name__)
+
+IMPORT_CHUNK_SIZE = 1000
+DEFAULT_IMAGE_PATH = image_files.DEFAULT_IMAGE_PATH
+TRUE_VALUES = {"예", "Y", "YES", "TRUE", "1"}
+
+
+class ImportRowError(ValueError):
+    """행 검증 실패 (행 단위 오류로 보고)"""
+
+
+def load_category_map(db: Session) -> Dict[str, int]:
+    """카테고리 코드 -> ID 맵"""
+    return dict(db.execute(select(SafetyCategory.code, SafetyCategory.id)).all())
+
+
+def _blank(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value)) or (isinstance(value, str) and not value.strip())
+
+
+def _text(value: Any) -> Optional[str]:
+    if _blank(value):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _number(value: Any, label: str, cast):
+    if _blank(value):
+        return None
+    try:
+        return cast(float(value))
+    except (TypeError, ValueError):
+        raise ImportRowError(f"{label} 값이 숫자가 아닙니다: {value}")
+
+
+def _flag(value: Any) -> int:
+    if _blank(value):
+        return 0
+    if isinstance(value, str):
+        return 1 if value.strip().upper() in TRUE_VALUES else 0
+    return 1 if value else 0
+
+
+def _images(value: Any) -> Tuple[str, str]:
+    """이미지경로 셀 값 -> (file_name, file_path JSON)"""
+    text = _text(value)
+    if not text:
+        return os.path.basename(DEFAULT_IMAGE_PATH), json.dumps([DEFAULT_IMAGE_PATH])
+    try:
+        paths = json.loads(text)
+    except ValueError:
+        paths = [path.strip() for path in text.split(",") if path.strip()]
+    if not isinstance(paths, list):
+        paths = [str(paths)]
+    if not paths:
+        paths = [DEFAULT_IMAGE_PATH]
+    return os.path.basename(paths[0]), json.dumps(paths)
+
+
+class ProductImporter:
+    """
+    사용법:
+        importer = ProductImporter(db, required=("name", "category_code"))
+        for row_number, values in rows:
+            importer.add(row_number, values)
+        result = importer.finish()
+        db.commit()
+
+    values 키: category_code, name, model_number, price, description, specifications,
+    stock_status, image_path, display_order, is_featured
+
+    on_progress가 있으면 청크를 INSERT할 때마다 호출합니다 (백그라운드 작업 진행률).
+    """
+
+    def __init__(self, db: Session, required: Iterable[str] = ("name", "category_code"),
+                 chunk_size: int = IMPORT_CHUNK_SIZE,
+                 on_progress: Optional[Callable[["ProductImporter"], None]] = None):
+        self.db = db
+        self.required = tuple(required)
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.category_map = load_category_map(db)
+        self.total = 0
+        self.created: List[Dict[str, Any]] = []
+        self.errors: List[Dict[str, Any]] = []
+        self._pending: List[Tuple[int, Dict[str, Any]]] = []
+        self._categories = set()  # 제품을 추가한 카테고리 (대시보드 통계 갱신용)
+
+    def _convert(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        missing = [field for field in self.required if _blank(values.get(field))]
+        if missing:
+            labels = {"name": "제품명", "model_number": "모델번호", "category_code": "카테고리코드"}
+            raise ImportRowError(f"필수 필드 누락 ({', '.join(labels.get(field, field) for field in missing)})")
+
+        category_code = _text(values.get("category_code"))
+        if category_code not in self.category_map:
+            raise ImportRowError(f"존재하지 않는 카테고리 코드: {category_code}")
+
+        file_name, file_path = _images(values.get("image_path"))
+        # INSERT 한 문장에 들어가는 행은 모두 같은 키를 가져야 하므로 항상 전체 컬럼을 채움
+        return {
+            "category_id": self.category_map[category_code],
+            "name": _text(values.get("name")),
+            "model_number": _text(values.get("model_number")),
+            "price": _number(values.get("price"), "가격", float),
+            "description": _text(values.get("description")),
+            "specifications": _text(values.get("specifications")),
+            "stock_status": _text(values.get("stock_status")) or "in_stock",
+            "file_name": file_name,
+            "file_path": file_path,
+            "display_order": _number(values.get("display_order"), "표시순서", int) or 0,
+            "is_featured": _flag(values.get("is_featured")),
+        }
+
+    def add(self, row_number: int, values: Dict[str, Any]):
+        """행 하나를 검증해 대기열에 넣습니다 (청크가 차면 INSERT)."""
+        self.total += 1
+        try:
+            product = self._convert(values)
+        except ImportRowError as e:
+            self.errors.append({"row": row_number, "error": str(e)})
+            return
+        self._pending.append((row_number, product))
+        if len(self._pending) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """대기 중인 행을 INSERT 합니다."""
+        if not self._pending:
+            return
+        chunk, self._pending = self._pending, []
+        self._insert_chunk(chunk)
+        if self.on_progress is not None:
+            self.on_progress(self)
+
+    def _insert_chunk(self, chunk: List[Tuple[int, Dict[str, Any]]]):
+        statement = insert(SafetyProduct).returning(SafetyProduct.id, sort_by_parameter_order=True)
+        try:
+            with self.db.begin_nested():
+                ids = self.db.execute(statement, [product for _, product in chunk]).scalars().all()
+        except SQLAlchemyError as e:
+            logger.warning(f"제품 가져오기 청크 INSERT 실패, 행 단위로 재시도: {e}")
+            self._insert_rows(chunk)
+            return
+        product_images.insert_images(self.db, [(product_id, product["file_path"]) for (_, product), product_id in zip(chunk, ids)])
+        for (row_number, product), product_id in zip(chunk, ids):
+            self.created.append({"row": row_number, "id": product_id, "name": product["name"]})
+            self._categories.add(product["category_id"])
+
+    def _insert_rows(self, chunk: List[Tuple[int, Dict[str, Any]]]):
+        statement = insert(SafetyProduct).returning(SafetyProduct.id)
+        for row_number, product in chunk:
+            try:
+                with self.db.begin_nested():
+                    product_id = self.db.execute(statement, [product]).scalar_one()
+                    product_images.insert_images(self.db, [(product_id, product["file_path"])])
+            except SQLAlchemyError as e:
+                self.errors.append({"row": row_number, "error": str(getattr(e, "orig", e))})
+                continue
+            self.created.append({"row": row_number, "id": product_id, "name": product["name"]})
+            self._categories.add(product["category_id"])
+
+    def finish(self) -> "ProductImporter":
+        """남은 행을 INSERT 하고 자신을 반환합니다 (커밋은 호출하는 쪽에서)."""
+        self.flush()
+        self.errors.sort(key=lambda error: error["row"])
+        # 제품을 추가한 카테고리의 대시보드 통계 다시 집계
+        catalog_stats.refresh_categories(self.db, self._categories)
+        return self
@@ -0,0 +1,92 @@
+"""
+제품 텍스트 검색
+검색어를 공백 단위로 나누어 모든 단어가 포함된 제품만 찾고(AND), 관련도 점수로 정렬합니다.
+
+- PostgreSQL: pg_trgm GIN 인덱스(models.safety.PRODUCT_SEARCH_INDEXES)로 '%단어%' 검색을
+  순차 스캔 없이 처리하고, 제품명 trigram 유사도를 관련도 점수에 더합니다.
+- SQLite 등: 같은 조건을 LIKE로 처리합니다 (테스트/개발용, 유사도 점수 없음).
+
+한국어는 '산업용안전모'처럼 띄어쓰기 없이 붙여 쓰는 경우가 많아 단어 단위 tsvector 대신
+부분 문자열 검색을 인덱스로 지원하는 trigram 방식을 사용합니다.
+"""
+from typing import List
+
+from sqlalchemy import Float, and_, case, cast, func, literal, or_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+from models.safety import SafetyProduct
+
+# 검색 대상 컬럼과 단어가 포함될 때의 관련도 가중치
+SEARCH_COLUMNS = [
+    (SafetyProduct.name, 30),
+    (SafetyProduct.model_number, 20),
+    (SafetyProduct.description, 5),
+    (SafetyProduct.specifications, 2),
+]
+NAME_EXACT_WEIGHT = 100
+NAME_PREFIX_WEIGHT = 50
+NAME_SIMILARITY_WEIGHT = 10
+MAX_SEARCH_TERMS = 8
+
+
+class name_similarity(FunctionElement):
+    """제품명과 검색어의 trigram 유사도 (0~1, pg_trgm이 없는 DB에서는 0)"""
+
+    type = Float()
+    inherit_cache = True
+
+
+@compiles(name_similarity)
+def _compile_similarity_default(element, compiler, **kw):
+    return "0"
+
+
+@compiles(name_similarity, "postgresql")
+def _compile_similarity_postgresql(element, compiler, **kw):
+    return "similarity(%s)" % compiler.process(element.clauses, **kw)
+
+
+def search_terms(query: str) -> List[str]:
+    """검색어를 공백 기준 단어 목록으로 나눕니다 (중복 제거, 최대 MAX_SEARCH_TERMS개)."""
+    terms = []
+    for term in (query or "").split():
+        if term.lower() not in (t.lower() for t in terms):
+            terms.append(term)
+    return terms[:MAX_SEARCH_TERMS]
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _contains(column, term: str):
+    # 패턴 전체를 하나의 파라미터로 전달해야 prepared statement에서도 trigram 인덱스를 사용
+    return column.ilike(f"%{_escape_like(term)}%", escape="\\")
+
+
+def search_condition(query: str, columns=None):
+    """모든 검색 단어가 검색 대상 컬럼 중 하나에 포함된 제품을 찾는 WHERE 조건 (검색어가 없으면 None)"""
+    columns = columns or [column for column, _ in SEARCH_COLUMNS]
+    terms = search_terms(query)
+    if not terms:
+        return None
+    return and_(*[or_(*[_contains(column, term) for column in columns]) for term in terms])
+
+
+def relevance_score(query: str):
+    """검색어와의 관련도 점수 (높을수록 관련도 높음)"""
+    terms = search_terms(query)
+    if not terms:
+        return literal(0)
+    score = NAME_SIMILARITY_WEIGHT * name_similarity(SafetyProduct.name, " ".join(terms))
+    for term in terms:
+        escaped = _escape_like(term)
+        score = score + case(
+            (func.lower(SafetyProduct.name) == term.lower(), NAME_EXACT_WEIGHT),
+            (SafetyProduct.name.ilike(f"{escaped}%", escape="\\"), NAME_PREFIX_WEIGHT),
+            else_=0,
+        )
+        for column, weight in SEARCH_COLUMNS:
+            score = score + case((_contains(column, term), weight), else_=0)
+    return cast(score, Float)
@@ -0,0 +1,260 @@
+"""
+공유 응답 캐시
+공개 API의 직렬화된 JSON 응답을 캐시 백엔드(core.cache_backend)에 저장해
+여러 워커/컨테이너가 함께 사용하고, 배포 직후에도 다른 워커가 채운 캐시를 재사용합니다.
+
+태그 무효화: 각 태그는 백엔드의 카운터이며, 항목은 저장 시점의 태그 버전을 함께 저장합니다.
+조회 시 한 번의 MGET으로 항목과 현재 태그 버전을 읽어 다르면 무효로 처리하므로,
+응답을 만드는 도중 무효화가 일어나도 오래된 데이터가 남지 않습니다.
+
+제품/카테고리 변경은 세션 커밋 시점(after_commit)에 관련 태그를 무효화합니다.
+공개 카탈로그 응답의 키에는 카탈로그 버전(utils.catalog_version)이 들어가므로, 태그 무효화가 닿지 않는
+다른 워커의 memory 백엔드나 무효화에 실패한 경우에도 새 버전이 보이면 이전 항목은 쓰이지 않습니다.
+
+네트워크 백엔드(redis)의 무효화는 이벤트 루프와 커밋을 막지 않도록 전용 스레드에서 실행하며,
+실패하면 항목이 만료될 때까지(RESPONSE_CACHE_TTL) 간격을 늘려 가며 다시 시도합니다.
+"""
+import json
+import queue
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi import Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from core.cache_backend import CacheBackend, MemoryCacheBackend, RedisCacheBackend
+from core.config import settings
+from core.logger import get_logger
+from models.safety import SafetyCategory, SafetyProduct
+
+logger = get_logger(__name__)
+
+# 태그
+TAG_PRODUCTS = "products"  # 제품 목록
+TAG_PRODUCT_DETAILS = "product-details"  # 전체 제품 상세 (벌크 변경 시)
+TAG_CATEGORIES = "categories"
+TAG_SETTINGS = "settings"
+
+_ENTRY_PREFIX = "resp:"
+_TAG_PREFIX = "tag:"
+# 백엔드 오류 후 캐시를 건너뛰는 시간 (초) - Redis 장애 시 요청마다 타임아웃을 기다리지 않도록
+_FAILURE_BACKOFF = 30.0
+# 무효화 재시도 간격 (초, 실패할 때마다 두 배, 최대값)
+_INVALIDATE_RETRY_DELAY = 0.1
+_INVALIDATE_RETRY_MAX_DELAY = 5.0
+
+Built = Tuple[bytes, Dict[str, str]]
+
+
+def product_tag(product_id: int) -> str:
+    return f"product:{product_id}"
+
+
+def _create_backend() -> Optional[CacheBackend]:
+    kind = settings.RESPONSE_CACHE_BACKEND.lower()
+    if kind == "none" or settings.RESPONSE_CACHE_TTL <= 0:
+        return None
+    if kind == "redis":
+        return RedisCacheBackend.from_url(settings.REDIS_URL, prefix=settings.RESPONSE_CACHE_PREFIX)
+    return MemoryCacheBackend(maxsize=settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+_backend: Optional[CacheBackend] = _create_backend()
+_disabled_until = 0.0
+
+
+def set_backend(backend: Optional[CacheBackend]) -> Optional[CacheBackend]:
+    """캐시 백엔드를 교체하고 이전 백엔드를 반환합니다 (None이면 캐시 사용 안 함)."""
+    global _backend, _disabled_until
+    previous, _backend, _disabled_until = _backend, backend, 0.0
+    return previous
+
+
+def _available() -> Optional[CacheBackend]:
+    if _backend is None or time.monotonic() < _disabled_until:
+        return None
+    return _backend
+
+
+def _failed(action: str, error: Exception):
+    global _disabled_until
+    _disabled_until = time.monotonic() + _FAILURE_BACKOFF
+    logger.warning(f"응답 캐시 {action} 실패, {_FAILURE_BACKOFF:.0f}초간 캐시 없이 처리: {error}")
+
+
+async def _call(backend: CacheBackend, method, *args):
+    if backend.blocking:
+        return await run_in_threadpool(method, *args)
+    return method(*args)
+
+
+def _tag_version(value: Optional[bytes]) -> int:
+    return int(value) if value is not None else 0
+
+
+def _encode(versions: List[int], headers: Dict[str, str], body: bytes) -> bytes:
+    meta = json.dumps({"t": versions, "h": headers}, separators=(",", ":")).encode("utf-8")
+    return meta + b"\n" + body
+
+
+def _decode(value: bytes) -> Optional[Tuple[List[int], Dict[str, str], bytes]]:
+    meta, _, body = value.partition(b"\n")
+    try:
+        data = json.loads(meta)
+        return data["t"], data["h"], body
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+async def fetch(key: str, tags: Sequence[str], build: Callable[[], Awaitable[Built]]) -> Built:
+    """
+    캐시된 (본문, 헤더)를 반환하거나, 없으면 build()로 만들어 저장합니다.
+    build()에서 발생한 예외(HTTPException 등)는 그대로 전달되며 캐시하지 않습니다.
+    """
+    backend = _available()
+    if backend is None:
+        return await build()
+
+    try:
+        values = await _call(backend, backend.mget, [_ENTRY_PREFIX + key] + [_TAG_PREFIX + tag for tag in tags])
+    except Exception as e:
+        _failed("조회", e)
+        return await build()
+
+    versions = [_tag_version(value) for value in values[1:]]
+    entry = _decode(values[0]) if values[0] is not None else None
+    if entry is not None and entry[0] == versions:
+        return entry[2], entry[1]
+
+    body, headers = await build()
+    try:
+        await _call(backend, backend.set, _ENTRY_PREFIX + key, _encode(versions, headers, body), settings.RESPONSE_CACHE_TTL)
+    except Exception as e:
+        _failed("저장", e)
+    return body, headers
+
+
+async def json_response(key: str, tags: Sequence[str], build: Callable[[], Awaitable[Built]]) -> Response:
+    """캐시된 JSON 응답 (fetch 결과를 Response로 감쌈)"""
+    body, headers = await fetch(key, tags, build)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _invalidate(backend: CacheBackend, tags: List[str]):
+    deadline = time.monotonic() + settings.RESPONSE_CACHE_TTL
+    delay = _INVALIDATE_RETRY_DELAY
+    attempt = 0
+    while True:
+        try:
+            for tag in tags:
+                backend.incr(_TAG_PREFIX + tag)
+            return
+        except Exception as e:
+            if attempt == 0:
+                _failed("무효화", e)
+            attempt += 1
+            # 항목이 만료될 때까지만 재시도 (그 뒤에는 남은 항목이 없음)
+            if time.monotonic() + delay >= deadline:
+                logger.error(f"응답 캐시 태그 무효화 포기 ({attempt}회 실패, 남은 항목은 만료로 정리): {tags}")
+                return
+            time.sleep(delay)
+            delay = min(delay * 2, _INVALIDATE_RETRY_MAX_DELAY)
+
+
+# 네트워크 백엔드 무효화 대기열 (데몬 스레드 하나가 순서대로 처리 - 장애 중 재시도가 종료를 막지 않도록)
+_invalidations: "queue.Queue[Tuple[CacheBackend, List[str]]]" = queue.Queue()
+_invalidator: Optional[threading.Thread] = None
+_invalidator_lock = threading.Lock()
+
+
+def _run_invalidations():
+    while True:
+        backend, tags = _invalidations.get()
+        try:
+            _invalidate(backend, tags)
+        finally:
+            _invalidations.task_done()
+
+
+def _schedule_invalidation(backend: CacheBackend, tags: List[str]):
+    global _invalidator
+    with _invalidator_lock:
+        if _invalidator is None or not _invalidator.is_alive():
+            _invalidator = threading.Thread(target=_run_invalidations, name="cache-invalidate", daemon=True)
+            _invalidator.start()
+    _invalidations.put((backend, tags))
+
+
+def invalidate_tags(tags: Iterable[str]):
+    """
+    태그가 붙은 캐시 항목을 모두 무효화합니다.
+    이 워커가 장애로 캐시 조회를 쉬는 중이어도 공유 백엔드의 항목은 무효화해야 하므로 항상 시도하며,
+    네트워크 백엔드는 전용 스레드에서 실행하고 바로 반환합니다.
+    """
+    backend = _backend
+    tags = sorted(set(tags))
+    if backend is None or not tags:
+        return
+    if backend.blocking:
+        _schedule_invalidation(backend, tags)
+    else:
+        _invalidate(backend, tags)
+
+
+def wait_for_invalidations():
+    """예약된 무효화가 끝날 때까지 기다립니다 (테스트용)."""
+    _invalidations.join()
+
+
+def clear():
+    """전체 캐시 삭제"""
+    if _backend is not None:
+        _backend.clear()
+
+
+# ---------------------------------------------------------------------------
+# 변경 감지 (커밋된 변경만 무효화)
+# ---------------------------------------------------------------------------
+_PENDING_KEY = "response_cache_tags"
+_TABLE_TAGS = {
+    SafetyProduct.__tablename__: {TAG_PRODUCTS, TAG_PRODUCT_DETAILS},
+    # 제품 응답에 카테고리명이 포함되므로 카테고리 변경 시 제품 캐시도 무효화
+    SafetyCategory.__tablename__: {TAG_CATEGORIES, TAG_PRODUCTS, TAG_PRODUCT_DETAILS},
+}
+
+
+def _pending(session: Session) -> set:
+    return session.info.setdefault(_PENDING_KEY, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_tags(session: Session, flush_context):
+    tags = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, SafetyProduct):
+            tags.update((TAG_PRODUCTS, product_tag(obj.id)))
+        elif isinstance(obj, SafetyCategory):
+            tags.update(_TABLE_TAGS[SafetyCategory.__tablename__])
+    if tags:
+        _pending(session).update(tags)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_tags(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    tags = _TABLE_TAGS.get(getattr(table, "name", None))
+    if tags:
+        _pending(orm_execute_state.session).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session):
+    # 롤백된 트랜잭션의 태그는 다음 커밋 때 함께 무효화될 수 있으나 불필요한 무효화일 뿐 안전함
+    tags = session.info.pop(_PENDING_KEY, None)
+    if tags:
+        invalidate_tags(tags)
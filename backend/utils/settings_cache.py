@@ -0,0 +1,76 @@
+"""
+사이트 설정 캐시
+공개 API(GET /api/settings)는 매 페이지 렌더링마다 호출되므로
+공개 필드만 직렬화한 스냅샷을 메모리에 두고 ETag와 함께 제공합니다.
+설정 변경(crud.settings) 시 refresh()로 즉시 갱신되며, 직렬화된 설정은 공유 응답 캐시에도 저장됩니다.
+"""
+import itertools
+import json
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.cache import TTLCache
+from core.config import settings
+from core.http_cache import make_etag
+from models.settings import SiteSettings, DEFAULT_SITE_SETTINGS
+from schemas.settings import SiteSettingsPublic
+from utils import response_cache
+
+_SNAPSHOT_KEY = "site_settings"
+_cache = TTLCache(ttl=settings.SETTINGS_CACHE_TTL, maxsize=1)
+_versions = itertools.count(1)
+
+
+class SettingsSnapshot:
+    """직렬화된 공개 설정과 버전/ETag"""
+
+    def __init__(self, data: dict):
+        self.data = data
+        self.body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.etag = make_etag(self.body.decode("utf-8"))
+        self.version = next(_versions)
+
+
+def _build_snapshot(site_settings: Optional[SiteSettings]) -> SettingsSnapshot:
+    if site_settings is None:
+        # 아직 설정 행이 없으면 기본값 (생성은 애플리케이션 시작 시 처리)
+        data = {field: None for field in SiteSettingsPublic.model_fields}
+        data.update(DEFAULT_SITE_SETTINGS)
+        return SettingsSnapshot(SiteSettingsPublic(**data).model_dump(mode="json"))
+    return SettingsSnapshot(SiteSettingsPublic.model_validate(site_settings).model_dump(mode="json"))
+
+
+async def get_snapshot(db: AsyncSession) -> SettingsSnapshot:
+    """캐시된 설정 스냅샷을 반환합니다 (없으면 DB에서 읽어 채움, INSERT 하지 않음)."""
+    snapshot = _cache.get(_SNAPSHOT_KEY)
+    if snapshot is not None:
+        return snapshot
+
+    generation = _cache.generation
+
+    async def build():
+        result = await db.execute(select(SiteSettings).order_by(SiteSettings.id).limit(1))
+        return _build_snapshot(result.scalars().first()).body, {}
+
+    # 다른 워커가 채운 공유 캐시가 있으면 DB 조회 없이 사용
+    body, _ = await response_cache.fetch(_SNAPSHOT_KEY, [response_cache.TAG_SETTINGS], build)
+    snapshot = SettingsSnapshot(json.loads(body))
+    _cache.set(_SNAPSHOT_KEY, snapshot, generation=generation)
+    return snapshot
+
+
+def refresh(site_settings: SiteSettings) -> SettingsSnapshot:
+    """변경된 설정으로 스냅샷을 갱신합니다 (공유 캐시는 무효화하여 다른 워커도 다시 읽도록 함)."""
+    _cache.clear()
+    response_cache.invalidate_tags([response_cache.TAG_SETTINGS])
+    snapshot = _build_snapshot(site_settings)
+    _cache.set(_SNAPSHOT_KEY, snapshot)
+    return snapshot
+
+
+def invalidate():
+    """설정 캐시 무효화"""
+    _cache.clear()
+    response_cache.invalidate_tags([response_cache.TAG_SETTINGS])
@@ -0,0 +1,440 @@
+"""
+검색어 자동완성 인덱스
+제품명, 모델번호, 카테고리명을 정렬된 접두어 배열로 메모리에 올려두고
+/api/search/suggestions 요청을 DB 조회 없이 이진 탐색으로 처리합니다.
+
+- 한글은 자모 단위로 분해해 색인하므로 입력 중인 글자('안ㅈ', '안저')도 '안전모'와 일치합니다.
+- 초성만 입력한 경우('ㅇㅈㅁ')는 초성 색인에서 찾습니다.
+- 단어 시작 위치마다 색인하므로 '안전모'로 '테스트 안전모'도 찾습니다.
+
+제품/카테고리 변경은 세션 커밋 시점(after_commit)에 인덱스에 바로 반영됩니다.
+벌크 UPDATE/DELETE/INSERT(일괄 수정, 엑셀 가져오기)처럼 개별 행을 알 수 없는 변경과 다른 워커의 변경
+(요청 카탈로그 버전이 인덱스 버전보다 높음)은 다음 조회 때 따라잡기(sync)로 반영합니다.
+따라잡기는 마지막 반영 이후 created_at/updated_at이 바뀐 제품만 읽어 항목별로 갱신하고, 제품 id 목록과
+카테고리 목록으로 삭제를 정리합니다. 전체 재구성은 처음 구성할 때, SUGGESTION_INDEX_TTL이 지났을 때
+(시각을 남기지 않는 직접 SQL 변경 등에 대한 상한), 따라잡을 변경이 너무 많을 때만 합니다.
+재구성/따라잡기는 워커당 하나만 실행하고 (그동안 다른 요청은 기존 인덱스로 응답),
+자모 분해와 정렬은 스레드풀에서 처리해 이벤트 루프를 막지 않습니다.
+"""
+import bisect
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+from models.safety import SafetyCategory, SafetyProduct
+from utils import catalog_version
+
+# ---------------------------------------------------------------------------
+# 한글 분해
+# ---------------------------------------------------------------------------
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSEONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+              "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+# 입력 도중에는 겹모음/겹받침이 두 글자로 나뉘어 있으므로 기본 자모로 풀어서 비교
+_COMPOUND_JAMO = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+_CONSONANTS = set(_CHOSEONG)
+_WORD_START = re.compile(r"(?:^|(?<=[\s\-_/(\[]))\S")
+
+
+def _normalize(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def decompose(text: str) -> str:
+    """한글 음절을 기본 자모 나열로 분해합니다 (그 외 문자는 그대로)."""
+    result = []
+    for char in text:
+        code = ord(char)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            offset = code - _HANGUL_BASE
+            jamo = _CHOSEONG[offset // 588] + _JUNGSEONG[(offset % 588) // 28] + _JONGSEONG[offset % 28]
+            result.append("".join(_COMPOUND_JAMO.get(j, j) for j in jamo))
+        else:
+            result.append(_COMPOUND_JAMO.get(char, char))
+    return "".join(result)
+
+
+def choseong(text: str) -> str:
+    """한글 음절을 초성으로 바꿉니다 (그 외 문자는 그대로)."""
+    result = []
+    for char in text:
+        code = ord(char)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            result.append(_CHOSEONG[(code - _HANGUL_BASE) // 588])
+        else:
+            result.append(char)
+    return "".join(result)
+
+
+def _is_choseong_query(text: str) -> bool:
+    letters = text.replace(" ", "")
+    return bool(letters) and all(char in _CONSONANTS for char in letters)
+
+
+# ---------------------------------------------------------------------------
+# 인덱스
+# ---------------------------------------------------------------------------
+# 항목 종류별 우선순위 (같은 조건이면 제품명 > 카테고리명 > 모델번호)
+_KIND_ORDER = {"product": 0, "category": 1, "model": 2}
+# 짧은 검색어는 일치 항목이 많으므로 순위 계산 후보 수를 제한
+_MAX_CANDIDATES = 200
+# 따라잡기 시 시각 비교 여유 (PostgreSQL now()는 트랜잭션 시작 시각이라 늦게 커밋된 변경도 포함하도록)
+_SYNC_OVERLAP = timedelta(seconds=60)
+# 따라잡을 제품이 이보다 많으면 항목별 반영 대신 전체 재구성
+_SYNC_MAX_CHANGES = 1000
+
+REBUILD = "rebuild"
+SYNC = "sync"
+
+EntryId = Tuple[str, int]
+
+
+class _Entry:
+    __slots__ = ("text", "kind", "featured", "keys")
+
+    def __init__(self, text: str, kind: str, featured: bool):
+        self.text = text
+        self.kind = kind
+        self.featured = featured
+        self.keys: List[tuple] = []
+
+
+class SuggestionIndex:
+    """정렬된 (자모 키, 항목) 배열 기반 접두어 검색 인덱스 (스레드 안전)"""
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[EntryId, _Entry] = {}
+        self._jamo_keys: List[tuple] = []
+        self._choseong_keys: List[tuple] = []
+        self._built_at: Optional[float] = None
+        # 벌크 변경 등으로 다음 조회 때 따라잡기가 필요함
+        self._behind = False
+        # 다음 따라잡기에서 읽을 변경 시각 (DB 시각)
+        self.synced_at: Optional[datetime] = None
+        # 변경이 있을 때마다 증가 - 재구성/따라잡기 도중 들어온 변경을 놓치지 않도록 사용
+        self.generation = 0
+        # 인덱스에 반영된 카탈로그 버전
+        self.version = 0
+
+    # -- 조회 ---------------------------------------------------------------
+    @property
+    def built(self) -> bool:
+        with self._lock:
+            return self._built_at is not None
+
+    def refresh_mode(self, version: int = 0) -> Optional[str]:
+        """필요한 갱신 (REBUILD: 전체 재구성, SYNC: 따라잡기, None: 최신)"""
+        with self._lock:
+            if self._built_at is None or self.synced_at is None:
+                return REBUILD
+            if self.ttl is not None and time.monotonic() - self._built_at >= self.ttl:
+                return REBUILD
+            if self._behind or self.version < version:
+                return SYNC
+            return None
+
+    def search(self, query: str, limit: int = 5) -> List[str]:
+        """접두어가 일치하는 제안 문구를 관련도 순으로 반환합니다."""
+        text = _normalize(query)
+        if not text or limit <= 0:
+            return []
+        choseong_only = _is_choseong_query(text)
+        prefix = text if choseong_only else decompose(text)
+
+        with self._lock:
+            keys = self._choseong_keys if choseong_only else self._jamo_keys
+            candidates: Dict[str, tuple] = {}
+            start = bisect.bisect_left(keys, (prefix,))
+            for index in range(start, min(start + _MAX_CANDIDATES, len(keys))):
+                key, entry_id, position = keys[index]
+                if not key.startswith(prefix):
+                    break
+                entry = self._entries[entry_id]
+                rank = (position > 0, _KIND_ORDER[entry.kind], not entry.featured, len(entry.text), entry.text)
+                if entry.text not in candidates or rank < candidates[entry.text]:
+                    candidates[entry.text] = rank
+        return sorted(candidates, key=candidates.get)[:limit]
+
+    # -- 변경 ---------------------------------------------------------------
+    def _add(self, entry_id: EntryId, entry: _Entry, keep_sorted: bool = True):
+        normalized = _normalize(entry.text)
+        for match in _WORD_START.finditer(normalized):
+            suffix = normalized[match.start():]
+            for keys, key in ((self._jamo_keys, decompose(suffix)), (self._choseong_keys, choseong(suffix))):
+                item = (key, entry_id, match.start())
+                if keep_sorted:
+                    bisect.insort(keys, item)
+                else:
+                    keys.append(item)
+                entry.keys.append((keys, item))
+        self._entries[entry_id] = entry
+
+    def _remove(self, entry_id: EntryId):
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        for keys, item in entry.keys:
+            index = bisect.bisect_left(keys, item)
+            if index < len(keys) and keys[index] == item:
+                del keys[index]
+
+    def _set(self, entry_id: EntryId, text: Optional[str], kind: str, featured: bool = False):
+        self._remove(entry_id)
+        if text and text.strip():
+            self._add(entry_id, _Entry(text.strip(), kind, featured))
+
+    def _set_product(self, product_id: int, name: Optional[str], model_number: Optional[str], is_featured):
+        self._set(("product", product_id), name, "product", bool(is_featured))
+        self._set(("model", product_id), model_number, "model", bool(is_featured))
+
+    def upsert_product(self, product_id: int, name: Optional[str], model_number: Optional[str], is_featured=0):
+        with self._lock:
+            self.generation += 1
+            self._set_product(product_id, name, model_number, is_featured)
+
+    def remove_product(self, product_id: int):
+        with self._lock:
+            self.generation += 1
+            self._remove(("product", product_id))
+            self._remove(("model", product_id))
+
+    def upsert_category(self, category_id: int, name: Optional[str]):
+        with self._lock:
+            self.generation += 1
+            self._set(("category", category_id), name, "category")
+
+    def remove_category(self, category_id: int):
+        with self._lock:
+            self.generation += 1
+            self._remove(("category", category_id))
+
+    def mark_behind(self):
+        """개별 변경을 알 수 없을 때 호출 - 다음 조회 시 따라잡기"""
+        with self._lock:
+            self.generation += 1
+            self._behind = True
+
+    def _finish(self, synced_at: datetime, generation: Optional[int], version: int):
+        # 읽는 도중 커밋된 변경이 있으면 읽은 값이 더 오래되었을 수 있으므로 다음 조회 때 다시 따라잡기
+        self.synced_at = synced_at
+        self._behind = generation is not None and generation != self.generation
+        self.version = max(self.version, version)
+
+    def sync(self, changed: List[tuple], product_ids: List[int], categories: List[tuple], synced_at: datetime,
+             generation: Optional[int] = None, version: int = 0):
+        """
+        따라잡기 - 바뀐 제품 (id, name, model_number, is_featured)을 항목별로 반영하고,
+        product_ids에 없는 제품과 (id, name) 카테고리 목록에 없거나 이름이 바뀐 카테고리를 정리합니다.
+        """
+        live = set(product_ids)
+        category_names = {category_id: (name or "").strip() for category_id, name in categories}
+        with self._lock:
+            for product_id, name, model_number, is_featured in changed:
+                self._set_product(product_id, name, model_number, is_featured)
+            for entry_id in [entry_id for entry_id in self._entries
+                             if (entry_id[0] == "category" and entry_id[1] not in category_names)
+                             or (entry_id[0] != "category" and entry_id[1] not in live)]:
+                self._remove(entry_id)
+            for category_id, name in category_names.items():
+                entry = self._entries.get(("category", category_id))
+                if (entry.text if entry is not None else "") != name:
+                    self._set(("category", category_id), name, "category")
+            self._finish(synced_at, generation, version)
+
+    def rebuild(self, products: List[tuple], categories: List[tuple], synced_at: datetime,
+                generation: Optional[int] = None, version: int = 0):
+        """
+        (id, name, model_number, is_featured) 제품 목록과 (id, name) 카테고리 목록으로 인덱스를 다시 만듭니다.
+        synced_at은 다음 따라잡기에서 읽을 변경 시각, version은 목록을 읽기 전에 조회한 카탈로그 버전이며,
+        generation이 주어졌고 그 사이 변경이 있었다면 결과는 반영하되 다음 조회 때 따라잡습니다.
+        """
+        fresh = SuggestionIndex(self.ttl)
+        entries = []
+        for product_id, name, model_number, is_featured in products:
+            entries.append((("product", product_id), name, "product", bool(is_featured)))
+            entries.append((("model", product_id), model_number, "model", bool(is_featured)))
+        for category_id, name in categories:
+            entries.append((("category", category_id), name, "category", False))
+        for entry_id, text, kind, featured in entries:
+            if text and text.strip():
+                fresh._add(entry_id, _Entry(text.strip(), kind, featured), keep_sorted=False)
+        # 한 번에 정렬 (항목마다 insort하면 O(n²))
+        fresh._jamo_keys.sort()
+        fresh._choseong_keys.sort()
+        with self._lock:
+            self._entries = fresh._entries
+            self._jamo_keys = fresh._jamo_keys
+            self._choseong_keys = fresh._choseong_keys
+            self._built_at = time.monotonic()
+            self._finish(synced_at, generation, version)
+
+    def advance(self, previous: int, version: int):
+        """커밋으로 previous -> version이 된 변경을 반영했을 때 호출 (사이에 다른 변경이 없었을 때만 버전 갱신)"""
+        with self._lock:
+            if self.version == previous:
+                self.version = version
+
+    def clear(self):
+        """인덱스를 비우고 다음 조회 때 재구성하도록 합니다."""
+        with self._lock:
+            self.generation += 1
+            self._entries = {}
+            self._jamo_keys = []
+            self._choseong_keys = []
+            self._built_at = None
+            self._behind = False
+            self.synced_at = None
+            self.version = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_index = SuggestionIndex(ttl=settings.SUGGESTION_INDEX_TTL)
+
+
+# 워커당 재구성/따라잡기 하나만 실행
+_refresh_lock = threading.Lock()
+_PRODUCT_COLUMNS = (SafetyProduct.id, SafetyProduct.name, SafetyProduct.model_number, SafetyProduct.is_featured)
+
+
+async def _refresh(db: AsyncSession, mode: str, version: int):
+    generation = _index.generation
+    since = _index.synced_at
+    # 읽기 전 DB 시각 - 다음 따라잡기는 여기서부터 (시계 차이가 없도록 DB 시각 사용)
+    started = (await db.execute(select(func.now()))).scalar() - _SYNC_OVERLAP
+    categories = (await db.execute(select(SafetyCategory.id, SafetyCategory.name))).all()
+    if mode == SYNC:
+        changed = (await db.execute(
+            select(*_PRODUCT_COLUMNS)
+            .where(or_(SafetyProduct.created_at >= since, SafetyProduct.updated_at >= since))
+            .limit(_SYNC_MAX_CHANGES + 1)
+        )).all()
+        if len(changed) <= _SYNC_MAX_CHANGES:
+            product_ids = (await db.execute(select(SafetyProduct.id))).scalars().all()
+            await run_in_threadpool(_index.sync, changed, product_ids, categories, started, generation, version)
+            return
+    products = (await db.execute(select(*_PRODUCT_COLUMNS))).all()
+    await run_in_threadpool(_index.rebuild, products, categories, started, generation, version)
+
+
+def _wait_for_refresh():
+    with _refresh_lock:
+        pass
+
+
+async def suggest(db: AsyncSession, query: str, limit: int = 5, version: int = 0) -> List[str]:
+    """
+    검색어 자동완성. 인덱스가 없거나 만료되었으면 재구성하고, 요청 카탈로그 버전보다 오래되었으면 따라잡습니다.
+    다른 요청이 이미 갱신 중이면 기다리지 않고 기존 인덱스로 응답합니다 (처음 구성할 때만 대기).
+    """
+    mode = _index.refresh_mode(version)
+    if mode is not None:
+        if _refresh_lock.acquire(blocking=False):
+            try:
+                mode = _index.refresh_mode(version)
+                if mode is not None:
+                    await _refresh(db, mode, version)
+            finally:
+                _refresh_lock.release()
+        elif not _index.built:
+            await run_in_threadpool(_wait_for_refresh)
+    return _index.search(query, limit)
+
+
+def invalidate():
+    """자동완성 인덱스 무효화"""
+    _index.clear()
+
+
+# ---------------------------------------------------------------------------
+# 변경 감지 (커밋된 변경만 반영)
+# ---------------------------------------------------------------------------
+_PENDING_KEY = "suggestion_index_pending"
+_SYNC = "sync"
+_TRACKED_TABLES = {SafetyProduct.__tablename__, SafetyCategory.__tablename__}
+
+
+def _pending(session: Session) -> dict:
+    return session.info.setdefault(_PENDING_KEY, {})
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context):
+    changes = {}
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, SafetyProduct):
+            changes[("product", obj.id)] = (obj.name, obj.model_number, obj.is_featured)
+        elif isinstance(obj, SafetyCategory):
+            changes[("category", obj.id)] = (obj.name,)
+    for obj in session.deleted:
+        if isinstance(obj, SafetyProduct):
+            changes[("product", obj.id)] = None
+        elif isinstance(obj, SafetyCategory):
+            # 카테고리 삭제 시 제품이 DB에서 함께 삭제(CASCADE)되므로 따라잡기로 정리
+            changes[_SYNC] = True
+    if changes:
+        _pending(session).update(changes)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_changes(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if getattr(table, "name", None) in _TRACKED_TABLES:
+        _pending(orm_execute_state.session)[_SYNC] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session: Session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    if pending.pop(_SYNC, False):
+        _index.mark_behind()
+    for (kind, entity_id), values in pending.items():
+        if kind == "product":
+            if values is None:
+                _index.remove_product(entity_id)
+            else:
+                _index.upsert_product(entity_id, *values)
+        elif values is None:
+            _index.remove_category(entity_id)
+        else:
+            _index.upsert_category(entity_id, *values)
+    committed = catalog_version.committed_version(session)
+    if committed is not None:
+        _index.advance(committed - 1, committed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session):
+    transaction = session.get_transaction()
+    if not (session.in_nested_transaction() and transaction is not None and transaction.is_active):
+        # 전체 롤백 - 반영할 변경 없음
+        session.info.pop(_PENDING_KEY, None)
+        return
+    # SAVEPOINT만 롤백되고 바깥 트랜잭션은 계속되는 경우 어떤 변경이 남았는지 알 수 없으므로 커밋 후 따라잡기
+    pending = session.info.get(_PENDING_KEY)
+    if pending:
+        pending.clear()
+        pending[_SYNC] = True
@@ -1,10 +1,20 @@
 import os
 from fastapi import UploadFile
 from datetime import datetime
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+from starlette.concurrency import run_in_threadpool
 import aiofiles
+import hashlib
 import uuid
 import shutil
 
+from sqlalchemy.orm import Session, sessionmaker
+
+from core.config import settings
+from crud import image_blob as image_blob_crud
+from utils import image_variants, product_images
+
 # 이미지 저장 경로 설정
 UPLOAD_DIR = "backend/static/images"
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif"}
@@ -26,6 +36,140 @@ def copy_default_image(image_type: str, product_id: int) -> str:
     shutil.copy2(source, target)
     return f"/images/products/{new_filename}"
 
+class UploadError(ValueError):
+    """업로드 검증 실패 (형식/크기 - 사용자에게 그대로 보여줄 메시지)"""
+
+
+class SavedUpload(NamedTuple):
+    filename: str  # 저장된 파일명 ({sha256}{확장자})
+    url: str  # 웹 경로 (/images/...)
+    path: Path  # 서버 파일 경로
+    size: int  # 바이트
+    variants: Dict[str, str] = {}  # 변형 이름 -> 웹 경로 (utils.image_variants)
+    created: bool = True  # False면 같은 내용의 기존 파일을 재사용
+    leased_until: Optional[datetime] = None  # 이번 업로드가 건 임대 (crud.image_blob, 실패 정리용)
+
+
+# 관리자 업로드 라우트 공통 이미지 형식 / 청크 크기
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# image_blobs 전용 세션 팩토리 (연결 대상은 호출마다 요청 세션의 엔진으로 지정)
+_blob_sessions = sessionmaker(autocommit=False, autoflush=False)
+
+
+async def _blob_call(db: Session, func, *args):
+    """
+    image_blobs 작업을 스레드풀에서 짧게 쓰는 전용 세션으로 실행합니다.
+    요청 세션(db)은 연결 정보만 쓰며, 일괄 업로드처럼 여러 업로드 코루틴이 같은 요청 세션을 쓰더라도
+    서로의 커밋/롤백에 섞이지 않고 이벤트 루프도 막지 않습니다.
+    """
+    bind = db.get_bind()
+
+    def call():
+        with _blob_sessions(bind=bind) as session:
+            return func(session, *args)
+
+    return await run_in_threadpool(call)
+
+
+async def save_image_upload(file: UploadFile, db: Session, max_bytes: Optional[int] = None,
+                            with_variants: Optional[bool] = None) -> SavedUpload:
+    """
+    업로드 이미지를 내용 주소 저장소(UPLOAD_DIR/{sha256}{확장자})에 저장합니다.
+    
+    UploadFile을 청크 단위로 읽어 해시를 계산하며 aiofiles로 임시 파일에 기록하므로 파일 전체를
+    메모리에 올리지 않고 이벤트 루프도 막지 않습니다. 크기 제한(기본 MAX_FILE_SIZE MB)을 넘으면
+    임시 파일을 지우고 UploadError를 발생시킵니다.
+    같은 내용이 이미 저장되어 있으면 그 파일을 그대로 돌려주고(created=False), 새 파일이면
+    image_blobs에 참조 0으로 등록합니다 (참조 수는 제품 생성/수정 시 crud.image_blob에서 반영).
+    어느 쪽이든 IMAGE_UPLOAD_LEASE 동안 임대를 걸어 제품에 연결되기 전에 삭제되지 않게 합니다.
+    IMAGE_VARIANTS_ENABLED면 (with_variants를 주면 그 값에 따라) 크기별 변형도 스레드풀에서 생성하고,
+    이미지 크기/해상도도 이때 읽어 두어 제품 저장 시 product_images 행에 바로 씁니다.
+    """
+    extension = os.path.splitext(file.filename or "")[1].lower()
+    if extension not in IMAGE_EXTENSIONS:
+        raise UploadError("지원하지 않는 파일 형식입니다")
+    if max_bytes is None:
+        max_bytes = settings.MAX_FILE_SIZE * 1024 * 1024
+    if with_variants is None:
+        with_variants = settings.IMAGE_VARIANTS_ENABLED
+    
+    upload_dir = settings.get_upload_path()
+    await run_in_threadpool(upload_dir.mkdir, parents=True, exist_ok=True)
+    temp_path = upload_dir / f".upload_{uuid.uuid4().hex}{extension}"
+    
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(temp_path, "wb") as out_file:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadError(f"파일 크기가 너무 큽니다 (최대 {max_bytes // (1024 * 1024)}MB)")
+                digest.update(chunk)
+                await out_file.write(chunk)
+        
+        sha256 = digest.hexdigest()
+        blob = await _blob_call(db, image_blob_crud.lease_blob, sha256)
+        if blob is not None and (upload_dir / os.path.basename(blob.path)).exists():
+            # 같은 내용의 이미지가 이미 있음 - 새 파일은 버리고 기존 파일 재사용
+            path = upload_dir / os.path.basename(blob.path)
+            variants = {}
+            if with_variants:
+                variants = await run_in_threadpool(_create_variants, path, blob.path, True)
+            await run_in_threadpool(product_images.remember_upload, blob.path)
+            return SavedUpload(filename=path.name, url=blob.path, path=path, size=blob.size,
+                               variants=variants, created=False)
+        
+        filename = f"{sha256}{extension}"
+        path = upload_dir / filename
+        await run_in_threadpool(os.replace, temp_path, path)
+    finally:
+        await run_in_threadpool(temp_path.unlink, missing_ok=True)
+    
+    url = f"/images/{filename}"
+    variants = {}
+    if with_variants:
+        variants = await run_in_threadpool(_create_variants, path, url)
+    await run_in_threadpool(product_images.remember_upload, url)
+    if blob is not None:
+        # 행은 있지만 파일이 없어진 경우 (수동 삭제 등) - 파일만 복구
+        return SavedUpload(filename=filename, url=blob.path, path=path, size=size, variants=variants, created=False)
+    blob = await _blob_call(db, image_blob_crud.create_blob, sha256, url, size)
+    return SavedUpload(filename=filename, url=blob.path, path=path, size=size, variants=variants,
+                       created=blob.path == url, leased_until=blob.leased_until)
+
+
+def _create_variants(path: Path, url: str, existing: bool = False) -> Dict[str, str]:
+    """
+    변형 생성 (이미지로 읽을 수 없으면 UploadError).
+    새로 저장한 파일이면 원본과 변형을 지우고, 재사용하는 기존 파일(existing)은 없는 변형만 만들고 남겨 둡니다.
+    """
+    try:
+        image_variants.generate_variants(path, overwrite=not existing)
+    except Exception as e:
+        if not existing:
+            image_variants.remove_variants(path)
+            path.unlink(missing_ok=True)
+        raise UploadError(f"이미지 파일을 읽을 수 없습니다: {e}")
+    return image_variants.variant_urls(url)
+
+
+async def discard_image_upload(db: Session, saved: SavedUpload):
+    """
+    요청이 실패했을 때 이번 요청에서 새로 저장한 이미지를 되돌립니다.
+    기존 파일을 재사용한 경우(created=False)나 그 사이 다른 업로드가 재사용했거나 제품이 참조한 경우는
+    남겨 둡니다 (임대가 끝나면 정리 작업이 판단).
+    """
+    if not saved.created or saved.leased_until is None:
+        return
+    await _blob_call(db, image_blob_crud.discard_blob, saved.filename.split(".")[0], saved.url, saved.leased_until)
+
+
 async def save_upload_file(file: UploadFile) -> str:
     """이미지 파일을 저장하고 URL을 반환"""
     if not is_valid_image(file.filename):
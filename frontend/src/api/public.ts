@@ -31,6 +31,9 @@ export interface PublicCategory {
   image?: string;
   display_order: number;
   image_count?: number;
+  product_count?: number;
+  featured_count?: number;
+  in_stock_count?: number;
   created_at: string;
   updated_at?: string;
 }
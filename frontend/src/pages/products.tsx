@@ -105,11 +105,11 @@ const ProductsPage = () => {
                         {category.name}
                       </h3>
                       <span className={`px-3 py-1 text-sm rounded-full border ${
-                        category.image_count > 0 
+                        (category.product_count ?? 0) > 0 
                           ? 'bg-blue-50 text-blue-600 border-blue-200' 
                           : 'bg-gray-50 text-gray-600 border-gray-200'
                       }`}>
-                        {category.image_count}개
+                        {category.product_count ?? 0}개
                       </span>
                     </div>
                     <p className="text-gray-600 leading-relaxed">
@@ -8,6 +8,7 @@ export interface SafetyCategory {
   image_path?: string;
   display_order: number;
   image_count: number;
+  product_count?: number;  // 공개 카테고리 API 집계 (category_stats)
   created_at: string;
   updated_at?: string;
 }